@@ -12,7 +12,7 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 # Import models to ensure they're registered with Base
 from database.connection import Base
-from database.models import Company, Contact, Product  # noqa: F401
+from database.models import Company, Contact, EnrichmentJob, Product  # noqa: F401
 
 
 # this is the Alembic Config object, which provides
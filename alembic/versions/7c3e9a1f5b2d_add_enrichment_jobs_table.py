@@ -0,0 +1,61 @@
+"""Add enrichment jobs table
+
+Revision ID: 7c3e9a1f5b2d
+Revises: 2dced4a0c586
+Create Date: 2026-10-17 09:12:44.118203
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy import Text
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7c3e9a1f5b2d"
+down_revision: Union[str, Sequence[str], None] = "2dced4a0c586"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "enrichmentjobs",
+        sa.Column("entity_type", sa.String(length=20), nullable=False),
+        sa.Column("entity_id", sa.Integer(), nullable=True),
+        sa.Column("payload", postgresql.JSON(astext_type=Text()), nullable=True),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("max_attempts", sa.Integer(), nullable=False),
+        sa.Column("run_after", sa.DateTime(), nullable=False),
+        sa.Column("lease_token", sa.String(length=64), nullable=True),
+        sa.Column("lease_expires_at", sa.DateTime(), nullable=True),
+        sa.Column("result", postgresql.JSON(astext_type=Text()), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("completed_at", sa.DateTime(), nullable=True),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_enrichmentjobs_id"), "enrichmentjobs", ["id"], unique=False
+    )
+    op.create_index(
+        "ix_enrichmentjobs_status_run_after",
+        "enrichmentjobs",
+        ["status", "run_after"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_enrichmentjobs_status_run_after", table_name="enrichmentjobs")
+    op.drop_index(op.f("ix_enrichmentjobs_id"), table_name="enrichmentjobs")
+    op.drop_table("enrichmentjobs")
@@ -0,0 +1,34 @@
+"""Index updated_at for keyset pagination
+
+Revision ID: b41d6e8f0a93
+Revises: 7c3e9a1f5b2d
+Create Date: 2026-10-17 11:02:17.540961
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b41d6e8f0a93"
+down_revision: Union[str, Sequence[str], None] = "7c3e9a1f5b2d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("companys", "contacts", "products", "enrichmentjobs")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        op.create_index(
+            op.f(f"ix_{table}_updated_at"), table, ["updated_at"], unique=False
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        op.drop_index(op.f(f"ix_{table}_updated_at"), table_name=table)
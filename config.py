@@ -39,13 +39,57 @@ class Settings(BaseSettings):
     # Rate limiting
     rate_limit_per_minute: int = 60
 
+    # Bulk ingest (POST /api/v1/{entity}/bulk)
+    bulk_insert_chunk_size: int = 1000  # rows per transaction
+
     # Monitoring settings
     sentry_dsn: Optional[str] = None
     log_level: str = "INFO"
     metrics_enabled: bool = True
 
+    # Outbound HTTP client pool (third-party providers)
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry: float = 30.0
+    http_timeout: float = 30.0
+
+    # Provider rate limiting (token buckets fed by rate-limit headers)
+    provider_rate_limiting_enabled: bool = True
+    provider_throttle_retries: int = 2  # re-sends after a 429 response
+
+    # Provider resilience (retries on timeouts/5xx, circuit breakers)
+    provider_retry_attempts: int = 3  # total attempts per call
+    provider_retry_base_delay: float = 0.2  # seconds, doubled per retry (jittered)
+    provider_retry_max_delay: float = 5.0
+    provider_retry_budget_ratio: float = 0.2  # retries allowed per call made
+    provider_circuit_failure_threshold: float = 0.5  # failure rate that opens
+    provider_circuit_reset_timeout: float = 30.0  # seconds before a trial call
+
+    # Real data enrichment engine
+    enrichment_request_deadline: float = 20.0  # seconds per enrichment request
+    enrichment_batch_concurrency: int = 5  # concurrent calls per provider
+    enrichment_batch_max_in_flight: int = 100  # records enriched at once
+    enrichment_batch_lookup_memory: int = 1024  # resolutions reused per batch
+    enrichment_target_score: Optional[int] = None  # stop querying once reached
+    enrichment_cache_enabled: bool = True
+    enrichment_cache_path: str = "./enrichment_cache.db"
+    enrichment_cache_max_entries: int = 100_000
+    quota_ledger_path: str = "./quota_ledger.db"  # shared by all workers
+    github_conditional_cache_enabled: bool = True  # ETag/If-None-Match store
+    github_conditional_cache_path: str = "./github_http_cache.db"
+    github_conditional_cache_max_entries: int = 50_000
+
+    # Background enrichment jobs
+    enrichment_workers: int = 2  # 0 disables in-process workers
+    enrichment_job_poll_interval: float = 1.0  # seconds between idle polls
+    enrichment_job_visibility_timeout: float = 300.0  # lease length in seconds
+    enrichment_job_max_attempts: int = 3
+    enrichment_job_retry_backoff: float = 30.0  # base delay, doubled per attempt
+
     # Real Data Enrichment API Keys
     hunter_api_key: Optional[str] = None
+    hunter_domain_search_limit: int = 10  # emails per domain search (free plan: 10)
+    clearbit_api_key: Optional[str] = None
     zerobounce_api_key: Optional[str] = None
     github_token: Optional[str] = None
     pdl_api_key: Optional[str] = None
@@ -53,7 +97,16 @@ class Settings(BaseSettings):
 
     # LinkedIn & Professional Data APIs
     wiza_api_key: Optional[str] = None
+    wiza_list_max_size: int = 1000  # LinkedIn URLs per list job
+    wiza_list_poll_interval: float = 5.0  # seconds, doubled while idle
+    wiza_list_max_poll_interval: float = 60.0
+    wiza_list_timeout: float = 3600.0  # seconds to wait for one list
+    wiza_credit_reserve: int = 0  # credits never spent by bulk jobs
     surfe_api_key: Optional[str] = None
+    surfe_bulk_chunk_size: int = 500  # records per enrichment request
+    surfe_bulk_concurrency: int = 3  # enrichment requests in flight
+    surfe_bulk_poll_interval: float = 2.0  # seconds, grows while pending
+    surfe_bulk_timeout: float = 600.0  # seconds to wait for one chunk
 
     # Brazil-Specific Data Sources
     bigdata_corp_api_key: Optional[str] = None
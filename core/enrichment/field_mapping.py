@@ -0,0 +1,322 @@
+"""
+Provider Field Mapping
+Declarative provider response mappings compiled once into merge functions
+"""
+
+import copy
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+
+Getter = Callable[[Any], Any]
+Step = Callable[[Dict[str, Any], Dict[str, Any]], None]
+
+# How a mapped value combines with what the record already holds:
+#   overwrite  always set (missing source values become ``default``)
+#   present    set only when the source value is truthy
+#   fill       set only when the source value is truthy and the target is empty
+#   union      append the source items to the target list, without duplicates
+PRECEDENCES = ("overwrite", "present", "fill", "union")
+
+
+class FieldRule(NamedTuple):
+    """Copy one provider response value into the enriched record.
+
+    Paths are dotted keys (``"person.employment.title"``). ``transform`` is
+    applied to the value before it is written, and the rule only runs when
+    the response value at ``when`` is truthy.
+    """
+
+    source: str
+    target: str
+    transform: Optional[Callable[[Any], Any]] = None
+    precedence: str = "overwrite"
+    default: Any = None
+    when: Optional[str] = None
+
+
+def compile_path(path: str) -> Getter:
+    """Build a reader for a dotted path; missing keys read as None."""
+    parts = tuple(path.split("."))
+    if len(parts) == 1:
+        (key,) = parts
+
+        def get(data: Any) -> Any:
+            return data.get(key) if isinstance(data, dict) else None
+
+    elif len(parts) == 2:
+        outer, inner = parts
+
+        def get(data: Any) -> Any:
+            value = data.get(outer) if isinstance(data, dict) else None
+            return value.get(inner) if isinstance(value, dict) else None
+
+    else:
+
+        def get(data: Any) -> Any:
+            for part in parts:
+                if not isinstance(data, dict):
+                    return None
+                data = data.get(part)
+            return data
+
+    return get
+
+
+def _compile_container(path: str) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """Build a resolver for the dict holding a dotted path's last key."""
+    parents = tuple(path.split("."))[:-1]
+    if not parents:
+        return lambda target: target
+
+    def container(target: Dict[str, Any]) -> Dict[str, Any]:
+        for part in parents:
+            target = target.setdefault(part, {})
+        return target
+
+    return container
+
+
+def _compile_rule(rule: FieldRule) -> Step:
+    """Specialize one rule into a ``step(record, response)`` function."""
+    if rule.precedence not in PRECEDENCES:
+        raise ValueError(f"Unknown field precedence: {rule.precedence}")
+
+    get = compile_path(rule.source)
+    container = _compile_container(rule.target)
+    key = rule.target.rsplit(".", 1)[-1]
+    transform = rule.transform or (lambda value: value)
+
+    if rule.precedence == "overwrite":
+        default = rule.default
+        # Mutable defaults are copied so records never share them
+        fresh = copy.copy if isinstance(default, (dict, list)) else None
+
+        def step(record: Dict[str, Any], response: Dict[str, Any]):
+            value = get(response)
+            if value is None:
+                value = fresh(default) if fresh else default
+            container(record)[key] = transform(value)
+
+    elif rule.precedence == "present":
+
+        def step(record: Dict[str, Any], response: Dict[str, Any]):
+            value = get(response)
+            if value:
+                container(record)[key] = transform(value)
+
+    elif rule.precedence == "fill":
+
+        def step(record: Dict[str, Any], response: Dict[str, Any]):
+            value = get(response)
+            if value:
+                parent = container(record)
+                if not parent.get(key):
+                    parent[key] = transform(value)
+
+    else:
+
+        def step(record: Dict[str, Any], response: Dict[str, Any]):
+            value = get(response)
+            if value:
+                parent = container(record)
+                parent[key] = list(
+                    dict.fromkeys([*(parent.get(key) or []), *transform(value)])
+                )
+
+    return step
+
+
+class FieldMapping:
+    """A provider's field rules, compiled into a merge function.
+
+    Consecutive rules sharing a ``when`` guard are checked once as a group.
+    Rules run in declaration order, so later rules see earlier writes.
+    """
+
+    def __init__(self, rules: Iterable[FieldRule]):
+        self.rules = tuple(rules)
+        steps: List[Step] = []
+        group: List[Step] = []
+        group_when: Optional[str] = None
+        for rule in self.rules:
+            if group and rule.when != group_when:
+                steps.extend(self._guard(group_when, group))
+                group = []
+            group_when = rule.when
+            group.append(_compile_rule(rule))
+        if group:
+            steps.extend(self._guard(group_when, group))
+        self._steps = tuple(steps)
+
+    @property
+    def targets(self) -> Tuple[str, ...]:
+        """Record paths these rules can write."""
+        return tuple(rule.target for rule in self.rules)
+
+    @staticmethod
+    def _guard(when: Optional[str], group: List[Step]) -> List[Step]:
+        if when is None:
+            return list(group)
+        guard = compile_path(when)
+        grouped = tuple(group)
+
+        def step(record: Dict[str, Any], response: Dict[str, Any]):
+            if guard(response):
+                for apply in grouped:
+                    apply(record, response)
+
+        return [step]
+
+    def merge(self, record: Dict[str, Any], response: Dict[str, Any]) -> Dict[str, Any]:
+        """Merge one provider response into ``record`` in place."""
+        for step in self._steps:
+            step(record, response)
+        return record
+
+    def merge_batch(
+        self,
+        records: Iterable[Dict[str, Any]],
+        responses: Iterable[Optional[Dict[str, Any]]],
+    ) -> List[Dict[str, Any]]:
+        """Merge responses into the records at the same positions.
+
+        Records whose response is missing (None or empty) are left as is.
+        """
+        steps = self._steps
+        merged = []
+        for record, response in zip(records, responses):
+            if response:
+                for step in steps:
+                    step(record, response)
+            merged.append(record)
+        return merged
+
+
+def compile_mappings(
+    specs: Dict[str, Iterable[FieldRule]],
+) -> Dict[str, FieldMapping]:
+    """Compile a provider -> rules spec, keeping the provider order."""
+    return {provider: FieldMapping(rules) for provider, rules in specs.items()}
+
+
+def _twitter_url(handle: str) -> str:
+    return f"https://twitter.com/{handle}"
+
+
+def _organization_logins(organizations: List[Dict[str, Any]]) -> List[Any]:
+    return [org.get("login") for org in organizations]
+
+
+# Person mappings, in merge precedence order: Clearbit first (best
+# quality), then Hunter.io email verification, then GitHub
+PERSON_FIELD_MAPPINGS: Dict[str, List[FieldRule]] = {
+    "clearbit": [
+        FieldRule("person.full_name", "full_name", precedence="present", when="person"),
+        FieldRule("person.linkedin", "contact.linkedin", when="person"),
+        FieldRule("person.twitter", "contact.twitter", when="person"),
+        FieldRule("person.github", "contact.github", when="person"),
+        FieldRule("person.location", "location", default={}, when="person"),
+        FieldRule("employment.title", "professional.current_title", when="employment"),
+        FieldRule("employment.name", "professional.current_company", when="employment"),
+        FieldRule("employment.seniority", "professional.seniority", when="employment"),
+        FieldRule("employment.role", "professional.role", when="employment"),
+        FieldRule("company.domain", "professional.company_domain", when="company"),
+        FieldRule(
+            "company.category.industry",
+            "professional.company_industry",
+            when="company",
+        ),
+    ],
+    "hunter": [
+        FieldRule(
+            "result",
+            "contact.email_verified",
+            transform=lambda result: result == "deliverable",
+        ),
+        FieldRule("score", "contact.email_confidence", default=0),
+        FieldRule("disposable", "contact.email_disposable", default=False),
+        FieldRule("webmail", "contact.email_webmail", default=False),
+    ],
+    "github": [
+        FieldRule("profile.name", "full_name", precedence="fill", when="profile"),
+        FieldRule("github_url", "contact.github", when="profile"),
+        FieldRule(
+            "profile.email",
+            "contact.github_email",
+            precedence="present",
+            when="profile",
+        ),
+        FieldRule(
+            "profile.twitter_username",
+            "contact.twitter",
+            transform=_twitter_url,
+            precedence="present",
+            when="profile",
+        ),
+        FieldRule(
+            "profile.blog", "contact.website", precedence="present", when="profile"
+        ),
+        FieldRule(
+            "profile.location",
+            "location.github_location",
+            precedence="present",
+            when="profile",
+        ),
+        FieldRule(
+            "profile.company",
+            "professional.github_company",
+            precedence="present",
+            when="profile",
+        ),
+        FieldRule(
+            "profile.public_repos",
+            "professional.github_stats.public_repos",
+            default=0,
+            when="profile",
+        ),
+        FieldRule(
+            "profile.followers",
+            "professional.github_stats.followers",
+            default=0,
+            when="profile",
+        ),
+        FieldRule(
+            "profile.following",
+            "professional.github_stats.following",
+            default=0,
+            when="profile",
+        ),
+        FieldRule(
+            "profile.bio", "professional.bio", precedence="present", when="profile"
+        ),
+        FieldRule("programming_languages", "skills", precedence="union"),
+        FieldRule(
+            "repositories", "professional.top_repositories", precedence="present"
+        ),
+        FieldRule(
+            "organizations",
+            "professional.organizations",
+            transform=_organization_logins,
+            precedence="present",
+        ),
+    ],
+}
+
+COMPANY_FIELD_MAPPINGS: Dict[str, List[FieldRule]] = {
+    "clearbit": [
+        FieldRule("company.name", "name", precedence="present", when="company"),
+        FieldRule("company.description", "description", when="company"),
+        FieldRule("company.industry", "industry", when="company"),
+        FieldRule("company.employees", "employees", when="company"),
+        FieldRule("company.estimated_annual_revenue", "revenue", when="company"),
+        FieldRule("company.founded_year", "founded", when="company"),
+        FieldRule("company.location", "location", default={}, when="company"),
+        FieldRule("company.tech_stack", "tech_stack", default=[], when="company"),
+        FieldRule("company.linkedin", "social.linkedin", when="company"),
+        FieldRule("company.twitter", "social.twitter", when="company"),
+        FieldRule("company.facebook", "social.facebook", when="company"),
+    ],
+}
+
+PERSON_MAPPINGS = compile_mappings(PERSON_FIELD_MAPPINGS)
+COMPANY_MAPPINGS = compile_mappings(COMPANY_FIELD_MAPPINGS)
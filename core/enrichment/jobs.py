@@ -0,0 +1,355 @@
+"""
+Background Enrichment Jobs
+Durable job queue on the application database plus an asyncio worker pool
+"""
+
+import asyncio
+import contextlib
+import logging
+import uuid
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from database.models import Company, Contact, EnrichmentJob
+
+
+logger = logging.getLogger(__name__)
+
+ENTITY_TYPES = ("person", "company")
+
+# data_sources the engine reports when it fell back to generated data
+MOCK_DATA_SOURCES = frozenset({"mock_enhanced"})
+
+
+def has_real_data(result: Dict[str, Any]) -> bool:
+    """Whether an engine result holds provider data rather than mock data.
+
+    A record the engine reports as already complete enough
+    (``target_reached``) without querying any provider counts as real.
+    """
+    sources = result.get("data_sources") or []
+    if any(source not in MOCK_DATA_SOURCES for source in sources):
+        return True
+    return not sources and bool(result.get("target_reached"))
+
+
+class EnrichmentJobQueue:
+    """Persistent enrichment job queue with leases (visibility timeouts).
+
+    A worker leases a job for ``visibility_timeout`` seconds. If it crashes
+    or stalls past the lease, the job becomes visible again and is retried
+    until ``max_attempts`` is exhausted. Every method opens its own session,
+    so the queue is safe to call from worker threads.
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Session]] = None,
+        visibility_timeout: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+        retry_backoff: Optional[float] = None,
+    ):
+        from config import settings
+
+        if session_factory is None:
+            from database.connection import SessionLocal
+
+            session_factory = SessionLocal
+        self.session_factory = session_factory
+        self.visibility_timeout = (
+            visibility_timeout or settings.enrichment_job_visibility_timeout
+        )
+        self.max_attempts = max_attempts or settings.enrichment_job_max_attempts
+        self.retry_backoff = (
+            retry_backoff
+            if retry_backoff is not None
+            else settings.enrichment_job_retry_backoff
+        )
+
+    def enqueue(
+        self,
+        entity_type: str,
+        payload: Dict[str, Any],
+        entity_id: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Persist a new queued job and return its public representation."""
+        if entity_type not in ENTITY_TYPES:
+            raise ValueError(f"Unsupported entity type: {entity_type!r}")
+
+        with self.session_factory() as db:
+            job = EnrichmentJob(
+                entity_type=entity_type,
+                entity_id=entity_id,
+                payload=payload,
+                status="queued",
+                attempts=0,
+                max_attempts=self.max_attempts,
+                run_after=datetime.utcnow(),
+            )
+            db.add(job)
+            db.commit()
+            db.refresh(job)
+            return job.to_dict()
+
+    def get(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """Get a job by id."""
+        with self.session_factory() as db:
+            job = db.get(EnrichmentJob, job_id)
+            return job.to_dict() if job is not None else None
+
+    def lease(self) -> Optional[Dict[str, Any]]:
+        """Lease the next runnable job, or return None if the queue is idle.
+
+        Runnable means queued and due, or running with an expired lease.
+        The claim is a conditional UPDATE, so concurrent workers (threads or
+        processes) never run the same job twice.
+        """
+        now = datetime.utcnow()
+        runnable = and_(
+            EnrichmentJob.attempts < EnrichmentJob.max_attempts,
+            or_(
+                and_(EnrichmentJob.status == "queued", EnrichmentJob.run_after <= now),
+                and_(
+                    EnrichmentJob.status == "running",
+                    EnrichmentJob.lease_expires_at < now,
+                ),
+            ),
+        )
+
+        with self.session_factory() as db:
+            self._fail_exhausted_leases(db, now)
+            candidates = (
+                db.query(EnrichmentJob.id)
+                .filter(runnable)
+                .order_by(EnrichmentJob.run_after, EnrichmentJob.id)
+                .limit(5)
+                .all()
+            )
+            for (job_id,) in candidates:
+                token = uuid.uuid4().hex
+                claimed = (
+                    db.query(EnrichmentJob)
+                    .filter(EnrichmentJob.id == job_id, runnable)
+                    .update(
+                        {
+                            EnrichmentJob.status: "running",
+                            EnrichmentJob.attempts: EnrichmentJob.attempts + 1,
+                            EnrichmentJob.lease_token: token,
+                            EnrichmentJob.lease_expires_at: now
+                            + timedelta(seconds=self.visibility_timeout),
+                            EnrichmentJob.updated_at: now,
+                        },
+                        synchronize_session=False,
+                    )
+                )
+                db.commit()
+                if claimed:
+                    job = db.get(EnrichmentJob, job_id)
+                    # Only the leasing worker ever sees its token
+                    return {**job.to_dict(), "lease_token": token}
+        return None
+
+    def _fail_exhausted_leases(self, db: Session, now: datetime):
+        """Fail running jobs whose lease expired on their last attempt."""
+        exhausted = (
+            db.query(EnrichmentJob)
+            .filter(
+                EnrichmentJob.status == "running",
+                EnrichmentJob.lease_expires_at < now,
+                EnrichmentJob.attempts >= EnrichmentJob.max_attempts,
+            )
+            .update(
+                {
+                    EnrichmentJob.status: "failed",
+                    EnrichmentJob.error: "Lease expired on final attempt",
+                    EnrichmentJob.lease_token: None,
+                    EnrichmentJob.completed_at: now,
+                    EnrichmentJob.updated_at: now,
+                },
+                synchronize_session=False,
+            )
+        )
+        if exhausted:
+            db.commit()
+            logger.warning(f"⚠️ {exhausted} enrichment job(s) failed on lease expiry")
+
+    def complete(self, job_id: int, lease_token: str, result: Dict[str, Any]) -> bool:
+        """Store the result on the job and its Contact/Company in one transaction.
+
+        Returns False if the lease was lost (another worker owns the job now).
+        """
+        with self.session_factory() as db:
+            job = db.get(EnrichmentJob, job_id)
+            if job is None or job.lease_token != lease_token:
+                logger.warning(f"⚠️ Lost lease on enrichment job {job_id}")
+                return False
+
+            target = self._find_target(db, job)
+            if target is not None:
+                target.enrichment_data = result
+                if job.entity_id is None:
+                    job.entity_id = target.id
+
+            now = datetime.utcnow()
+            job.status = "succeeded"
+            job.result = result
+            job.error = None
+            job.lease_token = None
+            job.lease_expires_at = None
+            job.completed_at = now
+            db.commit()
+            return True
+
+    def fail(self, job_id: int, lease_token: str, error: str) -> bool:
+        """Record a failed attempt, re-queueing with backoff while attempts remain."""
+        with self.session_factory() as db:
+            job = db.get(EnrichmentJob, job_id)
+            if job is None or job.lease_token != lease_token:
+                logger.warning(f"⚠️ Lost lease on enrichment job {job_id}")
+                return False
+
+            now = datetime.utcnow()
+            job.error = error
+            job.lease_token = None
+            job.lease_expires_at = None
+            if job.attempts < job.max_attempts:
+                delay = self.retry_backoff * (2 ** (job.attempts - 1))
+                job.status = "queued"
+                job.run_after = now + timedelta(seconds=delay)
+            else:
+                job.status = "failed"
+                job.completed_at = now
+            db.commit()
+            return True
+
+    def _find_target(self, db: Session, job: EnrichmentJob):
+        """Find the Contact/Company the job's result belongs to, if any."""
+        model = Company if job.entity_type == "company" else Contact
+        if job.entity_id is not None:
+            return db.get(model, job.entity_id)
+
+        payload = job.payload or {}
+        if job.entity_type == "company" and payload.get("domain"):
+            return db.query(Company).filter(Company.domain == payload["domain"]).first()
+        if job.entity_type == "person" and payload.get("email"):
+            return db.query(Contact).filter(Contact.email == payload["email"]).first()
+        return None
+
+
+class EnrichmentWorkerPool:
+    """Asyncio workers that lease jobs and run them through the enrichment engine.
+
+    Database calls run in the default executor so the event loop stays free
+    for concurrent provider I/O.
+    """
+
+    def __init__(
+        self,
+        queue: EnrichmentJobQueue,
+        engine: Any = None,
+        workers: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+    ):
+        from config import settings
+
+        self.queue = queue
+        self._engine = engine
+        self.workers = workers if workers is not None else settings.enrichment_workers
+        self.poll_interval = poll_interval or settings.enrichment_job_poll_interval
+        self._tasks: List[asyncio.Task] = []
+        self._stopping: Optional[asyncio.Event] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    @property
+    def engine(self):
+        """Enrichment engine, resolved on first use."""
+        if self._engine is None:
+            from core.enrichment.real_data_enrichment import get_enrichment_engine
+
+            self._engine = get_enrichment_engine()
+        return self._engine
+
+    @property
+    def is_running(self) -> bool:
+        """Whether worker tasks are active."""
+        return bool(self._tasks)
+
+    def start(self):
+        """Start the worker tasks on the running event loop."""
+        if self._tasks or self.workers <= 0:
+            return
+        self._stopping = asyncio.Event()
+        self._wakeup = asyncio.Event()
+        self._tasks = [
+            asyncio.ensure_future(self._worker(f"worker-{i}"))
+            for i in range(self.workers)
+        ]
+        logger.info(f"👷 Started {self.workers} enrichment worker(s)")
+
+    async def stop(self):
+        """Stop workers after their current job; leases on abandoned jobs expire."""
+        if not self._tasks:
+            return
+        self._stopping.set()
+        self._wakeup.set()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        logger.info("👷 Enrichment workers stopped")
+
+    def notify(self):
+        """Wake idle workers after a job was enqueued in this process."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _run_sync(self, func: Callable, *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, partial(func, *args))
+
+    async def _worker(self, name: str):
+        while not self._stopping.is_set():
+            try:
+                job = await self._run_sync(self.queue.lease)
+            except Exception:
+                logger.exception(f"{name}: failed to lease enrichment job")
+                job = None
+
+            if job is None:
+                self._wakeup.clear()
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                continue
+
+            await self.run_job(job)
+
+    async def run_job(self, job: Dict[str, Any]) -> bool:
+        """Run one leased job and record its outcome. Returns True on success."""
+        try:
+            if job["entity_type"] == "company":
+                result = await self.engine.enrich_company_real(job["payload"] or {})
+            else:
+                result = await self.engine.enrich_person_real(job["payload"] or {})
+        except Exception as e:
+            logger.exception(f"Enrichment job {job['id']} failed: {e!r}")
+            await self._run_sync(self.queue.fail, job["id"], job["lease_token"], str(e))
+            return False
+
+        # The engine falls back to mock data when providers fail or none are
+        # configured; retry later and never store it on the contact/company
+        if not has_real_data(result):
+            error = "No provider returned data (mock fallback)"
+            logger.warning(f"⚠️ Enrichment job {job['id']}: {error}")
+            await self._run_sync(self.queue.fail, job["id"], job["lease_token"], error)
+            return False
+
+        return await self._run_sync(
+            self.queue.complete, job["id"], job["lease_token"], result
+        )
+
+
+# Global instances
+enrichment_job_queue = EnrichmentJobQueue()
+enrichment_worker_pool = EnrichmentWorkerPool(enrichment_job_queue)
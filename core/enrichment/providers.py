@@ -0,0 +1,156 @@
+"""
+Enrichment Provider Registry
+Provider clients registered by import path and constructed on first use
+"""
+
+import importlib
+import logging
+from typing import Any, Dict, Iterator, List, Mapping, NamedTuple, Optional
+
+
+logger = logging.getLogger(__name__)
+
+# Installed packages can add providers under this entry-point group, e.g.
+# [project.entry-points."enrich_ddf.providers"] pdl = "pdl_client:PDLService"
+PROVIDER_ENTRY_POINT_GROUP = "enrich_ddf.providers"
+
+
+class ProviderSpec(NamedTuple):
+    """Where a provider client lives and what it needs to be enabled."""
+
+    target: str  # "package.module:attribute", imported on first use
+    requires: Optional[str] = None  # settings attribute that must be set
+
+
+BUILTIN_PROVIDERS = {
+    "hunter": ProviderSpec(
+        "services.third_party.hunter_io:HunterIOService", "hunter_api_key"
+    ),
+    "clearbit": ProviderSpec(
+        "services.third_party.clearbit:ClearbitService", "clearbit_api_key"
+    ),
+    "github": ProviderSpec("services.third_party.github:GitHubService", "github_token"),
+}
+
+
+def provider_entry_points() -> List[Any]:
+    """Entry points installed under ``PROVIDER_ENTRY_POINT_GROUP``."""
+    from importlib.metadata import entry_points
+
+    installed = entry_points()
+    if hasattr(installed, "select"):
+        return list(installed.select(group=PROVIDER_ENTRY_POINT_GROUP))
+    return list(installed.get(PROVIDER_ENTRY_POINT_GROUP, []))  # Python < 3.10
+
+
+class ProviderRegistry(Mapping):
+    """Provider clients by name, built lazily.
+
+    Nothing is imported until a provider is first looked up; it is then
+    enabled only if its ``requires`` setting is set and its module imports,
+    and the outcome is remembered. ``options`` holds constructor keyword
+    arguments per provider.
+    """
+
+    def __init__(
+        self,
+        specs: Optional[Dict[str, ProviderSpec]] = None,
+        options: Optional[Dict[str, Dict[str, Any]]] = None,
+        entry_points: bool = True,
+    ):
+        self._specs = dict(BUILTIN_PROVIDERS if specs is None else specs)
+        self._options = dict(options or {})
+        self._discover = entry_points
+        self._instances: Dict[str, Any] = {}
+        self._unavailable: Dict[str, str] = {}
+
+    def register(
+        self, name: str, target: str, requires: Optional[str] = None, **options: Any
+    ):
+        """Register (or replace) a provider by ``"module:attribute"`` path."""
+        self._specs[name] = ProviderSpec(target, requires)
+        if options:
+            self._options[name] = options
+        self._instances.pop(name, None)
+        self._unavailable.pop(name, None)
+
+    def _load_entry_points(self):
+        """Add installed entry-point providers once; explicit specs win."""
+        if not self._discover:
+            return
+        self._discover = False
+        for entry_point in provider_entry_points():
+            self._specs.setdefault(entry_point.name, ProviderSpec(entry_point.value))
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """Get a provider client, building it on first use."""
+        self._load_entry_points()
+        if name in self._instances:
+            return self._instances[name]
+        if name in self._unavailable or name not in self._specs:
+            return default
+        instance = self._build(name)
+        return default if instance is None else instance
+
+    def _build(self, name: str) -> Any:
+        from config import settings
+
+        spec = self._specs[name]
+        if spec.requires and not getattr(settings, spec.requires, None):
+            logger.warning(f"❌ {name} disabled: {spec.requires.upper()} not set")
+            self._unavailable[name] = f"{spec.requires} not set"
+            return None
+
+        try:
+            module_name, _, attribute = spec.target.partition(":")
+            factory = getattr(importlib.import_module(module_name), attribute)
+            instance = factory(**self._options.get(name, {}))
+        except Exception as e:
+            logger.warning(f"❌ {name} service not available: {e!r}")
+            self._unavailable[name] = str(e)
+            return None
+
+        logger.info(f"✅ {name} service initialized")
+        self._instances[name] = instance
+        return instance
+
+    def __getitem__(self, name: str) -> Any:
+        instance = self.get(name)
+        if instance is None:
+            raise KeyError(name)
+        return instance
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and self.get(name) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        self._load_entry_points()
+        return iter([name for name in list(self._specs) if name in self])
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def close(self):
+        """Close every built provider that has a ``close()`` and forget it."""
+        for name, instance in list(self._instances.items()):
+            close = getattr(instance, "close", None)
+            if callable(close):
+                try:
+                    close()
+                except Exception as e:
+                    logger.warning(f"❌ {name} service failed to close: {e!r}")
+        self._instances.clear()
+
+    def status(self) -> Dict[str, str]:
+        """Each registered provider's state, without building any."""
+        self._load_entry_points()
+        return {
+            name: (
+                "ready"
+                if name in self._instances
+                else f"unavailable: {self._unavailable[name]}"
+                if name in self._unavailable
+                else "not loaded"
+            )
+            for name in self._specs
+        }
@@ -0,0 +1,246 @@
+"""
+Provider Quota Ledger
+Durable per-provider usage shared by every worker process, with reset windows
+"""
+
+import logging
+import sqlite3
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+from database.utils.sqlite_store import SQLiteStore
+
+
+logger = logging.getLogger(__name__)
+
+
+class QuotaPolicy(NamedTuple):
+    """Calls allowed per reset window.
+
+    ``window`` is a UTC calendar period (``"hour"``, ``"day"`` or
+    ``"month"``) that resets at its boundary, or ``"rolling"`` for the
+    trailing ``seconds``.
+    """
+
+    limit: int
+    window: str = "month"
+    seconds: float = 0.0
+
+
+# Free-tier quotas per provider
+DEFAULT_QUOTAS = {
+    "hunter": QuotaPolicy(50, "month"),
+    "clearbit": QuotaPolicy(50, "month"),
+    "zerobounce": QuotaPolicy(100, "month"),
+    "github": QuotaPolicy(5000, "rolling", 3600),
+}
+
+# Ledger entries are kept at least this long (covers a calendar month)
+MIN_RETENTION = 32 * 24 * 3600
+
+
+def window_bounds(policy: QuotaPolicy, now: float) -> Tuple[float, float]:
+    """Start and end (epoch seconds) of the window containing ``now``."""
+    if policy.window == "rolling":
+        return now - policy.seconds, now
+
+    current = datetime.fromtimestamp(now, timezone.utc)
+    if policy.window == "hour":
+        start = current.replace(minute=0, second=0, microsecond=0)
+        end = start + timedelta(hours=1)
+    elif policy.window == "day":
+        start = current.replace(hour=0, minute=0, second=0, microsecond=0)
+        end = start + timedelta(days=1)
+    elif policy.window == "month":
+        start = current.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        if start.month == 12:
+            end = start.replace(year=start.year + 1, month=1)
+        else:
+            end = start.replace(month=start.month + 1)
+    else:
+        raise ValueError(f"Unknown quota window: {policy.window}")
+    return start.timestamp(), end.timestamp()
+
+
+class QuotaReservation:
+    """Credits held for a provider until taken or released.
+
+    Returned by ``QuotaManager.reserve``; ``take`` spends held credits
+    locally and ``release`` hands the untaken rest back to the ledger. Use
+    it as a context manager to release on exit.
+    """
+
+    def __init__(
+        self, manager: "QuotaManager", service: str, entry_id: int, amount: int
+    ):
+        self.manager = manager
+        self.service = service
+        self.entry_id = entry_id
+        self.amount = amount
+        self.remaining = amount
+
+    def take(self, amount: int = 1) -> bool:
+        """Spend ``amount`` held credits; False if not enough are left."""
+        if amount > self.remaining:
+            return False
+        self.remaining -= amount
+        return True
+
+    def release(self):
+        """Refund every credit not taken."""
+        if self.remaining:
+            self.manager._refund(self.entry_id, self.remaining)
+            self.remaining = 0
+
+    def __enter__(self) -> "QuotaReservation":
+        return self
+
+    def __exit__(self, *exc_info: Any):
+        self.release()
+
+
+class QuotaManager(SQLiteStore):
+    """Manages API quota limits for free tier services.
+
+    Usage is a ledger of reservations in a local SQLite file, so it
+    survives restarts and is shared by every uvicorn/worker process on the
+    host. Checking and reserving happen in one ``BEGIN IMMEDIATE``
+    transaction, so concurrent workers can never overrun a quota.
+    """
+
+    schema = (
+        """
+        CREATE TABLE IF NOT EXISTS quota_ledger (
+            id INTEGER PRIMARY KEY,
+            provider TEXT NOT NULL,
+            at REAL NOT NULL,
+            amount INTEGER NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS ix_quota_ledger_provider_at "
+        "ON quota_ledger (provider, at)",
+    )
+    # Autocommit, so reserve() controls its own BEGIN IMMEDIATE transaction
+    isolation_level = None
+    timeout = 30.0
+    synchronous = None
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        quotas: Optional[Dict[str, QuotaPolicy]] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        if path is None:
+            from config import settings
+
+            path = settings.quota_ledger_path
+        super().__init__(path)
+        self.quotas = {**DEFAULT_QUOTAS, **(quotas or {})}
+        self._clock = clock
+
+    def _used(self, conn: sqlite3.Connection, service: str, now: float) -> int:
+        start, _ = window_bounds(self.quotas[service], now)
+        (used,) = conn.execute(
+            "SELECT COALESCE(SUM(amount), 0) FROM quota_ledger "
+            "WHERE provider = ? AND at >= ?",
+            (service, start),
+        ).fetchone()
+        return max(0, used)
+
+    def reserve(self, service: str, amount: int = 1) -> Optional[QuotaReservation]:
+        """Atomically hold ``amount`` credits, or None if they would exceed quota.
+
+        Unknown services have no quota and are refused.
+        """
+        if service not in self.quotas:
+            return None
+
+        now = self._clock()
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if self._used(conn, service, now) + amount > self.quotas[service].limit:
+                    conn.execute("ROLLBACK")
+                    return None
+                entry_id = conn.execute(
+                    "INSERT INTO quota_ledger (provider, at, amount) VALUES (?, ?, ?)",
+                    (service, now, amount),
+                ).lastrowid
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            if self._note_write():
+                self._prune(conn, now)
+        return QuotaReservation(self, service, entry_id, amount)
+
+    def _refund(self, entry_id: int, amount: int):
+        with self._lock:
+            self._connect().execute(
+                "UPDATE quota_ledger SET amount = amount - ? WHERE id = ?",
+                (amount, entry_id),
+            )
+
+    def can_make_request(self, service: str) -> bool:
+        """Check if we can make a request within quota limits."""
+        return self.remaining(service) > 0
+
+    def record_request(self, service: str, amount: int = 1):
+        """Record that a request was made, even past the quota."""
+        if service in self.quotas:
+            with self._lock:
+                self._connect().execute(
+                    "INSERT INTO quota_ledger (provider, at, amount) VALUES (?, ?, ?)",
+                    (service, self._clock(), amount),
+                )
+
+    def used(self, service: str) -> int:
+        """Credits used in the service's current window."""
+        if service not in self.quotas:
+            return 0
+        with self._lock:
+            return self._used(self._connect(), service, self._clock())
+
+    def remaining(self, service: str) -> int:
+        """Credits left in the service's current window."""
+        if service not in self.quotas:
+            return 0
+        return max(0, self.quotas[service].limit - self.used(service))
+
+    def usage(self) -> Dict[str, Dict[str, Any]]:
+        """Limit, usage and next reset for every service."""
+        now = self._clock()
+        report = {}
+        with self._lock:
+            conn = self._connect()
+            for service, policy in self.quotas.items():
+                used = self._used(conn, service, now)
+                if policy.window == "rolling":
+                    (oldest,) = conn.execute(
+                        "SELECT MIN(at) FROM quota_ledger "
+                        "WHERE provider = ? AND at > ? AND amount > 0",
+                        (service, now - policy.seconds),
+                    ).fetchone()
+                    resets_at = (oldest or now) + policy.seconds
+                else:
+                    _, resets_at = window_bounds(policy, now)
+                report[service] = {
+                    "limit": policy.limit,
+                    "used": used,
+                    "remaining": max(0, policy.limit - used),
+                    "window": policy.window,
+                    "resets_at": datetime.fromtimestamp(
+                        resets_at, timezone.utc
+                    ).isoformat(),
+                }
+        return report
+
+    def _prune(self, conn: sqlite3.Connection, now: float):
+        """Drop ledger entries older than every window."""
+        retention = max(
+            [MIN_RETENTION] + [policy.seconds for policy in self.quotas.values()]
+        )
+        conn.execute("DELETE FROM quota_ledger WHERE at < ?", (now - retention,))
@@ -3,91 +3,233 @@ Real Data Enrichment Engine
 Integrates with actual APIs to provide real enrichment data
 """
 
+import asyncio
+import copy
 import logging
+from collections import OrderedDict
 
 # Import real API services
 from datetime import datetime
-from typing import Any, Dict
+from functools import partial
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from core.enrichment.field_mapping import (
+    COMPANY_MAPPINGS,
+    PERSON_MAPPINGS,
+    FieldMapping,
+    compile_path,
+)
+from core.enrichment.providers import ProviderRegistry
+from core.enrichment.quota import QuotaManager
+from core.enrichment.result_cache import (
+    EnrichmentResultCache,
+    normalize_domain,
+    normalize_email,
+)
+from core.enrichment.scoring import COMPANY_SCORER, PERSON_SCORER, EnrichmentScorer
+from core.enrichment.single_flight import SingleFlight
 
 
 logger = logging.getLogger(__name__)
 
+# Relative cost of one lookup per provider, used to order providers when
+# enrichment stops early (GitHub's hourly quota makes it nearly free)
+PROVIDER_LOOKUP_COSTS = {"clearbit": 1.0, "hunter": 1.0, "github": 0.1}
 
-class QuotaManager:
-    """Manages API quota limits for free tier services."""
 
-    def __init__(self):
-        self.limits = {
-            "hunter": {"monthly": 50, "used": 0, "reset_date": None},
-            "clearbit": {"monthly": 50, "used": 0, "reset_date": None},
-            "zerobounce": {"monthly": 100, "used": 0, "reset_date": None},
-            "github": {"hourly": 5000, "used": 0, "reset_date": None},
-            # "fullcontact": {"monthly": 1000, "used": 0, "reset_date": None}, # EXCLUDED - not professional enough
-        }
+class _EnrichmentBatch:
+    """Per-batch provider concurrency limits and shared lookup resolutions."""
 
-    def can_make_request(self, service: str) -> bool:
-        """Check if we can make a request within quota limits."""
-        if service not in self.limits:
-            return False
-        return self.limits[service]["used"] < self.limits[service]["monthly"]
+    def __init__(self, concurrency: Union[int, Dict[str, int], None] = None):
+        from config import settings
 
-    def record_request(self, service: str):
-        """Record that a request was made."""
-        if service in self.limits:
-            self.limits[service]["used"] += 1
+        self.default_limit = settings.enrichment_batch_concurrency
+        if isinstance(concurrency, int):
+            self.default_limit = concurrency
+            concurrency = None
+        self.limits = concurrency or {}
+        self.semaphores: Dict[str, asyncio.Semaphore] = {}
+        self.max_lookups = settings.enrichment_batch_lookup_memory
+        self.lookups: OrderedDict = OrderedDict()
+
+    def semaphore(self, provider: str) -> asyncio.Semaphore:
+        """Get the concurrency limiter for a provider."""
+        if provider not in self.semaphores:
+            limit = self.limits.get(provider, self.default_limit)
+            self.semaphores[provider] = asyncio.Semaphore(limit)
+        return self.semaphores[provider]
+
+    def shared_lookup(
+        self, key: Tuple[str, str], start: Callable[[], Awaitable[Any]]
+    ) -> asyncio.Future:
+        """Get the batch's resolution of ``key``, starting it if not kept.
+
+        Only the ``max_lookups`` most recently used resolutions are kept; a
+        dropped one still in flight keeps running for its awaiters.
+        """
+        shared = self.lookups.get(key)
+        if shared is not None:
+            self.lookups.move_to_end(key)
+            return shared
+        shared = asyncio.ensure_future(start())
+        self.lookups[key] = shared
+        while len(self.lookups) > self.max_lookups:
+            self.lookups.popitem(last=False)
+        return shared
+
+
+class _CompletenessGoal:
+    """When a record is complete enough to stop querying providers."""
+
+    def __init__(
+        self,
+        kind: str,
+        mappings: Dict[str, FieldMapping],
+        scorer: EnrichmentScorer,
+        target_score: Optional[int] = None,
+        required_fields: Sequence[str] = (),
+    ):
+        self.kind = kind
+        self.mappings = mappings
+        self.scorer = scorer
+        self.target_score = target_score
+        self.required = tuple(compile_path(path) for path in required_fields)
+
+    def met(self, record: Dict[str, Any]) -> bool:
+        """Whether ``record`` hits the target score and fills all required fields."""
+        if (
+            self.target_score is not None
+            and self.scorer.score(record) < self.target_score
+        ):
+            return False
+        return all(get(record) for get in self.required)
 
 
 class RealDataEnrichmentEngine:
     """Real data enrichment using actual API services."""
 
-    def __init__(self):
-        self.quota_manager = QuotaManager()
-        self.services = {}
-        self._initialize_services()
-
-    def _initialize_services(self):
-        """Initialize available API services."""
-        # Import settings to access API keys
+    def __init__(
+        self,
+        request_deadline: Optional[float] = None,
+        cache: Optional[EnrichmentResultCache] = None,
+        quota_manager: Optional[QuotaManager] = None,
+        services: Optional[Mapping[str, Any]] = None,
+        target_score: Optional[int] = None,
+    ):
         from config import settings
 
-        try:
-            # Try to import Hunter.io service
-            if settings.hunter_api_key:
-                from services.third_party.hunter_io import HunterIOService
-
-                self.services["hunter"] = HunterIOService()
-                logger.info("✅ Hunter.io service initialized")
-            else:
-                logger.warning("❌ Hunter.io API key not found")
-        except ImportError:
-            logger.warning("❌ Hunter.io service not available")
-
-        try:
-            # Try to import Clearbit service
-            if settings.clearbit_api_key:
-                from services.third_party.clearbit import ClearbitService
-
-                self.services["clearbit"] = ClearbitService()
-                logger.info("✅ Clearbit service initialized")
-            else:
-                logger.warning("❌ Clearbit API key not found")
-        except ImportError:
-            logger.warning("❌ Clearbit service not available")
+        self.quota_manager = quota_manager or QuotaManager()
+        self.request_deadline = (
+            request_deadline
+            if request_deadline is not None
+            else settings.enrichment_request_deadline
+        )
+        if cache is None and settings.enrichment_cache_enabled:
+            cache = EnrichmentResultCache(
+                settings.enrichment_cache_path,
+                max_entries=settings.enrichment_cache_max_entries,
+            )
+        self.cache = cache
+        # Provider clients are imported and built on first use
+        self.services = (
+            services
+            if services is not None
+            else ProviderRegistry(
+                options={
+                    "hunter": {"cache": cache, "quota_manager": self.quota_manager}
+                }
+            )
+        )
+        self.single_flight = SingleFlight()
+        # Compiled provider response -> enriched record field mappings
+        self.person_mappings = PERSON_MAPPINGS
+        self.company_mappings = COMPANY_MAPPINGS
+        self.person_scorer = PERSON_SCORER
+        self.company_scorer = COMPANY_SCORER
+        # Early termination: providers run best yield per cost first and stop
+        # once the target score is reached (None queries every provider)
+        self.target_score = (
+            target_score
+            if target_score is not None
+            else settings.enrichment_target_score
+        )
+        self.lookup_costs = dict(PROVIDER_LOOKUP_COSTS)
+        # Observed score gain per (kind, provider): (total gain, lookups)
+        self.provider_yields: Dict[Tuple[str, str], Tuple[float, int]] = {}
+
+    def close(self):
+        """Close provider clients, the result cache and quota ledger connections."""
+        close_services = getattr(self.services, "close", None)
+        if callable(close_services):
+            close_services()
+        if self.cache is not None:
+            self.cache.close()
+        self.quota_manager.close()
+
+    async def enrich_person_real(
+        self,
+        person_data: Dict[str, Any],
+        target_score: Optional[int] = None,
+        required_fields: Sequence[str] = (),
+    ) -> Dict[str, Any]:
+        """Enrich person data using real APIs with fallback to mock.
+
+        With a ``target_score`` (defaulting to the engine's) or
+        ``required_fields`` (dotted paths such as
+        ``"professional.current_title"``), providers are queried one at a
+        time, best expected field yield per cost first, and the rest are
+        skipped once the record is complete enough.
+        """
+        return await self._enrich_person(
+            person_data, target_score=target_score, required_fields=required_fields
+        )
 
-        try:
-            # Try to import GitHub service
-            if settings.github_token:
-                from services.third_party.github import GitHubService
-
-                self.services["github"] = GitHubService()
-                logger.info("✅ GitHub service initialized")
-            else:
-                logger.warning("❌ GitHub token not found")
-        except ImportError:
-            logger.warning("❌ GitHub service not available")
-
-    async def enrich_person_real(self, person_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Enrich person data using real APIs with fallback to mock."""
+    async def enrich_people_batch(
+        self,
+        people: Iterable[Dict[str, Any]],
+        concurrency: Union[int, Dict[str, int], None] = None,
+        max_in_flight: Optional[int] = None,
+        target_score: Optional[int] = None,
+        required_fields: Sequence[str] = (),
+    ) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """Enrich many people, yielding ``(index, enriched_data)`` as each completes.
+
+        ``index`` is the record's position in ``people``. Identical provider
+        lookups inside the batch are issued once, and each provider runs at
+        most ``concurrency`` calls at a time (an int for every provider or a
+        per-provider mapping). Results match ``enrich_person_real``.
+        """
+        batch = _EnrichmentBatch(concurrency)
+        enrich = partial(
+            self._enrich_person,
+            batch=batch,
+            target_score=target_score,
+            required_fields=required_fields,
+        )
+        async for item in self._run_batch(people, enrich, max_in_flight):
+            yield item
+
+    async def _enrich_person(
+        self,
+        person_data: Dict[str, Any],
+        batch: Optional["_EnrichmentBatch"] = None,
+        target_score: Optional[int] = None,
+        required_fields: Sequence[str] = (),
+    ) -> Dict[str, Any]:
+        """Enrich one person, optionally sharing lookups with a batch."""
         email = person_data.get("email")
         first_name = person_data.get("first_name", "")
         last_name = person_data.get("last_name", "")
@@ -105,197 +247,286 @@ class RealDataEnrichmentEngine:
             "education": {},
         }
 
-        # Try Clearbit first (best quality)
-        if (
-            "clearbit" in self.services
-            and self.quota_manager.can_make_request("clearbit")
-            and email
-        ):
-            try:
-                result = await self.services["clearbit"].enrich_person(email)
-                if result.get("success"):
-                    self._merge_clearbit_data(enriched_data, result)
-                    self.quota_manager.record_request("clearbit")
-                    enriched_data["data_sources"].append("clearbit")
-                    logger.info(f"✅ Clearbit enrichment successful for {email!r}")
-            except Exception as e:
-                logger.exception(f"Clearbit error: {e!r}")
-
-        # Try Hunter.io for email verification
-        if (
-            "hunter" in self.services
-            and self.quota_manager.can_make_request("hunter")
-            and email
-        ):
-            try:
-                result = await self.services["hunter"].verify_email(email)
-                if result.get("success"):
-                    self._merge_hunter_data(enriched_data, result)
-                    self.quota_manager.record_request("hunter")
-                    enriched_data["data_sources"].append("hunter")
-                    logger.info(f"✅ Hunter.io verification successful for {email!r}")
-            except Exception as e:
-                logger.exception(f"Hunter.io error: {e!r}")
-
-        # Try GitHub for developer profile enrichment
         github_username = person_data.get("github_username") or person_data.get(
             "username"
         )
-        if (
-            "github" in self.services
-            and self.quota_manager.can_make_request("github")
-            and github_username
-        ):
-            try:
-                result = self.services["github"].enrich_developer_profile(
-                    github_username
+
+        # Plan independent provider lookups, keyed for the result cache
+        lookups = {}
+        if "clearbit" in self.services and email:
+            lookups["clearbit"] = (
+                f"person:{normalize_email(email)}",
+                partial(self.services["clearbit"].enrich_person, email),
+            )
+        if "hunter" in self.services and email:
+            lookups["hunter"] = (
+                f"verify:{normalize_email(email)}",
+                partial(self.services["hunter"].verify_email, email),
+            )
+        if "github" in self.services and github_username:
+            lookups["github"] = (
+                f"user:{github_username.strip().lower()}",
+                partial(
+                    self.services["github"].enrich_developer_profile, github_username
+                ),
+            )
+
+        if target_score is None:
+            target_score = self.target_score
+        skipped: List[str] = []
+        target_reached = False
+        if target_score is None and not required_fields:
+            results = await self._resolve_lookups(lookups, batch)
+        else:
+            goal = _CompletenessGoal(
+                "person",
+                self.person_mappings,
+                self.person_scorer,
+                target_score,
+                required_fields,
+            )
+            results, skipped, target_reached = await self._resolve_until_complete(
+                lookups, batch, enriched_data, goal
+            )
+
+        # Merge in fixed precedence order regardless of completion order
+        for provider, mapping in self.person_mappings.items():
+            result = results.get(provider)
+            if result and result.get("success"):
+                mapping.merge(enriched_data, result)
+                enriched_data["data_sources"].append(provider)
+                logger.info(
+                    f"✅ {provider} enrichment successful for "
+                    f"{email or github_username!r}"
                 )
-                if result.get("success"):
-                    self._merge_github_data(enriched_data, result)
-                    self.quota_manager.record_request("github")
-                    enriched_data["data_sources"].append("github")
-                    logger.info(
-                        f"✅ GitHub enrichment successful for {github_username!r}"
-                    )
-            except Exception as e:
-                logger.exception(f"GitHub error: {e!r}")
 
         # Calculate enrichment score based on filled fields
-        enriched_data["enrichment_score"] = self._calculate_enrichment_score(
-            enriched_data
-        )
+        enriched_data["enrichment_score"] = self.person_scorer.score(enriched_data)
+
+        if target_reached:
+            enriched_data["target_reached"] = True
+            if skipped:
+                enriched_data["skipped_providers"] = skipped
+                logger.info(f"⏩ Target completeness reached, skipped {skipped}")
+        elif skipped:
+            enriched_data["timed_out_providers"] = skipped
 
         # If no real data was obtained, use enhanced mock data
-        if not enriched_data["data_sources"]:
+        if not enriched_data["data_sources"] and not target_reached:
             logger.info("🔄 Falling back to mock data - no real APIs available")
             return self._generate_enhanced_mock_data(person_data)
 
         enriched_data["enriched_at"] = datetime.utcnow().isoformat()
         return enriched_data
 
-    def _merge_clearbit_data(self, enriched_data: Dict, clearbit_result: Dict):
-        """Merge Clearbit API response into enriched data."""
-        person = clearbit_result.get("person", {})
-        employment = clearbit_result.get("employment", {})
-        company = clearbit_result.get("company", {})
+    async def _run_batch(
+        self,
+        records: Iterable[Dict[str, Any]],
+        enrich: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]],
+        max_in_flight: Optional[int],
+    ) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """Stream ``(index, result)`` pairs over a bounded window of records.
+
+        Only ``max_in_flight`` records are enriched at once, so arbitrarily
+        large (or lazy) iterables never materialize as tasks all at once.
+        """
+        from config import settings
 
-        if person:
-            enriched_data["full_name"] = (
-                person.get("full_name") or enriched_data["full_name"]
-            )
-            enriched_data["contact"]["linkedin"] = person.get("linkedin")
-            enriched_data["contact"]["twitter"] = person.get("twitter")
-            enriched_data["contact"]["github"] = person.get("github")
-            enriched_data["location"] = person.get("location") or {}
-
-        if employment:
-            enriched_data["professional"] = {
-                "current_title": employment.get("title"),
-                "current_company": employment.get("name"),
-                "seniority": employment.get("seniority"),
-                "role": employment.get("role"),
-            }
-
-        if company:
-            enriched_data["professional"]["company_domain"] = company.get("domain")
-            enriched_data["professional"]["company_industry"] = company.get(
-                "category", {}
-            ).get("industry")
-
-    def _merge_hunter_data(self, enriched_data: Dict, hunter_result: Dict):
-        """Merge Hunter.io API response into enriched data."""
-        enriched_data["contact"]["email_verified"] = (
-            hunter_result.get("result") == "deliverable"
-        )
-        enriched_data["contact"]["email_confidence"] = hunter_result.get("score", 0)
-        enriched_data["contact"]["email_disposable"] = hunter_result.get(
-            "disposable", False
-        )
-        enriched_data["contact"]["email_webmail"] = hunter_result.get("webmail", False)
-
-    def _merge_github_data(self, enriched_data: Dict, github_result: Dict):
-        """Merge GitHub API response into enriched data."""
-        profile = github_result.get("profile", {})
-        repositories = github_result.get("repositories", [])
-        organizations = github_result.get("organizations", [])
-
-        if profile:
-            # Update basic info if not already set
-            if not enriched_data["full_name"] and profile.get("name"):
-                enriched_data["full_name"] = profile["name"]
-
-            # Add GitHub-specific contact info
-            enriched_data["contact"]["github"] = github_result.get("github_url")
-            if profile.get("email"):
-                enriched_data["contact"]["github_email"] = profile["email"]
-            if profile.get("twitter_username"):
-                enriched_data["contact"][
-                    "twitter"
-                ] = f"https://twitter.com/{profile['twitter_username']}"
-            if profile.get("blog"):
-                enriched_data["contact"]["website"] = profile["blog"]
-
-            # Add location if available
-            if profile.get("location"):
-                enriched_data["location"]["github_location"] = profile["location"]
-
-            # Add professional info
-            if profile.get("company"):
-                enriched_data["professional"]["github_company"] = profile["company"]
-
-            # Add developer-specific data
-            enriched_data["professional"]["github_stats"] = {
-                "public_repos": profile.get("public_repos", 0),
-                "followers": profile.get("followers", 0),
-                "following": profile.get("following", 0),
-            }
-
-            # Add bio as summary
-            if profile.get("bio"):
-                enriched_data["professional"]["bio"] = profile["bio"]
-
-        # Add programming skills
-        if github_result.get("programming_languages"):
-            enriched_data["skills"].extend(github_result["programming_languages"])
-            # Remove duplicates
-            enriched_data["skills"] = list(set(enriched_data["skills"]))
-
-        # Add repository information
-        if repositories:
-            enriched_data["professional"]["top_repositories"] = repositories
-
-        # Add organization memberships
-        if organizations:
-            enriched_data["professional"]["organizations"] = [
-                org.get("login") for org in organizations
-            ]
-
-    def _calculate_enrichment_score(self, data: Dict) -> int:
-        """Calculate enrichment score based on data completeness."""
-        key_fields = [
-            "full_name",
-            "email",
-            "professional.current_title",
-            "professional.current_company",
-            "contact.linkedin",
-            "location",
-        ]
-
-        filled_fields = 0
-        for field in key_fields:
-            if "." in field:
-                parts = field.split(".")
-                value = data
-                for part in parts:
-                    value = value.get(part, {}) if isinstance(value, dict) else None
-                    if not value:
+        window = max_in_flight or settings.enrichment_batch_max_in_flight
+        records_iter = enumerate(records)
+        in_flight: Dict[asyncio.Future, int] = {}
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(in_flight) < window:
+                    try:
+                        index, record = next(records_iter)
+                    except StopIteration:
+                        exhausted = True
                         break
-                if value:
-                    filled_fields += 1
-            elif data.get(field):
-                filled_fields += 1
+                    in_flight[asyncio.ensure_future(enrich(record))] = index
+                if not in_flight:
+                    return
+
+                done, _pending = await asyncio.wait(
+                    in_flight, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    yield in_flight.pop(task), task.result()
+        finally:
+            for task in in_flight:
+                task.cancel()
+
+    async def _resolve_lookups(
+        self,
+        lookups: Dict[str, Tuple[str, Callable[[], Awaitable[Dict[str, Any]]]]],
+        batch: Optional["_EnrichmentBatch"] = None,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Resolve planned provider lookups concurrently.
+
+        ``lookups`` maps provider name to ``(cache_key, fetch)``. Lookups that
+        fail, miss the deadline (``timeout``, by default the engine's
+        ``request_deadline``) or are over quota are left out of the result,
+        so callers merge only what actually arrived. Identical
+        ``(provider, cache_key)`` lookups in flight at the same time, from
+        any request, batch or worker, share a single provider call; within a
+        batch, recent resolutions are also reused by later records.
+        """
+        if not lookups:
+            return {}
+
+        pending = {}
+        for provider, (cache_key, fetch) in lookups.items():
+            key = (provider, cache_key)
+            semaphore = batch.semaphore(provider) if batch is not None else None
+            resolve = partial(
+                self._resolve_lookup, provider, cache_key, fetch, semaphore, timeout
+            )
+            if batch is None:
+                pending[provider] = self.single_flight.do(key, resolve)
+                continue
+            shared = batch.shared_lookup(
+                key, partial(self.single_flight.do, key, resolve)
+            )
+            pending[provider] = asyncio.shield(shared)
+
+        values = await asyncio.gather(*pending.values())
+        results = {}
+        for provider, value in zip(pending, values):
+            if value is None:
+                continue
+            # Results may be shared with other callers; merges get their own copy
+            results[provider] = copy.deepcopy(value)
+        return results
+
+    async def _resolve_until_complete(
+        self,
+        lookups: Dict[str, Tuple[str, Callable[[], Awaitable[Dict[str, Any]]]]],
+        batch: Optional["_EnrichmentBatch"],
+        record: Dict[str, Any],
+        goal: _CompletenessGoal,
+    ) -> Tuple[Dict[str, Dict[str, Any]], List[str], bool]:
+        """Resolve lookups one at a time until ``goal`` is met.
+
+        Providers run in order of expected score gain per lookup cost. After
+        each one, the results so far are merged (in precedence order) into a
+        copy of ``record`` to check the goal, and the gain is recorded to
+        refine later orderings. The whole sequence shares one
+        ``request_deadline``: each provider gets the time left, and providers
+        not reached in time are skipped. Returns the results, the providers
+        never queried and whether the goal was met (if not, those providers
+        were cut off by the deadline).
+        """
+        results: Dict[str, Dict[str, Any]] = {}
+        candidate = record
+        order = self._order_by_yield(lookups, goal)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.request_deadline
+        for position, provider in enumerate(order):
+            if goal.met(candidate):
+                return results, order[position:], True
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                logger.warning(
+                    f"⏱️ {self.request_deadline}s deadline reached; skipping "
+                    f"{', '.join(order[position:])}"
+                )
+                return results, order[position:], False
+
+            before = goal.scorer.score(candidate)
+            results.update(
+                await self._resolve_lookups(
+                    {provider: lookups[provider]}, batch, remaining
+                )
+            )
+            candidate = copy.deepcopy(record)
+            for name, mapping in goal.mappings.items():
+                result = results.get(name)
+                if result and result.get("success"):
+                    mapping.merge(candidate, result)
+
+            gain, count = self.provider_yields.get((goal.kind, provider), (0.0, 0))
+            self.provider_yields[(goal.kind, provider)] = (
+                gain + goal.scorer.score(candidate) - before,
+                count + 1,
+            )
+        return results, [], goal.met(candidate)
+
+    def _order_by_yield(
+        self, providers: Iterable[str], goal: _CompletenessGoal
+    ) -> List[str]:
+        """Order providers by expected score gain per lookup cost, best first.
+
+        The expected gain is the mean observed gain once a provider has been
+        used, else the score its mapped fields could add at most. Ties keep
+        merge precedence order.
+        """
+        precedence = list(goal.mappings)
+
+        def expected_gain(provider: str) -> float:
+            gain, count = self.provider_yields.get((goal.kind, provider), (0.0, 0))
+            if count:
+                return gain / count
+            mapping = goal.mappings.get(provider)
+            return goal.scorer.potential(mapping.targets) if mapping else 0.0
+
+        def key(provider: str) -> Tuple[float, int]:
+            cost = self.lookup_costs.get(provider, 1.0)
+            rank = (
+                precedence.index(provider)
+                if provider in precedence
+                else len(precedence)
+            )
+            return -expected_gain(provider) / cost, rank
+
+        return sorted(providers, key=key)
+
+    async def _resolve_lookup(
+        self,
+        provider: str,
+        cache_key: str,
+        fetch: Callable[[], Awaitable[Dict[str, Any]]],
+        semaphore: Optional[asyncio.Semaphore] = None,
+        timeout: Optional[float] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Resolve one lookup from cache, else from the provider under the deadline.
+
+        Cache hits skip the quota check entirely. A quota credit is reserved
+        before the live call and refunded unless it succeeds, so only
+        successful calls consume quota; those are written back to the cache.
+        The live call gets ``timeout`` seconds (default ``request_deadline``);
+        time spent waiting on a batch ``semaphore`` does not count against it.
+        """
+        if timeout is None:
+            timeout = self.request_deadline
+        if self.cache is not None:
+            cached = self.cache.get(provider, cache_key)
+            if cached is not None:
+                return cached
+        reservation = self.quota_manager.reserve(provider)
+        if reservation is None:
+            return None
+
+        with reservation:
+            try:
+                if semaphore is None:
+                    result = await asyncio.wait_for(fetch(), timeout)
+                else:
+                    async with semaphore:
+                        result = await asyncio.wait_for(fetch(), timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"⏱️ {provider} lookup exceeded {timeout:.2f}s deadline")
+                return None
+            except Exception as e:
+                logger.exception(f"{provider} error: {e!r}")
+                return None
 
-        return int((filled_fields / len(key_fields)) * 100)
+            if result.get("success"):
+                reservation.take()
+                if self.cache is not None:
+                    self.cache.set(provider, cache_key, result)
+        return result
 
     def _generate_enhanced_mock_data(self, person_data: Dict) -> Dict:
         """Generate enhanced mock data when real APIs are not available."""
@@ -337,6 +568,30 @@ class RealDataEnrichmentEngine:
 
     async def enrich_company_real(self, company_data: Dict[str, Any]) -> Dict[str, Any]:
         """Enrich company data using real APIs."""
+        return await self._enrich_company(company_data)
+
+    async def enrich_companies_batch(
+        self,
+        companies: Iterable[Dict[str, Any]],
+        concurrency: Union[int, Dict[str, int], None] = None,
+        max_in_flight: Optional[int] = None,
+    ) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """Enrich many companies, yielding ``(index, enriched_data)`` as each completes.
+
+        Same batching semantics as ``enrich_people_batch``.
+        """
+        batch = _EnrichmentBatch(concurrency)
+        async for item in self._run_batch(
+            companies, partial(self._enrich_company, batch=batch), max_in_flight
+        ):
+            yield item
+
+    async def _enrich_company(
+        self,
+        company_data: Dict[str, Any],
+        batch: Optional["_EnrichmentBatch"] = None,
+    ) -> Dict[str, Any]:
+        """Enrich one company, optionally sharing lookups with a batch."""
         domain = company_data.get("domain")
         name = company_data.get("name")
 
@@ -355,26 +610,25 @@ class RealDataEnrichmentEngine:
         }
 
         # Try Clearbit for company enrichment
-        if (
-            "clearbit" in self.services
-            and self.quota_manager.can_make_request("clearbit")
-            and domain
-        ):
-            try:
-                result = await self.services["clearbit"].enrich_company(domain)
-                if result.get("success"):
-                    self._merge_clearbit_company_data(enriched_data, result)
-                    self.quota_manager.record_request("clearbit")
-                    enriched_data["data_sources"].append("clearbit")
-                    logger.info(
-                        f"✅ Clearbit company enrichment successful for {domain!r}"
-                    )
-            except Exception as e:
-                logger.exception(f"Clearbit company error: {e!r}")
+        lookups = {}
+        if "clearbit" in self.services and domain:
+            lookups["clearbit"] = (
+                f"company:{normalize_domain(domain)}",
+                partial(self.services["clearbit"].enrich_company, domain),
+            )
 
-        enriched_data["enrichment_score"] = self._calculate_company_enrichment_score(
-            enriched_data
-        )
+        results = await self._resolve_lookups(lookups, batch)
+
+        for provider, mapping in self.company_mappings.items():
+            result = results.get(provider)
+            if result and result.get("success"):
+                mapping.merge(enriched_data, result)
+                enriched_data["data_sources"].append(provider)
+                logger.info(
+                    f"✅ {provider} company enrichment successful for {domain!r}"
+                )
+
+        enriched_data["enrichment_score"] = self.company_scorer.score(enriched_data)
 
         if not enriched_data["data_sources"]:
             return self._generate_mock_company_data(company_data)
@@ -382,33 +636,6 @@ class RealDataEnrichmentEngine:
         enriched_data["enriched_at"] = datetime.utcnow().isoformat()
         return enriched_data
 
-    def _merge_clearbit_company_data(self, enriched_data: Dict, clearbit_result: Dict):
-        """Merge Clearbit company data into enriched data."""
-        company = clearbit_result.get("company", {})
-
-        if company:
-            enriched_data["name"] = company.get("name") or enriched_data["name"]
-            enriched_data["description"] = company.get("description")
-            enriched_data["industry"] = company.get("industry")
-            enriched_data["employees"] = company.get("employees")
-            enriched_data["revenue"] = company.get("estimated_annual_revenue")
-            enriched_data["founded"] = company.get("founded_year")
-            enriched_data["location"] = company.get("location", {})
-            enriched_data["tech_stack"] = company.get("tech_stack", [])
-            enriched_data["social"] = {
-                "linkedin": company.get("linkedin"),
-                "twitter": company.get("twitter"),
-                "facebook": company.get("facebook"),
-            }
-
-    def _calculate_company_enrichment_score(self, data: Dict) -> int:
-        """Calculate company enrichment score."""
-        key_fields = ["name", "domain", "industry", "employees", "founded", "location"]
-        filled_fields = sum(
-            1 for field in key_fields if data.get(field)
-        )  # TODO: Review loop variable naming (PLW2901)  # TODO: Review loop variable naming (PLW2901)
-        return int((filled_fields / len(key_fields)) * 100)
-
     def _generate_mock_company_data(self, company_data: Dict) -> Dict:
         """Generate mock company data when real APIs are not available."""
         name = company_data.get("name", "Unknown Company")
@@ -435,5 +662,31 @@ class RealDataEnrichmentEngine:
         }
 
 
-# Global instance
-real_enrichment_engine = RealDataEnrichmentEngine()
+# Holds the shared engine once created
+_shared_engine: Dict[str, RealDataEnrichmentEngine] = {}
+
+
+def get_enrichment_engine() -> RealDataEnrichmentEngine:
+    """Get the shared engine, creating it on first use.
+
+    The FastAPI lifespan creates it at startup and closes it at shutdown;
+    processes that never enrich never build it.
+    """
+    if "engine" not in _shared_engine:
+        _shared_engine["engine"] = RealDataEnrichmentEngine()
+    return _shared_engine["engine"]
+
+
+def close_enrichment_engine():
+    """Close and drop the shared engine, if it was created."""
+    engine = _shared_engine.pop("engine", None)
+    if engine is not None:
+        engine.close()
+
+
+def __getattr__(name: str) -> Any:
+    # Keep ``from ... import real_enrichment_engine`` working without
+    # building the engine at import time
+    if name == "real_enrichment_engine":
+        return get_enrichment_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
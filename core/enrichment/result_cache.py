@@ -0,0 +1,183 @@
+"""
+Enrichment Result Cache
+Persistent SQLite-backed cache of provider responses with per-provider TTLs
+"""
+
+import json
+import logging
+import sqlite3
+import time
+from typing import Any, Dict, Optional
+
+from database.utils.sqlite_store import SQLiteStore
+
+
+logger = logging.getLogger(__name__)
+
+# Time-to-live per provider, in seconds
+DEFAULT_TTLS = {
+    "clearbit": 30 * 24 * 3600,  # Person/company profiles change slowly
+    "hunter": 7 * 24 * 3600,  # Deliverability can drift
+    "github": 24 * 3600,  # Repos and followers change daily
+}
+DEFAULT_TTL = 24 * 3600
+
+
+def normalize_email(email: str) -> str:
+    """Normalize an email address for use as a cache key."""
+    return email.strip().lower()
+
+
+def normalize_domain(domain: str) -> str:
+    """Normalize a domain or website URL for use as a cache key."""
+    value = domain.strip().lower()
+    if "://" in value:
+        value = value.split("://", 1)[1]
+    value = value.split("/", 1)[0]
+    if value.startswith("www."):
+        value = value[4:]
+    return value.rstrip(".")
+
+
+class EnrichmentResultCache(SQLiteStore):
+    """Provider response cache keyed by provider + normalized lookup key.
+
+    Entries live in a local SQLite file so they survive restarts; a small
+    in-process LRU sits in front of it so repeated hits skip SQLite entirely.
+    Only successful provider responses should be stored.
+    """
+
+    schema = (
+        """
+        CREATE TABLE IF NOT EXISTS enrichment_cache (
+            provider TEXT NOT NULL,
+            lookup_key TEXT NOT NULL,
+            value TEXT NOT NULL,
+            stored_at REAL NOT NULL,
+            expires_at REAL NOT NULL,
+            PRIMARY KEY (provider, lookup_key)
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS ix_enrichment_cache_expires_at "
+        "ON enrichment_cache (expires_at)",
+    )
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 100_000,
+        ttls: Optional[Dict[str, int]] = None,
+        memory_entries: int = 1024,
+    ):
+        super().__init__(path, memory_entries)
+        self.max_entries = max_entries
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def ttl_for(self, provider: str) -> int:
+        """Get the TTL in seconds for a provider."""
+        return self.ttls.get(provider, DEFAULT_TTL)
+
+    def _record(self, provider: str, hit: bool):
+        counters = self._stats.setdefault(provider, {"hits": 0, "misses": 0})
+        counters["hits" if hit else "misses"] += 1
+
+    def get(self, provider: str, key: str) -> Optional[Dict[str, Any]]:
+        """Get a cached response, or None on miss or expiry.
+
+        Every hit returns a fresh copy, so callers may mutate it freely.
+        """
+        now = time.time()
+        mem_key = (provider, key)
+        with self._lock:
+            entry = self._recall(mem_key)
+            if entry is not None and entry[0] > now:
+                self._record(provider, hit=True)
+                return json.loads(entry[1])
+
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT value, expires_at FROM enrichment_cache "
+                    "WHERE provider = ? AND lookup_key = ?",
+                    (provider, key),
+                )
+                .fetchone()
+            )
+            if row is None or row[1] <= now:
+                self._memory.pop(mem_key, None)
+                self._record(provider, hit=False)
+                return None
+
+            self._remember(mem_key, (row[1], row[0]))
+            self._record(provider, hit=True)
+            return json.loads(row[0])
+
+    def set(self, provider: str, key: str, value: Dict[str, Any]):
+        """Store a provider response under the provider's TTL."""
+        ttl = self.ttl_for(provider)
+        if ttl <= 0:
+            return
+
+        now = time.time()
+        expires_at = now + ttl
+        payload = json.dumps(value, default=str)
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO enrichment_cache "
+                "(provider, lookup_key, value, stored_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (provider, key, payload, now, expires_at),
+            )
+            conn.commit()
+            self._remember((provider, key), (expires_at, payload))
+            if self._note_write():
+                self._prune(conn, now)
+
+    def _prune(self, conn: sqlite3.Connection, now: float):
+        """Drop expired entries, then the soonest-to-expire beyond max_entries."""
+        conn.execute("DELETE FROM enrichment_cache WHERE expires_at <= ?", (now,))
+        (count,) = conn.execute("SELECT COUNT(*) FROM enrichment_cache").fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM enrichment_cache WHERE rowid IN ("
+                "SELECT rowid FROM enrichment_cache ORDER BY expires_at ASC LIMIT ?)",
+                (excess,),
+            )
+            logger.info(f"🧹 Evicted {excess} enrichment cache entries")
+        conn.commit()
+
+    def prune(self):
+        """Run an eviction sweep now."""
+        with self._lock:
+            self._prune(self._connect(), time.time())
+
+    def clear(self):
+        """Remove every cached entry and reset counters."""
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM enrichment_cache")
+            conn.commit()
+            self._memory.clear()
+            self._stats.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and the number of stored entries."""
+        with self._lock:
+            (entries,) = (
+                self._connect()
+                .execute("SELECT COUNT(*) FROM enrichment_cache")
+                .fetchone()
+            )
+            hits = sum(c["hits"] for c in self._stats.values())
+            misses = sum(c["misses"] for c in self._stats.values())
+            lookups = hits + misses
+            return {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "entries": entries,
+                "providers": {p: dict(c) for p, c in self._stats.items()},
+            }
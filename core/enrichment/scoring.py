@@ -0,0 +1,147 @@
+"""
+Enrichment Scoring
+Weighted completeness scores for single records, batches or whole tables
+"""
+
+import logging
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.engine import Engine
+
+from core.enrichment.field_mapping import compile_path
+
+
+logger = logging.getLogger(__name__)
+
+# Fields counted towards completeness, with their weights
+PERSON_SCORE_WEIGHTS = {
+    "full_name": 1.0,
+    "email": 1.0,
+    "professional.current_title": 1.0,
+    "professional.current_company": 1.0,
+    "contact.linkedin": 1.0,
+    "location": 1.0,
+}
+
+COMPANY_SCORE_WEIGHTS = {
+    "name": 1.0,
+    "domain": 1.0,
+    "industry": 1.0,
+    "employees": 1.0,
+    "founded": 1.0,
+    "location": 1.0,
+}
+
+
+class EnrichmentScorer:
+    """Score records 0-100 by the weighted share of fields that are filled.
+
+    Dotted paths are compiled to accessors once; a field counts when its
+    value is truthy. With equal weights the score is the plain percentage
+    of filled fields.
+    """
+
+    def __init__(self, weights: Mapping[str, float]):
+        if not weights or any(weight < 0 for weight in weights.values()):
+            raise ValueError("Score weights must be non-empty and non-negative")
+        self.weights = dict(weights)
+        self.total = float(sum(self.weights.values()))
+        if not self.total:
+            raise ValueError("Score weights must not all be zero")
+        self._fields = tuple(
+            (compile_path(path), weight) for path, weight in self.weights.items()
+        )
+        self._uniform = len(set(self.weights.values())) == 1
+        self._getters = tuple(get for get, _ in self._fields)
+
+    def filled(self, data: Dict[str, Any]) -> Dict[str, bool]:
+        """Which scored fields ``data`` fills."""
+        return {
+            path: bool(get(data)) for path, (get, _) in zip(self.weights, self._fields)
+        }
+
+    def potential(self, paths: Iterable[str]) -> float:
+        """Score points that writing ``paths`` could add at most.
+
+        A written path counts for a scored field when it is the field, lies
+        inside it (``location.city`` fills ``location``) or contains it.
+        """
+        written = tuple(paths)
+        weight = sum(
+            field_weight
+            for field, field_weight in self.weights.items()
+            if any(
+                path == field
+                or path.startswith(field + ".")
+                or field.startswith(path + ".")
+                for path in written
+            )
+        )
+        return weight / self.total * 100
+
+    def score(self, data: Dict[str, Any]) -> int:
+        """Score one record."""
+        if self._uniform:
+            filled = sum(1 for get in self._getters if get(data))
+            return int((filled / len(self._getters)) * 100)
+        filled_weight = sum(weight for get, weight in self._fields if get(data))
+        return int((filled_weight / self.total) * 100)
+
+    def score_batch(self, records: Iterable[Optional[Dict[str, Any]]]) -> List[int]:
+        """Score many records in one pass; missing records score 0."""
+        score = self.score
+        return [score(data) if data else 0 for data in records]
+
+
+PERSON_SCORER = EnrichmentScorer(PERSON_SCORE_WEIGHTS)
+COMPANY_SCORER = EnrichmentScorer(COMPANY_SCORE_WEIGHTS)
+
+
+def rescore_table(
+    bind: Engine,
+    model: Any,
+    scorer: EnrichmentScorer,
+    batch_size: int = 1000,
+) -> int:
+    """Recompute ``enrichment_score`` inside every row's ``enrichment_data``.
+
+    Rows are read in id order ``batch_size`` at a time; rows whose score
+    changed are written back with one executemany per batch, each batch in
+    its own transaction. Rows never scored are left alone. Returns the
+    number of rows updated.
+    """
+    table = model.__table__
+    query = (
+        select(table.c.id, table.c.enrichment_data)
+        .where(table.c.enrichment_data.isnot(None))
+        .order_by(table.c.id)
+        .limit(batch_size)
+    )
+    statement = (
+        update(table)
+        .where(table.c.id == bindparam("row_id"))
+        .values(enrichment_data=bindparam("data"))
+    )
+
+    updated = 0
+    last_id = 0
+    while True:
+        with bind.begin() as connection:
+            rows = connection.execute(query.where(table.c.id > last_id)).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+
+            records = [row.enrichment_data or {} for row in rows]
+            changes = [
+                {"row_id": row.id, "data": {**data, "enrichment_score": score}}
+                for row, data, score in zip(rows, records, scorer.score_batch(records))
+                if "enrichment_score" in data and data["enrichment_score"] != score
+            ]
+            if changes:
+                connection.execute(statement, changes)
+                updated += len(changes)
+
+    logger.info(f"🔢 Rescored {updated} {table.name} rows")
+    return updated
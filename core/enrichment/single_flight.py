@@ -0,0 +1,53 @@
+"""
+Single-Flight Request Coalescing
+Concurrent identical lookups share one in-flight call and its result
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """Deduplicate concurrent calls by key.
+
+    The first caller for a key starts the call; callers arriving while it
+    is in flight await the same result. The key is forgotten as soon as the
+    call finishes, so later callers start a fresh call (and normally hit the
+    result cache the first call populated). Awaiters are shielded: one
+    caller being cancelled does not cancel the call for the others.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self.leaders = 0
+        self.followers = 0
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the result of ``call()``, sharing it with concurrent callers."""
+        future = self._calls.get(key)
+        if future is not None and future.get_loop() is not asyncio.get_running_loop():
+            future = None  # left over from another event loop
+
+        if future is None:
+            future = asyncio.ensure_future(call())
+            self._calls[key] = future
+            future.add_done_callback(lambda done: self._forget(key, done))
+            self.leaders += 1
+        else:
+            self.followers += 1
+        return await asyncio.shield(future)
+
+    def _forget(self, key: Hashable, future: asyncio.Future):
+        if self._calls.get(key) is future:
+            del self._calls[key]
+
+    def stats(self) -> Dict[str, int]:
+        """Calls started vs. calls that joined one already in flight."""
+        return {
+            "in_flight": len(self._calls),
+            "leaders": self.leaders,
+            "followers": self.followers,
+        }
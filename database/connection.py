@@ -1,6 +1,8 @@
 """Database connection and session management."""
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -16,6 +18,26 @@ engine = create_engine(
 # Create sessionmaker
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async drivers for the same databases
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+ASYNC_DRIVER_NAMES = {"aiosqlite", "asyncpg", "psycopg", "psycopg_async"}
+
+
+def get_async_database_url(database_url: str) -> str:
+    """Map a sync database URL to its async driver (aiosqlite, asyncpg)."""
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend in ASYNC_DRIVERS and url.get_driver_name() not in ASYNC_DRIVER_NAMES:
+        url = url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+    return url.render_as_string(hide_password=False)
+
+
+# Create async engine and sessionmaker for the API routes
+async_engine = create_async_engine(get_async_database_url(settings.database_url))
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
 # Create base class for models
 Base = declarative_base()
 
@@ -29,6 +51,12 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    """Dependency to get an async database session."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def create_tables():
     """Create all database tables."""
     Base.metadata.create_all(bind=engine)
@@ -3,7 +3,8 @@
 from database.models.base import BaseModel
 from database.models.company import Company
 from database.models.contact import Contact
+from database.models.enrichment_job import EnrichmentJob
 from database.models.product import Product
 
 
-__all__ = ["BaseModel", "Company", "Contact", "Product"]
+__all__ = ["BaseModel", "Company", "Contact", "EnrichmentJob", "Product"]
@@ -0,0 +1,49 @@
+"""Enrichment job database model."""
+
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import JSON
+
+from database.models.base import BaseModel
+
+
+class EnrichmentJob(BaseModel):
+    """Background enrichment job leased and processed by the worker pool."""
+
+    # What to enrich: "person" or "company"
+    entity_type = Column(String(20), nullable=False)
+    entity_id = Column(Integer, nullable=True)  # Contact/Company id to update
+    payload = Column(JSON, default=dict)
+
+    # Queue state: queued -> running -> succeeded | failed
+    status = Column(String(20), nullable=False, default="queued")
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    run_after = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    # Lease (visibility timeout) held by the worker currently running the job
+    lease_token = Column(String(64))
+    lease_expires_at = Column(DateTime)
+
+    # Outcome
+    result = Column(JSON)
+    error = Column(Text)
+    completed_at = Column(DateTime)
+
+    __table_args__ = (
+        Index("ix_enrichmentjobs_status_run_after", "status", "run_after"),
+    )
+
+    def to_dict(self):
+        """Convert model to dictionary, without the worker's lease token."""
+        data = super().to_dict()
+        data.pop("lease_token", None)
+        return data
+
+    def __repr__(self):
+        """String representation of EnrichmentJob."""
+        return (
+            f"<EnrichmentJob(id={self.id}, entity_type='{self.entity_type}', "
+            f"status='{self.status}')>"
+        )
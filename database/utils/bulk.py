@@ -0,0 +1,298 @@
+"""Bulk insert and upsert helpers that write rows in chunked transactions."""
+
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import case, func, insert, literal_column, or_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+
+# Columns the server assigns; bulk payloads may not set them.
+MANAGED_COLUMNS = frozenset({"id", "created_at", "updated_at"})
+
+# How upserts combine incoming enrichment_data with the stored value
+MERGE_POLICIES = ("replace", "deep")
+
+# Dialects with a native recursive JSON merge for ``merge="deep"``
+DEEP_MERGE_DIALECTS = ("sqlite",)
+
+NDJSON_CONTENT_TYPES = (
+    "application/x-ndjson",
+    "application/ndjson",
+    "application/jsonl",
+)
+
+
+def parse_bulk_body(body: bytes, content_type: Optional[str] = None) -> List[Any]:
+    """Parse a JSON array or NDJSON (one object per line) request body.
+
+    Raises ValueError if the body is not valid for its content type.
+    """
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type in NDJSON_CONTENT_TYPES:
+        rows = []
+        for line_number, line in enumerate(body.decode("utf-8").splitlines(), 1):
+            if not line.strip():
+                continue
+            try:
+                rows.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON on line {line_number}: {e.msg}") from e
+        return rows
+
+    try:
+        rows = json.loads(body or b"null")
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON body: {e.msg}") from e
+    if not isinstance(rows, list):
+        raise ValueError("Bulk body must be a JSON array or NDJSON")
+    return rows
+
+
+def validate_row(model: Any, row: Any) -> Optional[str]:
+    """Return an error message if ``row`` cannot be inserted into ``model``."""
+    if not isinstance(row, dict):
+        return "Row must be a JSON object"
+
+    columns = model.__table__.columns
+    unknown = sorted(key for key in row if key not in columns or key in MANAGED_COLUMNS)
+    if unknown:
+        return f"Unknown or read-only fields: {', '.join(unknown)}"
+
+    missing = [
+        column.name
+        for column in columns
+        if not column.nullable
+        and column.default is None
+        and column.name not in MANAGED_COLUMNS
+        and row.get(column.name) in (None, "")
+    ]
+    if missing:
+        return f"Missing required fields: {', '.join(missing)}"
+    return None
+
+
+def _unique_keys(model: Any) -> List[str]:
+    """Natural-key columns (domain, email, sku) that must be unique."""
+    return [
+        column.name
+        for column in model.__table__.columns
+        if column.unique and column.name not in MANAGED_COLUMNS
+    ]
+
+
+def _upsert_key(model: Any) -> str:
+    """The natural key upserts resolve conflicts on."""
+    keys = _unique_keys(model)
+    if len(keys) != 1:
+        raise ValueError(f"{model.__name__} has no single natural key to upsert on")
+    return keys[0]
+
+
+def _deep_merge(existing: Any, incoming: Any) -> Any:
+    """SQL expression merging ``incoming`` JSON into ``existing``.
+
+    Uses SQLite's ``json_patch`` (RFC 7386): nested objects merge
+    recursively, other values are replaced and ``null`` removes a key. An
+    incoming SQL or JSON ``null`` keeps ``existing`` as is, since patching
+    with a top-level ``null`` would replace the whole document. PostgreSQL
+    has no built-in recursive merge (``jsonb ||`` is top level only), so
+    ``bulk_insert`` refuses deep merges there.
+    """
+    empty = literal_column("'{}'")
+    return case(
+        (or_(incoming.is_(None), incoming == literal_column("'null'")), existing),
+        else_=func.json_patch(func.coalesce(existing, empty), incoming),
+    )
+
+
+def _insert_statement(
+    db: Session,
+    model: Any,
+    keys: Tuple[str, ...],
+    upsert_key: Optional[str] = None,
+    merge: str = "replace",
+) -> Any:
+    """INSERT ... RETURNING id, or a native ON CONFLICT upsert on ``upsert_key``."""
+    table = model.__table__
+    if upsert_key is None:
+        statement = insert(table)
+    else:
+        dialect = db.get_bind().dialect.name
+        if dialect == "postgresql":
+            statement = postgresql.insert(table)
+        elif dialect == "sqlite":
+            statement = sqlite.insert(table)
+        else:
+            raise ValueError(f"Upsert is not supported on {dialect}")
+
+        # Only the supplied columns are overwritten; the rest keep their values
+        updates = {key: statement.excluded[key] for key in keys if key != upsert_key}
+        if merge == "deep" and "enrichment_data" in updates:
+            updates["enrichment_data"] = _deep_merge(
+                table.c.enrichment_data, statement.excluded.enrichment_data
+            )
+        # Column onupdate hooks do not fire for ON CONFLICT DO UPDATE
+        updates["updated_at"] = datetime.utcnow()
+        statement = statement.on_conflict_do_update(
+            index_elements=[upsert_key], set_=updates
+        )
+    return statement.returning(table.c.id, sort_by_parameter_order=True)
+
+
+def _insert_rows(
+    db: Session,
+    model: Any,
+    rows: List[Tuple[int, Dict[str, Any]]],
+    upsert_key: Optional[str] = None,
+    merge: str = "replace",
+) -> List[int]:
+    """Insert rows with one executemany per distinct key set, returning ids.
+
+    executemany needs every parameter set to share the same keys, and
+    omitted keys must still get their column defaults, so rows are grouped
+    by key set instead of being padded with NULLs.
+    """
+    groups: Dict[Tuple[str, ...], List[int]] = {}
+    for position, (_, row) in enumerate(rows):
+        groups.setdefault(tuple(sorted(row)), []).append(position)
+
+    ids: List[int] = [0] * len(rows)
+    for keys, positions in groups.items():
+        statement = _insert_statement(db, model, keys, upsert_key, merge)
+        result = db.execute(statement, [rows[position][1] for position in positions])
+        for position, new_id in zip(positions, result.scalars()):
+            ids[position] = new_id
+    return ids
+
+
+def _existing_keys(
+    db: Session,
+    model: Any,
+    upsert_key: Optional[str],
+    chunk: List[Tuple[int, Dict[str, Any]]],
+) -> set:
+    """Natural-key values in ``chunk`` that already exist (upserts only)."""
+    if upsert_key is None:
+        return set()
+    values = [row[upsert_key] for _, row in chunk if row.get(upsert_key) is not None]
+    if not values:
+        return set()
+    column = getattr(model, upsert_key)
+    return {value for (value,) in db.query(column).filter(column.in_(values))}
+
+
+def _insert_chunk(
+    db: Session,
+    model: Any,
+    chunk: List[Tuple[int, Dict[str, Any]]],
+    upsert_key: Optional[str] = None,
+    merge: str = "replace",
+) -> Dict[int, Dict[str, Any]]:
+    """Insert one chunk in a single transaction; return per-row status by index.
+
+    If the chunk violates a constraint, it is retried row by row inside
+    savepoints (still one transaction) so only the offending rows fail.
+    """
+
+    def status(index: int, row: Dict[str, Any], new_id: int) -> Dict[str, Any]:
+        outcome = "updated" if row.get(upsert_key) in existing else "created"
+        return {"index": index, "status": outcome, "id": new_id}
+
+    try:
+        existing = _existing_keys(db, model, upsert_key, chunk)
+        ids = _insert_rows(db, model, chunk, upsert_key, merge)
+        db.commit()
+        return {
+            index: status(index, row, new_id)
+            for (index, row), new_id in zip(chunk, ids)
+        }
+    except SQLAlchemyError:
+        db.rollback()
+
+    existing = _existing_keys(db, model, upsert_key, chunk)
+    statuses: Dict[int, Dict[str, Any]] = {}
+    for index, row in chunk:
+        try:
+            with db.begin_nested():
+                (new_id,) = _insert_rows(db, model, [(index, row)], upsert_key, merge)
+            statuses[index] = status(index, row, new_id)
+        except SQLAlchemyError as e:
+            statuses[index] = {
+                "index": index,
+                "status": "error",
+                "error": str(getattr(e, "orig", None) or e),
+            }
+    db.commit()
+    return statuses
+
+
+def bulk_insert(
+    db: Session,
+    model: Any,
+    rows: List[Any],
+    chunk_size: Optional[int] = None,
+    *,
+    upsert: bool = False,
+    merge: str = "replace",
+) -> Dict[str, Any]:
+    """Validate and insert ``rows`` into ``model`` in chunked transactions.
+
+    Each chunk is one executemany inside one transaction, instead of one
+    ORM flush and commit per row. With ``upsert`` rows that collide on the
+    model's natural key (domain, email, sku) update the existing row in the
+    same statement; ``merge`` picks how ``enrichment_data`` is combined,
+    ``"replace"`` or ``"deep"`` (SQLite only). Returns a summary with a
+    status entry for every input row, in input order.
+    """
+    from config import settings
+
+    if merge not in MERGE_POLICIES:
+        raise ValueError(f"Unsupported merge policy: {merge!r}")
+    chunk_size = chunk_size or settings.bulk_insert_chunk_size
+    upsert_key = _upsert_key(model) if upsert else None
+    if upsert_key is not None and merge == "deep":
+        dialect = db.get_bind().dialect.name
+        if dialect not in DEEP_MERGE_DIALECTS:
+            raise ValueError(
+                f"merge='deep' is not supported on {dialect}; use merge='replace'"
+            )
+    unique_keys = _unique_keys(model)
+    seen: Dict[str, set] = {key: set() for key in unique_keys}
+
+    statuses: Dict[int, Dict[str, Any]] = {}
+    valid: List[Tuple[int, Dict[str, Any]]] = []
+    for index, row in enumerate(rows):
+        error = validate_row(model, row)
+        if error is None:
+            for key in unique_keys:
+                value = row.get(key)
+                if value is None or isinstance(value, (dict, list)):
+                    continue
+                if value in seen[key]:
+                    error = f"Duplicate {key} within request: {value!r}"
+                    break
+                seen[key].add(value)
+        if error is not None:
+            statuses[index] = {"index": index, "status": "error", "error": error}
+        else:
+            valid.append((index, row))
+
+    for start in range(0, len(valid), chunk_size):
+        chunk = valid[start : start + chunk_size]
+        statuses.update(_insert_chunk(db, model, chunk, upsert_key, merge))
+
+    results = [statuses[index] for index in range(len(rows))]
+    created = sum(1 for status in results if status["status"] == "created")
+    updated = sum(1 for status in results if status["status"] == "updated")
+    return {
+        "success": created + updated == len(rows),
+        "total": len(rows),
+        "created": created,
+        "updated": updated,
+        "failed": len(rows) - created - updated,
+        "results": results,
+    }
@@ -0,0 +1,91 @@
+"""Keyset (cursor) pagination helpers for list endpoints."""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import Select, and_, or_, select
+
+
+# Sort keys supported by keyset pagination; each ends with the primary key
+# so the ordering is total even when updated_at values collide.
+ORDER_KEYS = ("id", "updated_at")
+
+
+def encode_cursor(order_by: str, row: Any) -> str:
+    """Encode the position just after ``row`` as an opaque cursor."""
+    state: Dict[str, Any] = {"o": order_by, "id": row.id}
+    if order_by == "updated_at":
+        state["u"] = row.updated_at.isoformat()
+    raw = json.dumps(state, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Decode a cursor produced by ``encode_cursor``.
+
+    Raises ValueError for malformed or tampered cursors.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if state["o"] not in ORDER_KEYS or not isinstance(state["id"], int):
+            raise ValueError("unknown cursor ordering")
+        if state["o"] == "updated_at":
+            state["u"] = datetime.fromisoformat(state["u"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+    return state
+
+
+def keyset_select(
+    model: Any,
+    limit: int,
+    cursor: Optional[str] = None,
+    order_by: str = "id",
+) -> Select:
+    """Build the SELECT for one page after ``cursor`` using a keyset predicate.
+
+    Seeks directly to the page start through the index instead of scanning
+    and discarding ``skip`` rows, and stays stable while rows are inserted.
+    One extra row is selected so ``split_page`` can tell if another page exists.
+    """
+    if order_by not in ORDER_KEYS:
+        raise ValueError(f"Unsupported order_by: {order_by!r}")
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+
+    statement = select(model)
+    if cursor:
+        state = decode_cursor(cursor)
+        if state["o"] != order_by:
+            raise ValueError("Cursor was issued for a different order_by")
+        if order_by == "updated_at":
+            statement = statement.where(
+                or_(
+                    model.updated_at > state["u"],
+                    and_(model.updated_at == state["u"], model.id > state["id"]),
+                )
+            )
+        else:
+            statement = statement.where(model.id > state["id"])
+
+    if order_by == "updated_at":
+        statement = statement.order_by(model.updated_at, model.id)
+    else:
+        statement = statement.order_by(model.id)
+    return statement.limit(limit + 1)
+
+
+def split_page(
+    rows: List[Any], limit: int, order_by: str = "id"
+) -> Tuple[List[Any], Optional[str]]:
+    """Trim the extra row fetched by ``keyset_select``.
+
+    Returns ``(rows, next_cursor)``; ``next_cursor`` is None on the last page.
+    """
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(order_by, rows[-1])
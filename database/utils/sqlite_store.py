@@ -0,0 +1,84 @@
+"""
+Local SQLite Store
+Shared scaffolding for the host-local SQLite caches and ledgers
+"""
+
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+
+class SQLiteStore:
+    """A local SQLite file opened lazily and shared across threads.
+
+    Subclasses list their ``CREATE`` statements in ``schema``; they run once
+    when the file is first opened, in WAL mode so several processes can read
+    while one writes. Every access must hold ``_lock``. An optional
+    in-process LRU of ``memory_entries`` items sits in front of the file,
+    and ``_note_write`` tells callers when an eviction sweep is due.
+    """
+
+    schema: Tuple[str, ...] = ()
+    # PRAGMA synchronous level, or None to keep SQLite's default (FULL)
+    synchronous: Optional[str] = "NORMAL"
+    # Seconds to wait for another writer's lock
+    timeout = 5.0
+    # None means autocommit; "" lets sqlite3 open transactions implicitly
+    isolation_level: Optional[str] = ""
+    prune_interval = 256
+
+    def __init__(self, path: str, memory_entries: int = 0):
+        self.path = path
+        self.memory_entries = memory_entries
+        self._memory: OrderedDict = OrderedDict()
+        self._writes_since_prune = 0
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the SQLite file lazily on first use."""
+        if self._conn is None:
+            conn = sqlite3.connect(
+                self.path,
+                timeout=self.timeout,
+                isolation_level=self.isolation_level,
+                check_same_thread=False,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            if self.synchronous:
+                conn.execute(f"PRAGMA synchronous={self.synchronous}")
+            for statement in self.schema:
+                conn.execute(statement)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _recall(self, key: Hashable) -> Any:
+        """Get an in-memory entry and mark it recently used, or None."""
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+        return entry
+
+    def _remember(self, key: Hashable, entry: Any):
+        """Keep an entry in memory, evicting the least recently used."""
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _note_write(self) -> bool:
+        """Count a write; True once every ``prune_interval`` writes."""
+        self._writes_since_prune += 1
+        if self._writes_since_prune < self.prune_interval:
+            return False
+        self._writes_since_prune = 0
+        return True
+
+    def close(self):
+        """Close the underlying SQLite connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
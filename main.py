@@ -7,18 +7,29 @@ import logging
 import os
 from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Union
 
 import uvicorn
-from fastapi import Depends, FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import text
-from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
 from config import settings
 from config.ports import PortConfig, get_user_friendly_url, is_port_available
-from database.connection import Base, engine, get_db
+from core.enrichment.jobs import enrichment_job_queue, enrichment_worker_pool
+from core.enrichment.real_data_enrichment import (
+    close_enrichment_engine,
+    get_enrichment_engine,
+)
+from database.connection import Base, async_engine, engine, get_async_db
 from database.models import Company, Contact, Product
+from database.utils.bulk import bulk_insert, parse_bulk_body
+from database.utils.export import EXPORT_FORMATS, stream_export
+from database.utils.pagination import encode_cursor, keyset_select, split_page
+from services.http_client import http_client_pool
 
 
 @asynccontextmanager
@@ -32,10 +43,23 @@ async def lifespan(_app: FastAPI):
     # Create tables
     Base.metadata.create_all(bind=engine)
 
+    # Open shared outbound HTTP pool used by all provider clients
+    http_client_pool.start()
+
+    # Create the enrichment engine (providers are built on first use)
+    get_enrichment_engine()
+
+    # Start background enrichment workers
+    enrichment_worker_pool.start()
+
     yield
 
     # Shutdown
     print("🛑 Shutting down application...")
+    await enrichment_worker_pool.stop()
+    close_enrichment_engine()
+    await http_client_pool.close()
+    await async_engine.dispose()
 
 
 app = FastAPI(
@@ -76,11 +100,11 @@ async def root():
 
 
 @app.get("/health")
-async def health_check(db: Session = Depends(get_db)):
+async def health_check(db: AsyncSession = Depends(get_async_db)):
     """Health check endpoint."""
     try:
         # Test database connection
-        db.execute(text("SELECT 1"))
+        await db.execute(text("SELECT 1"))
         db_status = "connected"
     except Exception as e:
         logger.exception("Database health check failed")
@@ -96,74 +120,378 @@ async def health_check(db: Session = Depends(get_db)):
     }
 
 
-@app.get("/api/v1/companies", response_model=List[Dict[str, Any]])
+async def _list_entities(
+    db: AsyncSession,
+    model: Any,
+    *,
+    response: Response,
+    skip: int,
+    limit: int,
+    cursor: Optional[str],
+    order_by: str,
+):
+    """List rows using offset pagination or, when ``cursor`` is given, keyset.
+
+    Omitting ``cursor`` keeps the legacy plain-list response. Passing it
+    (empty for the first page) returns ``{"items", "next_cursor"}``. Both
+    forms expose the next cursor in the ``X-Next-Cursor`` header.
+    """
+    try:
+        if cursor is None:
+            statement = select(model).order_by(model.id).offset(skip).limit(limit)
+            rows = (await db.scalars(statement)).all()
+            next_cursor = (
+                encode_cursor("id", rows[-1]) if rows and len(rows) == limit else None
+            )
+        else:
+            statement = keyset_select(model, limit, cursor or None, order_by)
+            rows = (await db.scalars(statement)).all()
+            rows, next_cursor = split_page(rows, limit, order_by)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    items = [row.to_dict() for row in rows]
+    if cursor is None:
+        return items
+    return {"items": items, "next_cursor": next_cursor}
+
+
+async def _bulk_create(
+    request: Request, db: AsyncSession, model: Any, *, upsert: bool = False, merge: str
+):
+    """Bulk-insert (or upsert) a JSON array or NDJSON body with per-row status."""
+    try:
+        rows = parse_bulk_body(
+            await request.body(), request.headers.get("content-type")
+        )
+        return await db.run_sync(bulk_insert, model, rows, upsert=upsert, merge=merge)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+
+async def _upsert_entity(
+    db: AsyncSession, model: Any, data: Dict[str, Any], merge: str
+):
+    """Insert or update one row on its natural key (domain, email or sku)."""
+    try:
+        summary = await db.run_sync(
+            bulk_insert, model, [data], upsert=True, merge=merge
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    (result,) = summary["results"]
+    if result["status"] == "error":
+        raise HTTPException(status_code=400, detail=result["error"])
+    row = await db.get(model, result["id"], populate_existing=True)
+    return {"status": result["status"], "id": row.id, "data": row.to_dict()}
+
+
+def _export_entities(
+    request: Request,
+    model: Any,
+    name: str,
+    *,
+    fmt: str,
+    updated_since: Optional[datetime],
+):
+    """Stream every row of ``model`` as NDJSON or CSV from a server-side cursor.
+
+    The body is gzipped on the fly when the client sends
+    ``Accept-Encoding: gzip``.
+    """
+    compress = "gzip" in request.headers.get("accept-encoding", "").lower()
+    try:
+        body = stream_export(engine, model, fmt, updated_since, compress)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    headers = {
+        "Content-Disposition": f'attachment; filename="{name}.{fmt}"',
+        "Vary": "Accept-Encoding",
+    }
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(body, media_type=EXPORT_FORMATS[fmt], headers=headers)
+
+
+@app.get(
+    "/api/v1/companies", response_model=Union[List[Dict[str, Any]], Dict[str, Any]]
+)
 async def list_companies(
-    skip: int = 0, limit: int = 100, db: Session = Depends(get_db)
+    response: Response,
+    *,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    order_by: str = "id",
+    db: AsyncSession = Depends(get_async_db),
 ):
-    """List companies from database."""
-    companies = db.query(Company).offset(skip).limit(limit).all()
-    return [company.to_dict() for company in companies]
+    """List companies from database (offset or keyset pagination)."""
+    return await _list_entities(
+        db,
+        Company,
+        response=response,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        order_by=order_by,
+    )
 
 
 @app.post("/api/v1/companies", response_model=Dict[str, Any])
-async def create_company(company_data: Dict[str, Any], db: Session = Depends(get_db)):
+async def create_company(
+    company_data: Dict[str, Any], db: AsyncSession = Depends(get_async_db)
+):
     """Create a new company."""
     try:
         company = Company(**company_data)
         db.add(company)
-        db.commit()
-        db.refresh(company)
+        await db.commit()
+        await db.refresh(company)
         return {"status": "created", "id": company.id, "data": company.to_dict()}
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.exception("Failed to create company")
         raise HTTPException(status_code=400, detail=str(e)) from e
 
 
-@app.get("/api/v1/contacts", response_model=List[Dict[str, Any]])
-async def list_contacts(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """List contacts from database."""
-    contacts = db.query(Contact).offset(skip).limit(limit).all()
-    return [contact.to_dict() for contact in contacts]
+@app.post("/api/v1/companies/bulk", response_model=Dict[str, Any])
+async def bulk_create_companies(
+    request: Request, db: AsyncSession = Depends(get_async_db)
+):
+    """Create many companies from a JSON array or NDJSON body."""
+    return await _bulk_create(request, db, Company, merge="replace")
+
+
+@app.post("/api/v1/companies/upsert", response_model=Dict[str, Any])
+async def upsert_company(
+    company_data: Dict[str, Any],
+    merge: str = "replace",
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Create or update a company by its natural key."""
+    return await _upsert_entity(db, Company, company_data, merge)
+
+
+@app.post("/api/v1/companies/bulk/upsert", response_model=Dict[str, Any])
+async def bulk_upsert_companies(
+    request: Request, merge: str = "replace", db: AsyncSession = Depends(get_async_db)
+):
+    """Create or update many companies by natural key from an array or NDJSON."""
+    return await _bulk_create(request, db, Company, upsert=True, merge=merge)
+
+
+@app.get("/api/v1/companies/export")
+async def export_companies(
+    request: Request,
+    fmt: str = Query("ndjson", alias="format"),
+    updated_since: Optional[datetime] = None,
+):
+    """Export companies as streamed NDJSON or CSV (optionally since a timestamp)."""
+    return _export_entities(
+        request, Company, "companies", fmt=fmt, updated_since=updated_since
+    )
+
+
+@app.get("/api/v1/contacts", response_model=Union[List[Dict[str, Any]], Dict[str, Any]])
+async def list_contacts(
+    response: Response,
+    *,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    order_by: str = "id",
+    db: AsyncSession = Depends(get_async_db),
+):
+    """List contacts from database (offset or keyset pagination)."""
+    return await _list_entities(
+        db,
+        Contact,
+        response=response,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        order_by=order_by,
+    )
 
 
 @app.post("/api/v1/contacts", response_model=Dict[str, Any])
-async def create_contact(contact_data: Dict[str, Any], db: Session = Depends(get_db)):
+async def create_contact(
+    contact_data: Dict[str, Any], db: AsyncSession = Depends(get_async_db)
+):
     """Create a new contact."""
     try:
         contact = Contact(**contact_data)
         db.add(contact)
-        db.commit()
-        db.refresh(contact)
+        await db.commit()
+        await db.refresh(contact)
         return {"status": "created", "id": contact.id, "data": contact.to_dict()}
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.exception("Failed to create contact")
         raise HTTPException(status_code=400, detail=str(e)) from e
 
 
-@app.get("/api/v1/products", response_model=List[Dict[str, Any]])
-async def list_products(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """List products from database."""
-    products = db.query(Product).offset(skip).limit(limit).all()
-    return [product.to_dict() for product in products]
+@app.post("/api/v1/contacts/bulk", response_model=Dict[str, Any])
+async def bulk_create_contacts(
+    request: Request, db: AsyncSession = Depends(get_async_db)
+):
+    """Create many contacts from a JSON array or NDJSON body."""
+    return await _bulk_create(request, db, Contact, merge="replace")
+
+
+@app.post("/api/v1/contacts/upsert", response_model=Dict[str, Any])
+async def upsert_contact(
+    contact_data: Dict[str, Any],
+    merge: str = "replace",
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Create or update a contact by its natural key."""
+    return await _upsert_entity(db, Contact, contact_data, merge)
+
+
+@app.post("/api/v1/contacts/bulk/upsert", response_model=Dict[str, Any])
+async def bulk_upsert_contacts(
+    request: Request, merge: str = "replace", db: AsyncSession = Depends(get_async_db)
+):
+    """Create or update many contacts by natural key from an array or NDJSON."""
+    return await _bulk_create(request, db, Contact, upsert=True, merge=merge)
+
+
+@app.get("/api/v1/contacts/export")
+async def export_contacts(
+    request: Request,
+    fmt: str = Query("ndjson", alias="format"),
+    updated_since: Optional[datetime] = None,
+):
+    """Export contacts as streamed NDJSON or CSV (optionally since a timestamp)."""
+    return _export_entities(
+        request, Contact, "contacts", fmt=fmt, updated_since=updated_since
+    )
+
+
+@app.get("/api/v1/products", response_model=Union[List[Dict[str, Any]], Dict[str, Any]])
+async def list_products(
+    response: Response,
+    *,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    order_by: str = "id",
+    db: AsyncSession = Depends(get_async_db),
+):
+    """List products from database (offset or keyset pagination)."""
+    return await _list_entities(
+        db,
+        Product,
+        response=response,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        order_by=order_by,
+    )
 
 
 @app.post("/api/v1/products", response_model=Dict[str, Any])
-async def create_product(product_data: Dict[str, Any], db: Session = Depends(get_db)):
+async def create_product(
+    product_data: Dict[str, Any], db: AsyncSession = Depends(get_async_db)
+):
     """Create a new product."""
     try:
         product = Product(**product_data)
         db.add(product)
-        db.commit()
-        db.refresh(product)
+        await db.commit()
+        await db.refresh(product)
         return {"status": "created", "id": product.id, "data": product.to_dict()}
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.exception("Failed to create product")
         raise HTTPException(status_code=400, detail=str(e)) from e
 
 
+@app.post("/api/v1/products/bulk", response_model=Dict[str, Any])
+async def bulk_create_products(
+    request: Request, db: AsyncSession = Depends(get_async_db)
+):
+    """Create many products from a JSON array or NDJSON body."""
+    return await _bulk_create(request, db, Product, merge="replace")
+
+
+@app.post("/api/v1/products/upsert", response_model=Dict[str, Any])
+async def upsert_product(
+    product_data: Dict[str, Any],
+    merge: str = "replace",
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Create or update a product by its natural key."""
+    return await _upsert_entity(db, Product, product_data, merge)
+
+
+@app.post("/api/v1/products/bulk/upsert", response_model=Dict[str, Any])
+async def bulk_upsert_products(
+    request: Request, merge: str = "replace", db: AsyncSession = Depends(get_async_db)
+):
+    """Create or update many products by natural key from an array or NDJSON."""
+    return await _bulk_create(request, db, Product, upsert=True, merge=merge)
+
+
+@app.get("/api/v1/products/export")
+async def export_products(
+    request: Request,
+    fmt: str = Query("ndjson", alias="format"),
+    updated_since: Optional[datetime] = None,
+):
+    """Export products as streamed NDJSON or CSV (optionally since a timestamp)."""
+    return _export_entities(
+        request, Product, "products", fmt=fmt, updated_since=updated_since
+    )
+
+
+async def _enqueue_enrichment(entity_type: str, data: Dict[str, Any], id_field: str):
+    """Queue a background enrichment job and describe it for the client."""
+    payload = dict(data)
+    entity_id = payload.pop(id_field, None)
+    try:
+        job = await run_in_threadpool(
+            enrichment_job_queue.enqueue, entity_type, payload, entity_id
+        )
+    except Exception as e:
+        logger.exception(f"Failed to queue {entity_type} enrichment")
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    enrichment_worker_pool.notify()
+    return {
+        "success": True,
+        "status": job["status"],
+        "job_id": job["id"],
+        "status_url": f"/api/v1/enrich/jobs/{job['id']}",
+    }
+
+
+@app.post("/api/v1/enrich/person", response_model=Dict[str, Any], status_code=202)
+async def enrich_person(person_data: Dict[str, Any]):
+    """Queue person enrichment; pass contact_id to update that contact."""
+    return await _enqueue_enrichment("person", person_data, "contact_id")
+
+
+@app.post("/api/v1/enrich/company", response_model=Dict[str, Any], status_code=202)
+async def enrich_company(company_data: Dict[str, Any]):
+    """Queue company enrichment; pass company_id to update that company."""
+    return await _enqueue_enrichment("company", company_data, "company_id")
+
+
+@app.get("/api/v1/enrich/jobs/{job_id}", response_model=Dict[str, Any])
+async def get_enrichment_job(job_id: int):
+    """Get the status and result of an enrichment job."""
+    job = await run_in_threadpool(enrichment_job_queue.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Enrichment job not found")
+    return job
+
+
 if __name__ == "__main__":
     try:
         # Get environment from environment variable or settings
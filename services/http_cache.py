@@ -0,0 +1,161 @@
+"""
+Conditional Request Cache
+Persistent store of response bodies with their ETag/Last-Modified validators
+"""
+
+import json
+import logging
+import sqlite3
+import time
+from typing import Any, Dict, NamedTuple, Optional
+
+import httpx
+
+from database.utils.sqlite_store import SQLiteStore
+
+
+logger = logging.getLogger(__name__)
+
+
+class CachedResponse(NamedTuple):
+    """A stored response body and the validators to revalidate it with."""
+
+    etag: Optional[str]
+    last_modified: Optional[str]
+    body: str
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Headers that turn a GET into a conditional request."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def json(self) -> Any:
+        """Decode the stored body."""
+        return json.loads(self.body)
+
+
+class ConditionalResponseCache(SQLiteStore):
+    """HTTP validator cache keyed by full request URL.
+
+    Unlike the enrichment result cache, entries never expire: they are
+    always revalidated with ``If-None-Match``/``If-Modified-Since``, and a
+    ``304 Not Modified`` answer reuses the stored body. Entries live in a
+    local SQLite file so they survive restarts, with a small in-process LRU
+    in front; the least recently validated entries beyond ``max_entries``
+    are evicted.
+    """
+
+    schema = (
+        """
+        CREATE TABLE IF NOT EXISTS http_cache (
+            url TEXT PRIMARY KEY,
+            etag TEXT,
+            last_modified TEXT,
+            body TEXT NOT NULL,
+            validated_at REAL NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS ix_http_cache_validated_at "
+        "ON http_cache (validated_at)",
+    )
+
+    def __init__(
+        self, path: str, max_entries: int = 50_000, memory_entries: int = 1024
+    ):
+        super().__init__(path, memory_entries)
+        self.max_entries = max_entries
+        self._stats = {"revalidated": 0, "modified": 0, "stored": 0}
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """Get the stored response for ``url``, if any."""
+        with self._lock:
+            entry = self._recall(url)
+            if entry is not None:
+                return entry
+
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT etag, last_modified, body FROM http_cache WHERE url = ?",
+                    (url,),
+                )
+                .fetchone()
+            )
+            if row is None:
+                return None
+            entry = CachedResponse(*row)
+            self._remember(url, entry)
+            return entry
+
+    def store(self, url: str, response: httpx.Response):
+        """Store a 200 response that carries an ETag or Last-Modified."""
+        etag = response.headers.get("etag")
+        last_modified = response.headers.get("last-modified")
+        if response.status_code != 200 or not (etag or last_modified):
+            return
+
+        entry = CachedResponse(etag, last_modified, response.text)
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO http_cache "
+                "(url, etag, last_modified, body, validated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (url, etag, last_modified, entry.body, time.time()),
+            )
+            conn.commit()
+            self._remember(url, entry)
+            self._stats["stored"] += 1
+            if self._note_write():
+                self._prune(conn)
+
+    def revalidated(self, url: str, entry: CachedResponse) -> Any:
+        """Record a 304 for ``url`` and return the stored body, decoded."""
+        with self._lock:
+            self._connect().execute(
+                "UPDATE http_cache SET validated_at = ? WHERE url = ?",
+                (time.time(), url),
+            )
+            self._conn.commit()
+            self._stats["revalidated"] += 1
+        return entry.json()
+
+    def record_modified(self):
+        """Count a conditional request the server answered with a new body."""
+        with self._lock:
+            self._stats["modified"] += 1
+
+    def _prune(self, conn: sqlite3.Connection):
+        """Drop the least recently validated entries beyond max_entries."""
+        (count,) = conn.execute("SELECT COUNT(*) FROM http_cache").fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM http_cache WHERE rowid IN ("
+                "SELECT rowid FROM http_cache ORDER BY validated_at ASC LIMIT ?)",
+                (excess,),
+            )
+            conn.commit()
+            self._memory.clear()
+            logger.info(f"🧹 Evicted {excess} conditional cache entries")
+
+    def clear(self):
+        """Remove every stored response and reset counters."""
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM http_cache")
+            conn.commit()
+            self._memory.clear()
+            self._stats = dict.fromkeys(self._stats, 0)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get revalidation counters and the number of stored entries."""
+        with self._lock:
+            (entries,) = (
+                self._connect().execute("SELECT COUNT(*) FROM http_cache").fetchone()
+            )
+            return {**self._stats, "entries": entries}
@@ -0,0 +1,148 @@
+"""
+Shared Async HTTP Client Pool for Third-Party Providers
+Keep-alive connection pools per host, opened and closed with the app lifespan
+"""
+
+import logging
+from functools import partial
+from typing import Any, Optional
+
+import httpx
+
+from services.rate_limiter import provider_rate_limiter
+from services.resilience import IDEMPOTENT_METHODS, provider_resilience
+
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "Enrich-DDF-Floor-2/1.0"
+
+
+class HTTPClientPool:
+    """Lifecycle-managed wrapper around a single shared ``httpx.AsyncClient``.
+
+    httpx keeps one keep-alive pool per origin inside the client, so every
+    provider (Clearbit, Hunter.io, GitHub, Wiza, Surfe) reuses warm TCP+TLS
+    connections instead of opening a new one per call.
+    """
+
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def is_open(self) -> bool:
+        """Whether the shared client is currently open."""
+        return self._client is not None and not self._client.is_closed
+
+    def start(
+        self, transport: Optional[httpx.AsyncBaseTransport] = None
+    ) -> httpx.AsyncClient:
+        """Open the shared client (idempotent).
+
+        ``transport`` lets tests and local tooling route every provider call
+        to a stand-in server (e.g. ``httpx.MockTransport``).
+        """
+        if self.is_open:
+            return self._client
+
+        from config import settings
+
+        limits = httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry,
+        )
+        self._client = httpx.AsyncClient(
+            limits=limits,
+            timeout=httpx.Timeout(settings.http_timeout),
+            headers={"User-Agent": USER_AGENT},
+            transport=transport,
+        )
+        logger.info(
+            "🌐 HTTP client pool opened "
+            f"(max_connections={settings.http_max_connections}, "
+            f"keepalive={settings.http_max_keepalive_connections})"
+        )
+        return self._client
+
+    async def close(self):
+        """Close the shared client and release pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            logger.info("🌐 HTTP client pool closed")
+
+    def get_client(self) -> httpx.AsyncClient:
+        """Return the shared client, opening it lazily outside the app lifespan."""
+        if not self.is_open:
+            return self.start()
+        return self._client
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        rate_limit: Optional[str] = None,
+        retry: Optional[bool] = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """Send a request through the shared client.
+
+        ``rate_limit`` names the provider bucket (``"github:search"``) the
+        call is paced by and turns on the provider's resilience policy:
+        transient failures (timeouts, 5xx) are retried with jittered
+        backoff within a retry budget, and calls fail fast while the
+        provider's circuit breaker is open.
+
+        Only idempotent methods are retried by default, since a POST that
+        timed out may still have run (creating jobs or spending credits).
+        Pass ``retry=True`` for POSTs known to be safe to repeat, such as
+        searches.
+        """
+        if rate_limit is None:
+            return await self.get_client().request(method, url, **kwargs)
+
+        if retry is None:
+            retry = method.upper() in IDEMPOTENT_METHODS
+        provider = rate_limit.partition(":")[0]
+        return await provider_resilience.call(
+            provider,
+            partial(self._send_paced, method, url, rate_limit, **kwargs),
+            retry=retry,
+        )
+
+    async def _send_paced(
+        self, method: str, url: str, rate_limit: str, **kwargs: Any
+    ) -> httpx.Response:
+        """Send once the rate limiter allows, re-sending after 429 back-offs."""
+        from config import settings
+
+        if not settings.provider_rate_limiting_enabled:
+            return await self.get_client().request(method, url, **kwargs)
+
+        for attempt in range(settings.provider_throttle_retries + 1):
+            await provider_rate_limiter.acquire(rate_limit)
+            response = await self.get_client().request(method, url, **kwargs)
+            provider_rate_limiter.observe(
+                rate_limit, response.status_code, response.headers
+            )
+            if response.status_code != 429:
+                break
+            logger.warning(
+                f"⚠️ {rate_limit} throttled request "
+                f"(attempt {attempt + 1}/{settings.provider_throttle_retries + 1})"
+            )
+        return response
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        """Send a GET request through the shared client."""
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        """Send a POST request through the shared client."""
+        return await self.request("POST", url, **kwargs)
+
+
+# Global instance
+http_client_pool = HTTPClientPool()
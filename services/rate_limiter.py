@@ -0,0 +1,186 @@
+"""
+Provider Rate Limiter
+Token buckets per provider and endpoint class, tuned by rate-limit response headers
+"""
+
+import asyncio
+import logging
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Mapping, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+# (requests per second, burst capacity) per "provider[:endpoint class]".
+# A key without an entry falls back to its provider's entry; providers with
+# no entry are not limited.
+DEFAULT_RATE_LIMITS: Dict[str, Tuple[float, float]] = {
+    "github:core": (5000 / 3600, 20),  # 5000/hour authenticated
+    "github:search": (30 / 60, 5),  # 30/minute authenticated
+    "github:graphql": (5000 / 3600, 20),  # 5000 points/hour authenticated
+    "hunter": (15.0, 15),  # 15/second
+    "clearbit": (600 / 60, 10),  # 600/minute
+    "surfe": (10.0, 10),
+    "wiza": (5.0, 5),
+}
+
+# Header values above this are epoch timestamps rather than second deltas
+EPOCH_THRESHOLD = 10**9
+
+
+class TokenBucket:
+    """Token bucket that hands out waits instead of rejections.
+
+    ``reserve`` takes the tokens immediately, letting the balance go
+    negative, and returns how long the caller must sleep before its turn.
+    Reservations are made without awaiting, so concurrent callers on one
+    event loop are served in arrival order without a lock.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = float(capacity)
+        # May lie in the future while the provider asked us to back off
+        self._updated = clock()
+
+    def _refill(self, now: float):
+        if now > self._updated:
+            elapsed = now - self._updated
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    def reserve(self, tokens: float = 1) -> float:
+        """Take ``tokens`` and return the seconds to wait before using them."""
+        now = self._clock()
+        self._refill(now)
+        self._tokens -= tokens
+        blocked = max(0.0, self._updated - now)
+        return blocked + max(0.0, -self._tokens) / self.rate
+
+    async def acquire(self, tokens: float = 1) -> float:
+        """Wait until ``tokens`` are available; returns the time waited."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def block(self, seconds: float):
+        """Hand out no tokens for ``seconds`` (e.g. after ``Retry-After``)."""
+        now = self._clock()
+        self._refill(now)
+        self._tokens = min(self._tokens, 0.0)
+        self._updated = max(self._updated, now + seconds)
+
+    def update(self, remaining: Optional[int], reset_in: Optional[float]):
+        """Align the bucket with the provider's view of the current window.
+
+        Never holds more tokens than the provider says remain, and paces
+        the rest of the window so ``remaining`` lasts until ``reset_in``.
+        """
+        now = self._clock()
+        self._refill(now)
+        if remaining is None:
+            return
+        self._tokens = min(self._tokens, float(remaining))
+        if reset_in is None or reset_in <= 0:
+            return
+        if remaining <= 0:
+            self.block(reset_in)
+            self.rate = self.max_rate
+        else:
+            self.rate = min(self.max_rate, remaining / reset_in)
+
+
+def _parse_retry_after(value: Optional[str], now: float) -> Optional[float]:
+    """Seconds to wait from a ``Retry-After`` header (delta or HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - now)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_int(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(float(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+class ProviderRateLimiter:
+    """Registry of token buckets keyed by ``"provider[:endpoint class]"``."""
+
+    def __init__(self, limits: Optional[Dict[str, Tuple[float, float]]] = None):
+        self.limits = dict(DEFAULT_RATE_LIMITS if limits is None else limits)
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def bucket(self, key: str) -> Optional[TokenBucket]:
+        """Get (or create) the bucket for ``key``; None if it is unlimited."""
+        if key not in self._buckets:
+            limit = self.limits.get(key) or self.limits.get(key.partition(":")[0])
+            if limit is None:
+                return None
+            self._buckets[key] = TokenBucket(*limit)
+        return self._buckets[key]
+
+    async def acquire(self, key: str) -> float:
+        """Wait for a request slot on ``key``; returns the time waited."""
+        bucket = self.bucket(key)
+        if bucket is None:
+            return 0.0
+        waited = await bucket.acquire()
+        if waited >= 1:
+            logger.info(f"⏳ Rate limited on {key}: waited {waited:.1f}s")
+        return waited
+
+    def observe(self, key: str, status_code: int, headers: Mapping[str, str]):
+        """Feed a provider response's rate-limit headers into ``key``'s bucket.
+
+        Understands ``Retry-After``, GitHub-style ``X-RateLimit-Remaining`` /
+        ``X-RateLimit-Reset`` (epoch seconds) and the IETF ``RateLimit-*``
+        headers (delta seconds).
+        """
+        bucket = self.bucket(key)
+        if bucket is None:
+            return
+
+        now = time.time()
+        remaining = _parse_int(
+            headers.get("x-ratelimit-remaining") or headers.get("ratelimit-remaining")
+        )
+        reset = _parse_int(
+            headers.get("x-ratelimit-reset") or headers.get("ratelimit-reset")
+        )
+        reset_in = None
+        if reset is not None:
+            reset_in = reset - now if reset > EPOCH_THRESHOLD else float(reset)
+        bucket.update(remaining, reset_in)
+
+        retry_after = _parse_retry_after(headers.get("retry-after"), now)
+        if retry_after is None and status_code == 429:
+            retry_after = reset_in if reset_in and reset_in > 0 else 1.0
+        if retry_after is not None:
+            bucket.block(retry_after)
+            logger.warning(f"⚠️ {key} asked to back off for {retry_after:.1f}s")
+
+    def reset(self):
+        """Forget all bucket state."""
+        self._buckets.clear()
+
+
+# Global instance
+provider_rate_limiter = ProviderRateLimiter()
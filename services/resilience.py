@@ -0,0 +1,235 @@
+"""
+Provider Resilience
+Bounded retries with jittered backoff, retry budgets and circuit breakers per provider
+"""
+
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Optional
+
+import httpx
+
+
+logger = logging.getLogger(__name__)
+
+# Transient failures worth retrying; everything else is returned as-is
+RETRYABLE_STATUS_CODES = frozenset({500, 502, 503, 504})
+RETRYABLE_EXCEPTIONS = (httpx.TimeoutException, httpx.TransportError)
+
+# Methods safe to re-send by default; a timed-out POST may already have run
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Raised without calling the provider while its circuit is open."""
+
+
+class CircuitBreaker:
+    """Rolling-window circuit breaker.
+
+    Opens when the failure rate over the last ``window`` calls reaches
+    ``failure_threshold`` (after at least ``min_calls``). While open, calls
+    fail immediately; after ``reset_timeout`` one trial call is let through
+    (half-open) and its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: float = 0.5,
+        window: int = 20,
+        min_calls: int = 10,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.min_calls = min_calls
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        """``"closed"``, ``"open"`` or ``"half_open"``."""
+        if self._opened_at is None:
+            return "closed"
+        if self._clock() - self._opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def before_call(self):
+        """Raise CircuitOpenError unless a call may go through now."""
+        state = self.state
+        if state == "open" or (state == "half_open" and self._trial_in_flight):
+            raise CircuitOpenError("Circuit open: provider is failing")
+        if state == "half_open":
+            self._trial_in_flight = True
+
+    def release(self):
+        """Abandon a call without an outcome (cancelled or programming error)."""
+        self._trial_in_flight = False
+
+    def record_success(self):
+        """Record a healthy call; a successful trial closes the circuit."""
+        if self._opened_at is not None:
+            logger.info("✅ Circuit closed after successful trial call")
+            self._opened_at = None
+            self._outcomes.clear()
+        self._trial_in_flight = False
+        self._outcomes.append(True)
+
+    def record_failure(self):
+        """Record a failed call, opening the circuit past the threshold."""
+        self._trial_in_flight = False
+        if self._opened_at is not None:
+            # Failed trial: stay open for another reset_timeout
+            self._opened_at = self._clock()
+            return
+
+        self._outcomes.append(False)
+        failures = self._outcomes.count(False)
+        if (
+            len(self._outcomes) >= self.min_calls
+            and failures / len(self._outcomes) >= self.failure_threshold
+        ):
+            self._opened_at = self._clock()
+            logger.warning(
+                f"⚠️ Circuit opened: {failures}/{len(self._outcomes)} calls failed"
+            )
+
+
+class RetryBudget:
+    """Caps retries to a fraction of traffic so retries cannot amplify outages.
+
+    Each call deposits ``ratio`` tokens and each retry withdraws one; the
+    balance is capped at ``minimum``, which also allows a few retries at
+    low traffic.
+    """
+
+    def __init__(self, ratio: float = 0.2, minimum: float = 10):
+        self.ratio = ratio
+        self.minimum = minimum
+        self._tokens = float(minimum)
+
+    def deposit(self):
+        """Credit the budget for one original call."""
+        self._tokens = min(self.minimum, self._tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        """Take one retry from the budget; False if it is exhausted."""
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+
+class ProviderResilience:
+    """Per-provider retry policy, retry budget and circuit breaker."""
+
+    def __init__(
+        self,
+        max_attempts: Optional[int] = None,
+        base_delay: Optional[float] = None,
+        max_delay: Optional[float] = None,
+        breaker_factory: Optional[Callable[[], CircuitBreaker]] = None,
+        budget_factory: Optional[Callable[[], RetryBudget]] = None,
+    ):
+        from config import settings
+
+        self.max_attempts = max_attempts or settings.provider_retry_attempts
+        self.base_delay = (
+            base_delay if base_delay is not None else settings.provider_retry_base_delay
+        )
+        self.max_delay = (
+            max_delay if max_delay is not None else settings.provider_retry_max_delay
+        )
+        self._breaker_factory = breaker_factory or (
+            lambda: CircuitBreaker(
+                failure_threshold=settings.provider_circuit_failure_threshold,
+                reset_timeout=settings.provider_circuit_reset_timeout,
+            )
+        )
+        self._budget_factory = budget_factory or (
+            lambda: RetryBudget(ratio=settings.provider_retry_budget_ratio)
+        )
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._budgets: Dict[str, RetryBudget] = {}
+
+    def breaker(self, provider: str) -> CircuitBreaker:
+        """Circuit breaker for ``provider``."""
+        if provider not in self._breakers:
+            self._breakers[provider] = self._breaker_factory()
+        return self._breakers[provider]
+
+    def budget(self, provider: str) -> RetryBudget:
+        """Retry budget for ``provider``."""
+        if provider not in self._budgets:
+            self._budgets[provider] = self._budget_factory()
+        return self._budgets[provider]
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff before retry number ``attempt + 1``."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+    async def call(
+        self,
+        provider: str,
+        send: Callable[[], Awaitable[httpx.Response]],
+        retry: bool = True,
+    ) -> httpx.Response:
+        """Run ``send`` with retries on transient failures behind the breaker.
+
+        Returns the last response (callers still ``raise_for_status``) or
+        re-raises the last transport error. Raises CircuitOpenError without
+        calling ``send`` while the provider's circuit is open. With
+        ``retry=False`` (non-idempotent requests) ``send`` runs at most once.
+        """
+        breaker = self.breaker(provider)
+        budget = self.budget(provider)
+        budget.deposit()
+
+        for attempt in range(self.max_attempts if retry else 1):
+            breaker.before_call()
+            try:
+                response = await send()
+            except RETRYABLE_EXCEPTIONS as e:
+                breaker.record_failure()
+                error: Optional[Exception] = e
+                response = None
+            except BaseException:
+                breaker.release()
+                raise
+            else:
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    breaker.record_success()
+                    return response
+                breaker.record_failure()
+                error = None
+
+            if not retry or attempt + 1 >= self.max_attempts or not budget.withdraw():
+                break
+            delay = self.backoff(attempt)
+            reason = error or f"HTTP {response.status_code}"
+            logger.warning(
+                f"⚠️ {provider} call failed ({reason!r}); "
+                f"retry {attempt + 1}/{self.max_attempts - 1} in {delay:.2f}s"
+            )
+            await asyncio.sleep(delay)
+
+        if response is not None:
+            return response
+        raise error
+
+    def reset(self):
+        """Forget breaker and budget state."""
+        self._breakers.clear()
+        self._budgets.clear()
+
+
+# Global instance
+provider_resilience = ProviderResilience()
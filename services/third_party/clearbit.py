@@ -6,7 +6,7 @@ Free tier: 50 requests/month
 import logging
 from typing import Any, Dict
 
-import requests
+from services.http_client import http_client_pool
 
 
 logger = logging.getLogger(__name__)
@@ -37,7 +37,9 @@ class ClearbitService:
             headers = {"Authorization": f"Bearer {self.api_key}"}
             params = {"email": email}
 
-            response = requests.get(url, headers=headers, params=params, timeout=15)
+            response = await http_client_pool.get(
+                url, headers=headers, params=params, timeout=15, rate_limit="clearbit"
+            )
 
             if response.status_code == 200:
                 data = response.json()
@@ -84,7 +86,9 @@ class ClearbitService:
             headers = {"Authorization": f"Bearer {self.api_key}"}
             params = {"domain": domain}
 
-            response = requests.get(url, headers=headers, params=params, timeout=15)
+            response = await http_client_pool.get(
+                url, headers=headers, params=params, timeout=15, rate_limit="clearbit"
+            )
 
             if response.status_code == 200:
                 data = response.json()
@@ -3,23 +3,65 @@ GitHub API Integration for Developer Profile Enrichment
 Free tier: 5,000 requests/hour
 """
 
+import asyncio
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Tuple, Union
 
-import requests
+import httpx
+
+from services.http_cache import ConditionalResponseCache
+from services.http_client import http_client_pool
 
 
 logger = logging.getLogger(__name__)
 
+# Users fetched per GraphQL request; each is one aliased ``user`` field
+GRAPHQL_BATCH_SIZE = 50
+
+# Mirrors the REST calls made by enrich_developer_profile: the user, their
+# 10 most recently updated public repositories and their organizations
+GRAPHQL_USER_FRAGMENT = """
+fragment DeveloperProfile on User {
+  login name email bio company location websiteUrl twitterUsername
+  createdAt updatedAt
+  followers { totalCount }
+  following { totalCount }
+  repositories(
+    first: 10
+    privacy: PUBLIC
+    ownerAffiliations: OWNER
+    orderBy: {field: UPDATED_AT, direction: DESC}
+  ) {
+    totalCount
+    nodes {
+      name description url updatedAt stargazerCount forkCount
+      primaryLanguage { name }
+    }
+  }
+  organizations(first: 10) { nodes { login description url } }
+}
+"""
+
 
 class GitHubService:
-    """GitHub API service for developer profile and company enrichment."""
+    """GitHub API service for developer profile and company enrichment.
+
+    ``http_cache`` is the conditional-request cache to use, ``False`` to
+    disable conditional requests, or None for the configured default.
+    """
 
-    def __init__(self):
+    def __init__(self, http_cache: Union[ConditionalResponseCache, bool, None] = None):
         from config import settings
 
+        if http_cache is None and settings.github_conditional_cache_enabled:
+            http_cache = ConditionalResponseCache(
+                settings.github_conditional_cache_path,
+                max_entries=settings.github_conditional_cache_max_entries,
+            )
+        self.http_cache: Optional[ConditionalResponseCache] = http_cache or None
         self.token = settings.github_token
         self.base_url = "https://api.github.com"
+        self.graphql_url = f"{self.base_url}/graphql"
         self.headers = {
             "Accept": "application/vnd.github.v3+json",
             "User-Agent": "Enrich-DDF-Floor-2/1.0",
@@ -32,122 +74,285 @@ class GitHubService:
                 "GitHub token not found. Set GITHUB_TOKEN environment variable for higher rate limits."
             )
 
-    def enrich_developer_profile(self, username: str) -> Dict[str, Any]:
+    def close(self):
+        """Close the conditional-request cache, if any."""
+        if self.http_cache is not None:
+            self.http_cache.close()
+
+    async def _get_json(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        rate_limit: str = "github:core",
+    ):
+        """GET a REST API path and return the decoded JSON body.
+
+        Responses carrying an ETag or Last-Modified are kept in the
+        conditional cache and revalidated on the next request; GitHub does
+        not count ``304 Not Modified`` answers against the rate limit.
+        """
+        url = str(httpx.URL(f"{self.base_url}{path}", params=params))
+        cached = self.http_cache.get(url) if self.http_cache else None
+        headers = self.headers
+        if cached is not None:
+            headers = {**self.headers, **cached.conditional_headers()}
+
+        response = await http_client_pool.get(
+            url, headers=headers, timeout=10, rate_limit=rate_limit
+        )
+        if cached is not None and response.status_code == 304:
+            return self.http_cache.revalidated(url, cached)
+        response.raise_for_status()
+        if self.http_cache:
+            if cached is not None:
+                self.http_cache.record_modified()
+            self.http_cache.store(url, response)
+        return response.json()
+
+    def _partial(self, name: str, **sections: Any) -> Tuple[Any, ...]:
+        """Replace failed secondary sub-requests with empty lists.
+
+        Returns the section values in order, followed by the names of the
+        sections that failed, so a profile is still returned when only its
+        repositories or members could not be fetched.
+        """
+        values = []
+        missing = []
+        for section, value in sections.items():
+            if isinstance(value, BaseException):
+                logger.warning(f"GitHub {section} unavailable for {name}: {value!r}")
+                missing.append(section)
+                value = []
+            values.append(value)
+        return (*values, missing)
+
+    async def enrich_developer_profile(self, username: str) -> Dict[str, Any]:
         """Enrich developer profile using GitHub API."""
         if not username:
             return {"success": False, "error": "Username is required"}
 
+        # Profile, repositories and organizations are independent: fetch
+        # them concurrently over the shared pool
+        user_data, repos_data, orgs_data = await asyncio.gather(
+            self._get_json(f"/users/{username}"),
+            self._get_json(
+                f"/users/{username}/repos", {"sort": "updated", "per_page": 10}
+            ),
+            self._get_json(f"/users/{username}/orgs"),
+            return_exceptions=True,
+        )
+        if isinstance(user_data, BaseException):
+            logger.error(f"GitHub API error for user {username}: {user_data!r}")
+            return {"success": False, "error": str(user_data)}
+        repos_data, orgs_data, missing = self._partial(
+            username, repositories=repos_data, organizations=orgs_data
+        )
+
         try:
-            # Get user profile
-            user_response = requests.get(
-                f"{self.base_url}/users/{username}", headers=self.headers, timeout=10
+            return self._format_profile(
+                username, user_data, repos_data, orgs_data, missing
             )
-            user_response.raise_for_status()
-            user_data = user_response.json()
+        except Exception as e:
+            logger.exception(f"GitHub API error for user {username}: {e}")
+            return {"success": False, "error": str(e)}
 
-            # Get user repositories (top 10 by stars)
-            repos_response = requests.get(
-                f"{self.base_url}/users/{username}/repos",
-                headers=self.headers,
-                params={"sort": "updated", "per_page": 10},
-                timeout=10,
+    def _format_profile(
+        self,
+        username: str,
+        user_data: Dict[str, Any],
+        repos_data: List[Dict[str, Any]],
+        orgs_data: List[Dict[str, Any]],
+        missing: List[str],
+    ) -> Dict[str, Any]:
+        """Shape REST-style user, repository and organization payloads."""
+        # Extract programming languages from repositories
+        languages = set()
+        for repo in repos_data:
+            if repo.get("language"):
+                languages.add(repo["language"])
+
+        return {
+            "success": True,
+            "profile": {
+                "username": user_data.get("login"),
+                "name": user_data.get("name"),
+                "email": user_data.get("email"),
+                "bio": user_data.get("bio"),
+                "company": user_data.get("company"),
+                "location": user_data.get("location"),
+                "blog": user_data.get("blog"),
+                "twitter_username": user_data.get("twitter_username"),
+                "public_repos": user_data.get("public_repos", 0),
+                "followers": user_data.get("followers", 0),
+                "following": user_data.get("following", 0),
+                "created_at": user_data.get("created_at"),
+                "updated_at": user_data.get("updated_at"),
+            },
+            "repositories": [
+                {
+                    "name": repo.get("name"),
+                    "description": repo.get("description"),
+                    "language": repo.get("language"),
+                    "stars": repo.get("stargazers_count", 0),
+                    "forks": repo.get("forks_count", 0),
+                    "url": repo.get("html_url"),
+                    "updated_at": repo.get("updated_at"),
+                }
+                for repo in repos_data[:5]  # Top 5 repositories
+            ],
+            "organizations": [
+                {
+                    "login": org.get("login"),
+                    "description": org.get("description"),
+                    "url": org.get("html_url"),
+                }
+                for org in orgs_data
+            ],
+            "programming_languages": list(languages),
+            "github_url": f"https://github.com/{username}",
+            "missing": missing,
+        }
+
+    async def enrich_developer_profiles(
+        self, usernames: List[str], batch_size: int = GRAPHQL_BATCH_SIZE
+    ) -> Dict[str, Dict[str, Any]]:
+        """Enrich many developer profiles with batched GraphQL queries.
+
+        Up to ``batch_size`` users are fetched per request as aliased
+        ``user`` fields, replacing three REST calls per user. Returns a
+        result per username, shaped like ``enrich_developer_profile``.
+        GraphQL requires a token, so without one this falls back to REST.
+        """
+        usernames = list(dict.fromkeys(name for name in usernames if name))
+        if not self.token:
+            results = await asyncio.gather(
+                *(self.enrich_developer_profile(name) for name in usernames)
             )
-            repos_response.raise_for_status()
-            repos_data = repos_response.json()
+            return dict(zip(usernames, results))
+
+        chunks = [
+            usernames[i : i + batch_size] for i in range(0, len(usernames), batch_size)
+        ]
+        results: Dict[str, Dict[str, Any]] = {}
+        for chunk_results in await asyncio.gather(
+            *(self._graphql_profiles(chunk) for chunk in chunks)
+        ):
+            results.update(chunk_results)
+        return results
 
-            # Get user organizations
-            orgs_response = requests.get(
-                f"{self.base_url}/users/{username}/orgs",
+    async def _graphql_profiles(
+        self, usernames: List[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Fetch one chunk of users in a single GraphQL request."""
+        aliases = {f"u{i}": name for i, name in enumerate(usernames)}
+        variables = ", ".join(f"${alias}: String!" for alias in aliases)
+        fields = " ".join(
+            f"{alias}: user(login: ${alias}) {{ ...DeveloperProfile }}"
+            for alias in aliases
+        )
+        query = f"query({variables}) {{ {fields} }}{GRAPHQL_USER_FRAGMENT}"
+
+        try:
+            response = await http_client_pool.post(
+                self.graphql_url,
                 headers=self.headers,
-                timeout=10,
+                json={"query": query, "variables": aliases},
+                timeout=30,
+                rate_limit="github:graphql",
+                retry=True,  # read-only query
             )
-            orgs_response.raise_for_status()
-            orgs_data = orgs_response.json()
+            response.raise_for_status()
+            payload = response.json()
+        except Exception as e:
+            logger.exception(f"GitHub GraphQL error for {len(usernames)} users: {e}")
+            return {name: {"success": False, "error": str(e)} for name in usernames}
 
-            # Extract programming languages from repositories
-            languages = set()
-            for repo in repos_data:
-                if repo.get("language"):
-                    languages.add(repo["language"])
+        # Errors are reported per alias (e.g. NOT_FOUND) next to partial data
+        errors = {}
+        for error in payload.get("errors") or []:
+            path = error.get("path") or [None]
+            errors.setdefault(path[0], error.get("message", "GraphQL error"))
+        data = payload.get("data") or {}
 
-            return {
-                "success": True,
-                "profile": {
-                    "username": user_data.get("login"),
-                    "name": user_data.get("name"),
-                    "email": user_data.get("email"),
-                    "bio": user_data.get("bio"),
-                    "company": user_data.get("company"),
-                    "location": user_data.get("location"),
-                    "blog": user_data.get("blog"),
-                    "twitter_username": user_data.get("twitter_username"),
-                    "public_repos": user_data.get("public_repos", 0),
-                    "followers": user_data.get("followers", 0),
-                    "following": user_data.get("following", 0),
-                    "created_at": user_data.get("created_at"),
-                    "updated_at": user_data.get("updated_at"),
-                },
-                "repositories": [
-                    {
-                        "name": repo.get("name"),
-                        "description": repo.get("description"),
-                        "language": repo.get("language"),
-                        "stars": repo.get("stargazers_count", 0),
-                        "forks": repo.get("forks_count", 0),
-                        "url": repo.get("html_url"),
-                        "updated_at": repo.get("updated_at"),
-                    }
-                    for repo in repos_data[:5]  # Top 5 repositories
-                ],
-                "organizations": [
-                    {
-                        "login": org.get("login"),
-                        "description": org.get("description"),
-                        "url": org.get("html_url"),
-                    }
-                    for org in orgs_data
-                ],
-                "programming_languages": list(languages),
-                "github_url": f"https://github.com/{username}",
-            }
+        results = {}
+        for alias, name in aliases.items():
+            node = data.get(alias)
+            if node is None:
+                error = errors.get(alias) or errors.get(None) or "User not found"
+                results[name] = {"success": False, "error": error}
+                continue
+            try:
+                results[name] = self._format_graphql_user(name, node)
+            except Exception as e:
+                logger.exception(f"GitHub GraphQL error for user {name}: {e}")
+                results[name] = {"success": False, "error": str(e)}
+        return results
 
-        except Exception as e:
-            logger.exception(f"GitHub API error for user {username}: {e}")
-            return {"success": False, "error": str(e)}
+    def _format_graphql_user(
+        self, username: str, node: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Map a GraphQL ``DeveloperProfile`` node onto the REST payloads."""
+        repositories = node.get("repositories") or {}
+        user_data = {
+            "login": node.get("login"),
+            "name": node.get("name"),
+            "email": node.get("email") or None,  # "" when not public
+            "bio": node.get("bio"),
+            "company": node.get("company"),
+            "location": node.get("location"),
+            "blog": node.get("websiteUrl"),
+            "twitter_username": node.get("twitterUsername"),
+            "public_repos": repositories.get("totalCount", 0),
+            "followers": (node.get("followers") or {}).get("totalCount", 0),
+            "following": (node.get("following") or {}).get("totalCount", 0),
+            "created_at": node.get("createdAt"),
+            "updated_at": node.get("updatedAt"),
+        }
+        repos_data = [
+            {
+                "name": repo.get("name"),
+                "description": repo.get("description"),
+                "language": (repo.get("primaryLanguage") or {}).get("name"),
+                "stargazers_count": repo.get("stargazerCount", 0),
+                "forks_count": repo.get("forkCount", 0),
+                "html_url": repo.get("url"),
+                "updated_at": repo.get("updatedAt"),
+            }
+            for repo in repositories.get("nodes") or []
+        ]
+        orgs_data = [
+            {
+                "login": org.get("login"),
+                "description": org.get("description"),
+                "html_url": org.get("url"),
+            }
+            for org in (node.get("organizations") or {}).get("nodes") or []
+        ]
+        return self._format_profile(username, user_data, repos_data, orgs_data, [])
 
-    def enrich_organization(self, org_name: str) -> Dict[str, Any]:
+    async def enrich_organization(self, org_name: str) -> Dict[str, Any]:
         """Enrich organization/company data using GitHub API."""
         if not org_name:
             return {"success": False, "error": "Organization name is required"}
 
-        try:
-            # Get organization profile
-            org_response = requests.get(
-                f"{self.base_url}/orgs/{org_name}", headers=self.headers, timeout=10
-            )
-            org_response.raise_for_status()
-            org_data = org_response.json()
-
-            # Get organization repositories (top 10 by stars)
-            repos_response = requests.get(
-                f"{self.base_url}/orgs/{org_name}/repos",
-                headers=self.headers,
-                params={"sort": "stars", "per_page": 10},
-                timeout=10,
-            )
-            repos_response.raise_for_status()
-            repos_data = repos_response.json()
-
-            # Get organization members (public members only)
-            members_response = requests.get(
-                f"{self.base_url}/orgs/{org_name}/members",
-                headers=self.headers,
-                params={"per_page": 20},
-                timeout=10,
-            )
-            members_response.raise_for_status()
-            members_data = members_response.json()
+        # Profile, repositories and members are independent: fetch them
+        # concurrently over the shared pool
+        org_data, repos_data, members_data = await asyncio.gather(
+            self._get_json(f"/orgs/{org_name}"),
+            self._get_json(
+                f"/orgs/{org_name}/repos", {"sort": "stars", "per_page": 10}
+            ),
+            self._get_json(f"/orgs/{org_name}/members", {"per_page": 20}),
+            return_exceptions=True,
+        )
+        if isinstance(org_data, BaseException):
+            logger.error(f"GitHub API error for organization {org_name}: {org_data!r}")
+            return {"success": False, "error": str(org_data)}
+        repos_data, members_data, missing = self._partial(
+            org_name, repositories=repos_data, members=members_data
+        )
 
+        try:
             # Extract tech stack from repositories
             tech_stack = set()
             for repo in repos_data:
@@ -193,13 +398,14 @@ class GitHubService:
                 ],
                 "tech_stack": list(tech_stack),
                 "github_url": f"https://github.com/{org_name}",
+                "missing": missing,
             }
 
         except Exception as e:
             logger.exception(f"GitHub API error for organization {org_name}: {e}")
             return {"success": False, "error": str(e)}
 
-    def search_users_by_email(self, email: str) -> Dict[str, Any]:
+    async def search_users_by_email(self, email: str) -> Dict[str, Any]:
         """Search for GitHub users by email (limited functionality)."""
         if not email:
             return {"success": False, "error": "Email is required"}
@@ -207,14 +413,11 @@ class GitHubService:
         try:
             # GitHub doesn't allow direct email search, but we can try to find users
             # by searching for commits with that email
-            search_response = requests.get(
-                f"{self.base_url}/search/commits",
-                headers=self.headers,
-                params={"q": f"author-email:{email}", "per_page": 5},
-                timeout=10,
+            search_data = await self._get_json(
+                "/search/commits",
+                {"q": f"author-email:{email}", "per_page": 5},
+                rate_limit="github:search",
             )
-            search_response.raise_for_status()
-            search_data = search_response.json()
 
             users = []
             seen_users = set()
@@ -242,11 +445,14 @@ class GitHubService:
             logger.exception(f"GitHub search error for email {email}: {e}")
             return {"success": False, "error": str(e)}
 
-    def get_rate_limit_info(self) -> Dict[str, Any]:
+    async def get_rate_limit_info(self) -> Dict[str, Any]:
         """Get current rate limit information."""
         try:
-            response = requests.get(
-                f"{self.base_url}/rate_limit", headers=self.headers, timeout=10
+            response = await http_client_pool.get(
+                f"{self.base_url}/rate_limit",
+                headers=self.headers,
+                timeout=10,
+                rate_limit="github:core",
             )
             response.raise_for_status()
             return response.json()
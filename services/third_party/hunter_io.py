@@ -3,23 +3,73 @@ Hunter.io API Integration for Email Enrichment
 Free tier: 50 searches/month
 """
 
+import asyncio
 import logging
-from typing import Any, Dict
+import re
+import unicodedata
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
-import requests
+from core.enrichment.quota import QuotaManager
+from core.enrichment.result_cache import normalize_domain
+from core.enrichment.single_flight import SingleFlight
+from services.http_client import http_client_pool
 
 
 logger = logging.getLogger(__name__)
 
+# Confidence reported for addresses built from a domain's email pattern
+PATTERN_CONFIDENCE = 50
+
+QUOTA_EXHAUSTED = "Hunter.io quota exhausted"
+
+
+def normalize_name(name: Optional[str]) -> str:
+    """Lowercase ASCII letters and digits of a name, as used in addresses."""
+    ascii_name = (
+        unicodedata.normalize("NFKD", name or "").encode("ascii", "ignore").decode()
+    )
+    return re.sub(r"[^a-z0-9]", "", ascii_name.lower())
+
+
+def apply_email_pattern(
+    pattern: str, first_name: str, last_name: str, domain: str
+) -> Optional[str]:
+    """Build an address from a Hunter pattern such as ``{first}.{l}``."""
+    first, last = normalize_name(first_name), normalize_name(last_name)
+    values = {"first": first, "last": last, "f": first[:1], "l": last[:1]}
+    placeholders = re.findall(r"{(\w+)}", pattern)
+    if not placeholders or any(not values.get(p) for p in placeholders):
+        return None
+    local_part = re.sub(r"{(\w+)}", lambda m: values[m.group(1)], pattern)
+    return f"{local_part}@{domain}"
+
 
 class HunterIOService:
-    """Hunter.io API service for email finding and verification."""
+    """Hunter.io API service for email finding and verification.
 
-    def __init__(self):
+    The bulk path (``search_domain`` / ``find_emails``) reserves every
+    credit-spending call from the shared quota ledger, so it never runs
+    past the free tier.
+    """
+
+    def __init__(
+        self,
+        cache: Optional[Any] = None,
+        quota_manager: Optional[QuotaManager] = None,
+    ):
         from config import settings
 
         self.api_key = settings.hunter_api_key
         self.base_url = "https://api.hunter.io/v2"
+        self.domain_search_limit = settings.hunter_domain_search_limit
+        # Optional EnrichmentResultCache for domain searches
+        self.cache = cache
+        self.quota_manager = quota_manager or QuotaManager()
+        # Concurrent email-finder fallbacks per find_emails call
+        self.fallback_concurrency = settings.enrichment_batch_concurrency
+        # Concurrent searches for one domain share a request
+        self.single_flight = SingleFlight()
 
         if not self.api_key:
             logger.warning(
@@ -42,7 +92,9 @@ class HunterIOService:
                 "api_key": self.api_key,
             }
 
-            response = requests.get(url, params=params, timeout=10)
+            response = await http_client_pool.get(
+                url, params=params, timeout=10, rate_limit="hunter"
+            )
             response.raise_for_status()
 
             data = response.json()
@@ -62,6 +114,190 @@ class HunterIOService:
             logger.exception(f"Hunter.io API error: {e}")
             return {"success": False, "error": str(e)}
 
+    async def search_domain(self, domain: str) -> Dict[str, Any]:
+        """Get a domain's known emails and address pattern (one search).
+
+        Results are kept in the result cache when one is configured, and
+        concurrent searches for the same domain share one request.
+        """
+        if not self.api_key:
+            return {"success": False, "error": "API key not configured"}
+
+        domain = normalize_domain(domain)
+        cache_key = f"domain:{domain}"
+        if self.cache is not None:
+            cached = self.cache.get("hunter", cache_key)
+            if cached is not None:
+                return cached
+
+        result = await self.single_flight.do(
+            ("domain", domain),
+            partial(self._within_quota, partial(self._search_domain, domain)),
+        )
+        if result["success"] and self.cache is not None:
+            self.cache.set("hunter", cache_key, result)
+        return result
+
+    async def _within_quota(
+        self, call: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """Run a credit-spending call under a quota reservation.
+
+        The credit is refunded unless the call succeeds.
+        """
+        reservation = self.quota_manager.reserve("hunter")
+        if reservation is None:
+            return {"success": False, "error": QUOTA_EXHAUSTED}
+        with reservation:
+            result = await call()
+            if result.get("success"):
+                reservation.take()
+        return result
+
+    async def _search_domain(self, domain: str) -> Dict[str, Any]:
+        try:
+            response = await http_client_pool.get(
+                f"{self.base_url}/domain-search",
+                params={
+                    "domain": domain,
+                    "limit": self.domain_search_limit,
+                    "api_key": self.api_key,
+                },
+                timeout=10,
+                rate_limit="hunter",
+            )
+            response.raise_for_status()
+            data = response.json().get("data") or {}
+
+            return {
+                "success": True,
+                "domain": domain,
+                "pattern": data.get("pattern"),
+                "organization": data.get("organization"),
+                "emails": [
+                    {
+                        "email": item.get("value"),
+                        "first_name": item.get("first_name"),
+                        "last_name": item.get("last_name"),
+                        "position": item.get("position"),
+                        "confidence": item.get("confidence", 0),
+                        "sources": item.get("sources", []),
+                        "verification_status": (item.get("verification") or {}).get(
+                            "status"
+                        ),
+                    }
+                    for item in data.get("emails", [])
+                    if item.get("value")
+                ],
+            }
+
+        except Exception as e:
+            logger.exception(f"Hunter.io domain search error for {domain}: {e}")
+            return {"success": False, "error": str(e)}
+
+    async def find_emails(
+        self, contacts: List[Dict[str, Any]], fallback: bool = True
+    ) -> List[Dict[str, Any]]:
+        """Find emails for many contacts, one domain search per domain.
+
+        Each contact needs ``first_name``, ``last_name`` and ``domain``.
+        Contacts are resolved locally from the domain's known emails, then
+        from its address pattern; only the remaining misses fall back to a
+        per-person ``find_email`` call, at most ``fallback_concurrency`` at
+        a time and only while Hunter quota remains. Results are in input
+        order and carry a ``source`` of ``domain_search``, ``pattern`` or
+        ``email_finder``.
+        """
+        domains = {
+            normalize_domain(contact.get("domain") or "") for contact in contacts
+        }
+        domains.discard("")
+        searches = dict(
+            zip(
+                domains,
+                await asyncio.gather(*(self.search_domain(d) for d in domains)),
+            )
+        )
+
+        results: List[Optional[Dict[str, Any]]] = []
+        misses: List[Tuple[int, Dict[str, Any]]] = []
+        for index, contact in enumerate(contacts):
+            domain = normalize_domain(contact.get("domain") or "")
+            result = self._resolve_locally(contact, domain, searches.get(domain))
+            if result is None:
+                misses.append((index, contact))
+            results.append(result)
+
+        if misses and fallback:
+            semaphore = asyncio.Semaphore(max(1, self.fallback_concurrency))
+
+            async def find(contact: Dict[str, Any]) -> Dict[str, Any]:
+                async with semaphore:
+                    return await self._within_quota(
+                        partial(
+                            self.find_email,
+                            contact.get("first_name", ""),
+                            contact.get("last_name", ""),
+                            contact.get("domain", ""),
+                        )
+                    )
+
+            found = await asyncio.gather(*(find(contact) for _, contact in misses))
+            for (index, _), result in zip(misses, found):
+                if result["success"]:
+                    result["source"] = "email_finder"
+                results[index] = result
+
+        return [
+            result or {"success": False, "error": "Email not found"}
+            for result in results
+        ]
+
+    def _resolve_locally(
+        self,
+        contact: Dict[str, Any],
+        domain: str,
+        search: Optional[Dict[str, Any]],
+    ) -> Optional[Dict[str, Any]]:
+        """Match a contact against a domain search, or None on a miss."""
+        if not search or not search.get("success"):
+            return None
+
+        first = normalize_name(contact.get("first_name"))
+        last = normalize_name(contact.get("last_name"))
+        for known in search["emails"]:
+            if (
+                first
+                and normalize_name(known["first_name"]) == first
+                and normalize_name(known["last_name"]) == last
+            ):
+                return {
+                    "success": True,
+                    "email": known["email"],
+                    "confidence": known["confidence"],
+                    "sources": known["sources"],
+                    "verification_status": known["verification_status"],
+                    "source": "domain_search",
+                }
+
+        if search.get("pattern"):
+            email = apply_email_pattern(
+                search["pattern"],
+                contact.get("first_name", ""),
+                contact.get("last_name", ""),
+                domain,
+            )
+            if email:
+                return {
+                    "success": True,
+                    "email": email,
+                    "confidence": PATTERN_CONFIDENCE,
+                    "sources": [],
+                    "verification_status": None,
+                    "source": "pattern",
+                }
+        return None
+
     async def verify_email(self, email: str) -> Dict[str, Any]:
         """Verify email address using Hunter.io."""
         if not self.api_key:
@@ -71,7 +307,9 @@ class HunterIOService:
             url = f"{self.base_url}/email-verifier"
             params = {"email": email, "api_key": self.api_key}
 
-            response = requests.get(url, params=params, timeout=10)
+            response = await http_client_pool.get(
+                url, params=params, timeout=10, rate_limit="hunter"
+            )
             response.raise_for_status()
 
             data = response.json()
@@ -3,21 +3,41 @@ Surfe API Integration for People and Company Search/Enrichment
 Professional B2B data platform
 """
 
+import asyncio
 import logging
-from typing import Any, Dict, List, Optional
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
 
-import requests
+from services.http_client import http_client_pool
 
 
 logger = logging.getLogger(__name__)
 
+# Bulk enrichment job states reported while polling
+COMPLETED_STATUSES = frozenset({"COMPLETED", "DONE"})
+FAILED_STATUSES = frozenset({"FAILED", "ERROR", "CANCELLED"})
+
+# Result key for a single record of each enrichment kind
+RECORD_KEYS = {"people": "person", "companies": "company"}
+
+# Prefix of the externalID this client sends to match results to inputs
+CORRELATION_PREFIX = "enrich-ddf:"
+
 
 class SurfeService:
     """Surfe API service for people and company search and enrichment."""
 
     def __init__(self, api_key: Optional[str] = None):
+        from config import settings
+
         self.api_key = api_key
         self.base_url = "https://api.surfe.com/v2"
+        self.bulk_chunk_size = settings.surfe_bulk_chunk_size
+        self.bulk_concurrency = settings.surfe_bulk_concurrency
+        self.poll_interval = settings.surfe_bulk_poll_interval
+        self.bulk_timeout = settings.surfe_bulk_timeout
+        self.credits_remaining: Dict[str, Any] = {}
 
         if not self.api_key:
             logger.warning(
@@ -35,21 +55,63 @@ class SurfeService:
             "User-Agent": "Enrich-DDF-Floor-2/1.0",
         }
 
+    async def _search_page(
+        self, kind: str, filters: Dict[str, Any], limit: int, offset: int
+    ) -> Dict[str, Any]:
+        """Fetch one page of people or company search results."""
+        response = await http_client_pool.post(
+            f"{self.base_url}/{kind}/search",
+            headers=self._get_headers(),
+            json={"filters": filters, "limit": limit, "offset": offset},
+            timeout=30,
+            rate_limit="surfe",
+            retry=True,  # read-only search
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def _iter_search(
+        self,
+        kind: str,
+        filters: Dict[str, Any],
+        page_size: int,
+        max_results: Optional[int],
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Walk every search page, fetching the next page ahead of the consumer."""
+
+        def fetch(offset: int) -> Optional[asyncio.Future]:
+            limit = page_size
+            if max_results is not None:
+                limit = min(limit, max_results - offset)
+            if limit <= 0:
+                return None
+            return asyncio.ensure_future(
+                self._search_page(kind, filters, limit, offset)
+            )
+
+        offset = 0
+        pending = fetch(offset)
+        try:
+            while pending is not None:
+                data = await pending
+                pending = None
+                items = data.get(kind) or []
+                offset += len(items)
+                total = data.get("total_count")
+                if len(items) == page_size and (total is None or offset < total):
+                    pending = fetch(offset)  # prefetch while items are consumed
+                for item in items:
+                    yield item
+        finally:
+            if pending is not None:
+                pending.cancel()
+
     async def search_people(
         self, filters: Dict[str, Any], limit: int = 10, offset: int = 0
     ) -> Dict[str, Any]:
         """Search for people using Surfe API."""
         try:
-            payload = {"filters": filters, "limit": limit, "offset": offset}
-
-            response = requests.post(
-                f"{self.base_url}/people/search",
-                headers=self._get_headers(),
-                json=payload,
-                timeout=30,
-            )
-            response.raise_for_status()
-            data = response.json()
+            data = await self._search_page("people", filters, limit, offset)
 
             return {
                 "success": True,
@@ -62,59 +124,62 @@ class SurfeService:
             logger.exception(f"Surfe people search error: {e}")
             return {"success": False, "error": str(e), "people": []}
 
+    def iter_people(
+        self,
+        filters: Dict[str, Any],
+        page_size: int = 100,
+        max_results: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream every person matching ``filters``, up to ``max_results``.
+
+        Pages of ``page_size`` are requested one ahead of the consumer, so
+        the next page is already in flight while the current one is
+        processed. Request errors are raised to the caller.
+        """
+        return self._iter_search("people", filters, page_size, max_results)
+
     async def enrich_people(
         self,
         people_data: List[Dict[str, Any]],
         include_email: bool = True,
         include_mobile: bool = False,
     ) -> Dict[str, Any]:
-        """Enrich people data using Surfe API."""
-        try:
-            payload = {
-                "include": {
-                    "email": include_email,
-                    "mobile": include_mobile,
-                    "linkedin": True,
-                },
-                "people": people_data,
-            }
-
-            response = requests.post(
-                f"{self.base_url}/people/enrich",
-                headers=self._get_headers(),
-                json=payload,
-                timeout=30,
+        """Enrich people data using Surfe API.
+
+        Large lists are split into chunks; see ``enrich_people_bulk``.
+        """
+        usage: Dict[str, Any] = {}
+        results = [
+            result
+            async for result in self.enrich_people_bulk(
+                people_data, include_email, include_mobile, usage=usage
             )
-            response.raise_for_status()
-            data = response.json()
+        ]
+        return self._collect("people", results, usage)
 
-            return {
-                "success": True,
-                "people": data.get("people", []),
-                "credits_used": data.get("credits_used", {}),
-                "credits_remaining": data.get("credits_remaining", {}),
-                "message": f"Enriched {len(data.get('people', []))} people",
-            }
-
-        except Exception as e:
-            logger.exception(f"Surfe people enrichment error: {e}")
-            return {"success": False, "error": str(e), "people": []}
+    def enrich_people_bulk(
+        self,
+        people_data: List[Dict[str, Any]],
+        include_email: bool = True,
+        include_mobile: bool = False,
+        usage: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream one result per input person, in input order.
+
+        Inputs are submitted in chunks of ``surfe_bulk_chunk_size``, up to
+        ``surfe_bulk_concurrency`` at a time; chunks Surfe processes
+        asynchronously are polled until complete. Each result is
+        ``{"index", "success", "person"}`` or ``{"index", "success", "error"}``.
+        """
+        include = {"email": include_email, "mobile": include_mobile, "linkedin": True}
+        return self._enrich_bulk("people", people_data, {"include": include}, usage)
 
     async def search_companies(
         self, filters: Dict[str, Any], limit: int = 10, offset: int = 0
     ) -> Dict[str, Any]:
         """Search for companies using Surfe API."""
         try:
-            payload = {"filters": filters, "limit": limit, "offset": offset}
-
-            response = requests.post(
-                f"{self.base_url}/companies/search",
-                headers=self._get_headers(),
-                json=payload,
-                timeout=30,
-            )
-            response.raise_for_status()
-            data = response.json()
+            data = await self._search_page("companies", filters, limit, offset)
 
             return {
                 "success": True,
@@ -127,37 +192,221 @@ class SurfeService:
             logger.exception(f"Surfe company search error: {e}")
             return {"success": False, "error": str(e), "companies": []}
 
+    def iter_companies(
+        self,
+        filters: Dict[str, Any],
+        page_size: int = 100,
+        max_results: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream every company matching ``filters``, up to ``max_results``."""
+        return self._iter_search("companies", filters, page_size, max_results)
+
     async def enrich_companies(
         self, companies_data: List[Dict[str, Any]]
     ) -> Dict[str, Any]:
-        """Enrich company data using Surfe API."""
+        """Enrich company data using Surfe API.
+
+        Large lists are split into chunks; see ``enrich_companies_bulk``.
+        """
+        usage: Dict[str, Any] = {}
+        results = [
+            result
+            async for result in self.enrich_companies_bulk(companies_data, usage=usage)
+        ]
+        return self._collect("companies", results, usage)
+
+    def enrich_companies_bulk(
+        self,
+        companies_data: List[Dict[str, Any]],
+        usage: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream one result per input company, in input order."""
+        return self._enrich_bulk("companies", companies_data, {}, usage)
+
+    async def _enrich_bulk(
+        self,
+        kind: str,
+        records: List[Dict[str, Any]],
+        options: Dict[str, Any],
+        usage: Optional[Dict[str, Any]],
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Submit chunks concurrently and yield their results in order."""
+        size = max(1, self.bulk_chunk_size)
+        starts = iter(range(0, len(records), size))
+        in_flight: Deque[asyncio.Future] = deque()
+
+        def submit_next() -> bool:
+            start = next(starts, None)
+            if start is None:
+                return False
+            chunk = records[start : start + size]
+            in_flight.append(
+                asyncio.ensure_future(
+                    self._enrich_chunk(kind, start, chunk, options, usage)
+                )
+            )
+            return True
+
+        try:
+            while len(in_flight) < max(1, self.bulk_concurrency) and submit_next():
+                pass
+            while in_flight:
+                results = await in_flight.popleft()
+                submit_next()
+                for result in results:
+                    yield result
+        finally:
+            # Consumer stopped early: do not leave chunks running
+            for future in in_flight:
+                future.cancel()
+
+    async def _enrich_chunk(
+        self,
+        kind: str,
+        start: int,
+        chunk: List[Dict[str, Any]],
+        options: Dict[str, Any],
+        usage: Optional[Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        """Enrich one chunk, matching results back to inputs by externalID.
+
+        Every record is sent with an externalID owned by this client, so
+        caller-supplied IDs can never collide with it; a caller's own
+        externalID is restored on the returned record.
+        """
+        tagged = [
+            {**record, "externalID": f"{CORRELATION_PREFIX}{start + i}"}
+            for i, record in enumerate(chunk)
+        ]
         try:
-            payload = {"companies": companies_data}
+            items = await self._submit_and_wait(kind, {**options, kind: tagged}, usage)
+        except Exception as e:
+            logger.exception(
+                f"Surfe {kind} enrichment error for records "
+                f"{start}-{start + len(chunk) - 1}: {e}"
+            )
+            return [
+                {"index": start + i, "success": False, "error": str(e)}
+                for i in range(len(chunk))
+            ]
+
+        by_id = {
+            str(item["externalID"]): item
+            for item in items
+            if item.get("externalID") is not None
+        }
+        results = []
+        for i, (record, sent) in enumerate(zip(chunk, tagged)):
+            item = by_id.get(sent["externalID"])
+            if item is None and not by_id and i < len(items):
+                item = items[i]  # no IDs echoed back: results are positional
+            if item is None:
+                results.append(
+                    {"index": start + i, "success": False, "error": "No match found"}
+                )
+                continue
+            item = dict(item)
+            if record.get("externalID") is not None:
+                item["externalID"] = record["externalID"]
+            else:
+                item.pop("externalID", None)
+            results.append(
+                {"index": start + i, "success": True, RECORD_KEYS[kind]: item}
+            )
+        return results
 
-            response = requests.post(
-                f"{self.base_url}/companies/enrich",
+    async def _submit_and_wait(
+        self,
+        kind: str,
+        payload: Dict[str, Any],
+        usage: Optional[Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        """POST an enrichment request and poll it if Surfe runs it async."""
+        response = await http_client_pool.post(
+            f"{self.base_url}/{kind}/enrich",
+            headers=self._get_headers(),
+            json=payload,
+            timeout=60,
+            rate_limit="surfe",
+        )
+        response.raise_for_status()
+        data = response.json()
+
+        enrichment_id = data.get("enrichmentID") or data.get("id")
+        if data.get(kind) is None and enrichment_id:
+            data = await self._poll_enrichment(kind, enrichment_id)
+        self._track_credits(data, usage)
+        return data.get(kind) or []
+
+    async def _poll_enrichment(self, kind: str, enrichment_id: str) -> Dict[str, Any]:
+        """Poll an async enrichment until it completes, fails or times out."""
+        deadline = time.monotonic() + self.bulk_timeout
+        delay = self.poll_interval
+        while True:
+            response = await http_client_pool.get(
+                f"{self.base_url}/{kind}/enrich/{enrichment_id}",
                 headers=self._get_headers(),
-                json=payload,
                 timeout=30,
+                rate_limit="surfe",
             )
             response.raise_for_status()
             data = response.json()
-
-            return {
-                "success": True,
-                "companies": data.get("companies", []),
-                "message": f"Enriched {len(data.get('companies', []))} companies",
-            }
-
-        except Exception as e:
-            logger.exception(f"Surfe company enrichment error: {e}")
-            return {"success": False, "error": str(e), "companies": []}
+            status = str(data.get("status", "")).upper()
+            if status in COMPLETED_STATUSES:
+                return data
+            if status in FAILED_STATUSES:
+                raise RuntimeError(f"Surfe enrichment {enrichment_id} {status}")
+
+            if time.monotonic() + delay > deadline:
+                raise TimeoutError(
+                    f"Surfe enrichment {enrichment_id} did not complete "
+                    f"within {self.bulk_timeout}s"
+                )
+            await asyncio.sleep(delay)
+            delay = min(delay * 1.5, self.poll_interval * 5)
+
+    def _track_credits(self, data: Dict[str, Any], usage: Optional[Dict[str, Any]]):
+        """Record remaining credits and add a response's usage to ``usage``."""
+        if data.get("credits_remaining"):
+            self.credits_remaining = data["credits_remaining"]
+        if usage is not None:
+            for credit, used in (data.get("credits_used") or {}).items():
+                if isinstance(used, (int, float)):
+                    usage[credit] = usage.get(credit, 0) + used
+
+    def _collect(
+        self, kind: str, results: List[Dict[str, Any]], usage: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Fold streamed bulk results into the single-call response shape."""
+        key = RECORD_KEYS[kind]
+        records = [result[key] for result in results if result["success"]]
+        failed: List[Tuple[int, str]] = [
+            (result["index"], result["error"])
+            for result in results
+            if not result["success"]
+        ]
+        if failed and not records:
+            return {"success": False, "error": failed[0][1], kind: []}
+
+        response = {
+            "success": True,
+            kind: records,
+            "failed": len(failed),
+            "message": f"Enriched {len(records)} {kind}",
+        }
+        if kind == "people":
+            response["credits_used"] = usage
+            response["credits_remaining"] = self.credits_remaining
+        return response
 
     async def get_credits(self) -> Dict[str, Any]:
         """Get account credits information."""
         try:
-            response = requests.get(
-                f"{self.base_url}/credits", headers=self._get_headers(), timeout=10
+            response = await http_client_pool.get(
+                f"{self.base_url}/credits",
+                headers=self._get_headers(),
+                timeout=10,
+                rate_limit="surfe",
             )
             response.raise_for_status()
             data = response.json()
@@ -175,8 +424,11 @@ class SurfeService:
     async def get_filters(self) -> Dict[str, Any]:
         """Get available search filters."""
         try:
-            response = requests.get(
-                f"{self.base_url}/filters", headers=self._get_headers(), timeout=10
+            response = await http_client_pool.get(
+                f"{self.base_url}/filters",
+                headers=self._get_headers(),
+                timeout=10,
+                rate_limit="surfe",
             )
             response.raise_for_status()
             data = response.json()
@@ -191,11 +443,14 @@ class SurfeService:
             logger.exception(f"Surfe filters error: {e}")
             return {"success": False, "error": str(e)}
 
-    def test_connection(self) -> bool:
+    async def test_connection(self) -> bool:
         """Test API connection."""
         try:
-            response = requests.get(
-                f"{self.base_url}/credits", headers=self._get_headers(), timeout=10
+            response = await http_client_pool.get(
+                f"{self.base_url}/credits",
+                headers=self._get_headers(),
+                timeout=10,
+                rate_limit="surfe",
             )
             return response.status_code == 200
         except Exception as e:
@@ -3,21 +3,51 @@ Wiza API Integration for LinkedIn Profile Enrichment and Email Finding
 Professional LinkedIn data extraction platform
 """
 
+import asyncio
 import logging
-from typing import Any, Dict, Optional
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
 
-import requests
+from services.http_client import http_client_pool
 
 
 logger = logging.getLogger(__name__)
 
+# List job states reported while polling
+FINISHED_LIST_STATUSES = frozenset({"finished", "completed"})
+FAILED_LIST_STATUSES = frozenset({"failed", "cancelled"})
+
+# Contacts fetched per page while draining a list
+CONTACTS_PAGE_SIZE = 100
+
+
+def normalize_linkedin_url(url: str) -> str:
+    """Normalize a LinkedIn profile URL for matching Wiza's echoed URLs."""
+    value = url.strip().lower()
+    if "://" in value:
+        value = value.split("://", 1)[1]
+    value = value.split("?", 1)[0].split("#", 1)[0]
+    if value.startswith("www."):
+        value = value[4:]
+    return value.rstrip("/")
+
 
 class WizaService:
     """Wiza API service for LinkedIn profile enrichment and email finding."""
 
     def __init__(self, api_key: Optional[str] = None):
+        from config import settings
+
         self.api_key = api_key
         self.base_url = "https://api.wiza.co/api/v1"
+        self.list_max_size = settings.wiza_list_max_size
+        self.poll_interval = settings.wiza_list_poll_interval
+        self.max_poll_interval = settings.wiza_list_max_poll_interval
+        self.list_timeout = settings.wiza_list_timeout
+        self.credit_reserve = settings.wiza_credit_reserve
+        self.credits_remaining: Optional[int] = None
+        # Credits for submitted profiles Wiza has not returned yet
+        self._credits_in_flight = 0
 
         if not self.api_key:
             logger.warning(
@@ -46,11 +76,12 @@ class WizaService:
                 "include_phone": include_phone,
             }
 
-            response = requests.post(
+            response = await http_client_pool.post(
                 f"{self.base_url}/enrich/profile",
                 headers=self._get_headers(),
                 json=payload,
                 timeout=30,
+                rate_limit="wiza",
             )
             response.raise_for_status()
             data = response.json()
@@ -67,6 +98,182 @@ class WizaService:
             logger.exception(f"Wiza LinkedIn profile enrichment error: {e}")
             return {"success": False, "error": str(e)}
 
+    async def enrich_linkedin_profiles(
+        self,
+        linkedin_urls: List[str],
+        include_emails: bool = True,
+        include_phone: bool = True,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Enrich many LinkedIn profiles through Wiza list jobs.
+
+        URLs are submitted as lists of up to ``wiza_list_max_size``; each
+        list is polled with backoff and its profiles are yielded as they
+        finish, as ``{"success", "linkedin_url", "profile"}`` or
+        ``{"success", "linkedin_url", "error"}``. Before each list the
+        credit balance is refreshed and checked, less ``wiza_credit_reserve``
+        and the credits held by lists still running, assuming one credit per
+        profile; URLs that cannot be afforded are failed without being
+        submitted.
+        """
+        unique: Dict[str, str] = {}
+        for url in linkedin_urls:
+            if url:
+                unique.setdefault(normalize_linkedin_url(url), url)
+        urls = list(unique.values())
+        size = max(1, self.list_max_size)
+        for start in range(0, len(urls), size):
+            batch = urls[start : start + size]
+            held = await self._affordable(len(batch))
+            # Hold before yielding, so concurrent callers see these spent
+            self._credits_in_flight += held
+            try:
+                for url in batch[held:]:
+                    yield self._failed_profile(url, "Insufficient Wiza credits")
+                if held:
+                    async for result in self._run_list(
+                        batch[:held], include_emails, include_phone
+                    ):
+                        held -= 1
+                        self._credits_in_flight -= 1
+                        yield result
+            finally:
+                self._credits_in_flight -= held
+
+    async def _affordable(self, count: int) -> int:
+        """How many of ``count`` profiles the current credits cover."""
+        await self.get_credits()
+        if self.credits_remaining is None:
+            return count  # balance unknown: let Wiza enforce it
+        available = max(
+            0,
+            int(self.credits_remaining) - self._credits_in_flight - self.credit_reserve,
+        )
+        if available < count:
+            logger.warning(
+                f"⚠️ Wiza credits cover {available} of {count} profiles; "
+                "skipping the rest"
+            )
+        return min(count, available)
+
+    async def _request(self, method: str, path: str, **kwargs: Any) -> Dict[str, Any]:
+        """Call the Wiza API and track credits_remaining from the response."""
+        response = await http_client_pool.request(
+            method,
+            f"{self.base_url}{path}",
+            headers=self._get_headers(),
+            timeout=30,
+            rate_limit="wiza",
+            **kwargs,
+        )
+        response.raise_for_status()
+        data = response.json()
+        if isinstance(data.get("credits_remaining"), (int, float)):
+            self.credits_remaining = data["credits_remaining"]
+        return data
+
+    async def _run_list(
+        self, urls: List[str], include_emails: bool, include_phone: bool
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Submit one list job and yield its profiles until it finishes.
+
+        Results carry the submitted URL, whatever form Wiza echoes back.
+        """
+        pending = {normalize_linkedin_url(url): url for url in urls}
+        error = "No result returned for profile"
+        try:
+            data = await self._request(
+                "POST",
+                "/lists",
+                json={
+                    "list": {
+                        "name": f"enrich-{int(time.time())}",
+                        "include_emails": include_emails,
+                        "include_phone": include_phone,
+                        "items": [{"profile_url": url} for url in urls],
+                    }
+                },
+            )
+            list_id = data["id"]
+            logger.info(f"📋 Submitted Wiza list {list_id} with {len(urls)} profiles")
+
+            offset = 0
+            delay = self.poll_interval
+            deadline = time.monotonic() + self.list_timeout
+            while True:
+                status = str(
+                    (await self._request("GET", f"/lists/{list_id}")).get("status", "")
+                ).lower()
+                contacts = await self._contacts_since(list_id, offset)
+                offset += len(contacts)
+                for contact in contacts:
+                    result = self._contact_result(contact)
+                    submitted = pending.pop(
+                        normalize_linkedin_url(result["linkedin_url"]), None
+                    )
+                    if submitted:
+                        result["linkedin_url"] = submitted
+                    yield result
+
+                if status in FINISHED_LIST_STATUSES:
+                    break
+                if status in FAILED_LIST_STATUSES:
+                    raise RuntimeError(f"Wiza list {list_id} {status}")
+                # Back off while nothing new finishes; poll briskly on progress
+                delay = (
+                    self.poll_interval
+                    if contacts
+                    else min(delay * 2, self.max_poll_interval)
+                )
+                if time.monotonic() + delay > deadline:
+                    raise TimeoutError(
+                        f"Wiza list {list_id} did not finish within "
+                        f"{self.list_timeout}s"
+                    )
+                await asyncio.sleep(delay)
+
+        except Exception as e:
+            logger.exception(f"Wiza list enrichment error: {e}")
+            error = str(e)
+
+        for url in pending.values():
+            yield self._failed_profile(url, error)
+
+    async def _contacts_since(self, list_id: Any, offset: int) -> List[Dict[str, Any]]:
+        """Fetch every contact a list has finished after ``offset``."""
+        contacts: List[Dict[str, Any]] = []
+        while True:
+            page = (
+                await self._request(
+                    "GET",
+                    f"/lists/{list_id}/contacts",
+                    params={
+                        "offset": offset + len(contacts),
+                        "limit": CONTACTS_PAGE_SIZE,
+                    },
+                )
+            ).get("contacts") or []
+            contacts.extend(page)
+            if len(page) < CONTACTS_PAGE_SIZE:
+                return contacts
+
+    def _contact_result(self, contact: Dict[str, Any]) -> Dict[str, Any]:
+        """Turn a finished list contact into a profile result."""
+        url = contact.get("linkedin_url") or contact.get("profile_url", "")
+        if str(contact.get("status", "")).lower() == "failed":
+            return self._failed_profile(
+                url, contact.get("error") or "Wiza could not enrich profile"
+            )
+        return {
+            "success": True,
+            "linkedin_url": url,
+            "profile": self._transform_profile_response(
+                {**contact, "linkedin_url": url}
+            ),
+        }
+
+    def _failed_profile(self, url: str, error: str) -> Dict[str, Any]:
+        return {"success": False, "linkedin_url": url, "error": error}
+
     async def find_email(
         self,
         first_name: str,
@@ -85,11 +292,12 @@ class WizaService:
             if linkedin_url:
                 payload["linkedin_url"] = linkedin_url
 
-            response = requests.post(
+            response = await http_client_pool.post(
                 f"{self.base_url}/enrich/email",
                 headers=self._get_headers(),
                 json=payload,
                 timeout=30,
+                rate_limit="wiza",
             )
             response.raise_for_status()
             data = response.json()
@@ -126,11 +334,12 @@ class WizaService:
             if not payload:
                 raise ValueError("At least one company identifier is required")
 
-            response = requests.post(
+            response = await http_client_pool.post(
                 f"{self.base_url}/enrich/company",
                 headers=self._get_headers(),
                 json=payload,
                 timeout=30,
+                rate_limit="wiza",
             )
             response.raise_for_status()
             data = response.json()
@@ -150,11 +359,16 @@ class WizaService:
     async def get_credits(self) -> Dict[str, Any]:
         """Get account credits information."""
         try:
-            response = requests.get(
-                f"{self.base_url}/credits", headers=self._get_headers(), timeout=10
+            response = await http_client_pool.get(
+                f"{self.base_url}/credits",
+                headers=self._get_headers(),
+                timeout=10,
+                rate_limit="wiza",
             )
             response.raise_for_status()
             data = response.json()
+            if isinstance(data.get("credits"), (int, float)):
+                self.credits_remaining = data["credits"]
 
             return {
                 "success": True,
@@ -166,11 +380,14 @@ class WizaService:
             logger.exception(f"Wiza credits check error: {e}")
             return {"success": False, "error": str(e)}
 
-    def test_connection(self) -> bool:
+    async def test_connection(self) -> bool:
         """Test API connection."""
         try:
-            response = requests.get(
-                f"{self.base_url}/credits", headers=self._get_headers(), timeout=10
+            response = await http_client_pool.get(
+                f"{self.base_url}/credits",
+                headers=self._get_headers(),
+                timeout=10,
+                rate_limit="wiza",
             )
             return response.status_code == 200
         except Exception as e:
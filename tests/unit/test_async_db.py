@@ -0,0 +1,58 @@
+"""Tests for the async database layer used by the API routes."""
+
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from database.connection import Base, get_async_database_url
+from database.models import Company
+from database.utils.pagination import keyset_select, split_page
+
+
+@pytest.mark.parametrize(
+    ("sync_url", "async_url"),
+    [
+        ("sqlite:///./app.db", "sqlite+aiosqlite:///./app.db"),
+        ("sqlite+aiosqlite:///./app.db", "sqlite+aiosqlite:///./app.db"),
+        ("postgresql+psycopg2://u:p@db/app", "postgresql+asyncpg://u:p@db/app"),
+        ("postgresql+asyncpg://u:p@db/app", "postgresql+asyncpg://u:p@db/app"),
+    ],
+)
+def test_async_database_url(sync_url, async_url):
+    """Test that sync URLs map to their async drivers."""
+    assert get_async_database_url(sync_url) == async_url
+
+
+@pytest.mark.asyncio
+async def test_keyset_pages_on_async_session():
+    """Test keyset pagination through AsyncSession without blocking the loop."""
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with session_factory() as db:
+        db.add_all(Company(name=f"Async {i}", domain=f"async{i}.io") for i in range(3))
+        await db.commit()
+
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        task = asyncio.ensure_future(ticker())
+        rows = (await db.scalars(keyset_select(Company, 2))).all()
+        first, cursor = split_page(rows, 2)
+        rows = (await db.scalars(keyset_select(Company, 2, cursor))).all()
+        second, last = split_page(rows, 2)
+        task.cancel()
+
+    await engine.dispose()
+    assert [c.domain for c in first] == ["async0.io", "async1.io"]
+    assert [c.domain for c in second] == ["async2.io"]
+    assert last is None
+    assert ticks > 0  # the loop kept running while queries were in flight
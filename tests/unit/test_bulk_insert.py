@@ -0,0 +1,236 @@
+"""Tests for the bulk create/upsert endpoints and chunked insert helpers."""
+
+import json
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from database.connection import Base
+from database.models import Company, Contact
+from database.utils.bulk import bulk_insert, parse_bulk_body
+
+
+@pytest.fixture
+def db():
+    """Isolated in-memory database session."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    yield session
+    session.close()
+
+
+class TestBulkInsert:
+    """Test validation, chunking and per-row status."""
+
+    def test_inserts_across_chunks_with_defaults(self, db):
+        """Test that every chunk is inserted and column defaults apply."""
+        rows = [{"name": f"Acme {i}", "domain": f"acme{i}.com"} for i in range(5)]
+        rows[2]["industry"] = "Software"  # different key set in the same chunk
+
+        summary = bulk_insert(db, Company, rows, chunk_size=2)
+
+        assert summary["created"] == 5
+        assert [r["status"] for r in summary["results"]] == ["created"] * 5
+        stored = db.get(Company, summary["results"][2]["id"])
+        assert stored.domain == "acme2.com"
+        assert stored.industry == "Software"
+        assert stored.is_active is True
+        assert stored.enrichment_data == {}
+
+    def test_reports_per_row_errors(self, db):
+        """Test invalid, duplicate and conflicting rows fail individually."""
+        db.add(Contact(first_name="Existing", last_name="Row", email="taken@acme.com"))
+        db.commit()
+
+        rows = [
+            {"first_name": "Ann", "last_name": "Lee", "email": "ann@acme.com"},
+            {"first_name": "No", "email": "missing@acme.com"},
+            {"first_name": "Ann", "last_name": "Dup", "email": "ann@acme.com"},
+            {"first_name": "Tom", "last_name": "Ray", "email": "taken@acme.com"},
+            {"first_name": "Bo", "last_name": "Wu", "email": "bo@acme.com", "x": 1},
+            "not an object",
+            {"first_name": "Eve", "last_name": "Ng", "email": "eve@acme.com"},
+        ]
+
+        summary = bulk_insert(db, Contact, rows)
+
+        statuses = [r["status"] for r in summary["results"]]
+        assert statuses == [
+            "created",
+            "error",
+            "error",
+            "error",
+            "error",
+            "error",
+            "created",
+        ]
+        assert "last_name" in summary["results"][1]["error"]
+        assert "Duplicate email" in summary["results"][2]["error"]
+        assert "UNIQUE" in summary["results"][3]["error"]
+        assert summary["created"] == 2
+        assert db.query(Contact).count() == 3
+
+    @pytest.mark.parametrize(
+        ("merge", "expected"),
+        [
+            ("replace", {"tags": {"b": 2}}),
+            ("deep", {"source": "crm", "tags": {"a": 1, "b": 2}}),
+        ],
+    )
+    def test_upsert_updates_on_natural_key(self, db, merge, expected):
+        """Test insert-or-update on domain with both merge policies."""
+        db.add(
+            Company(
+                name="Acme",
+                domain="acme.com",
+                industry="Retail",
+                enrichment_data={"source": "crm", "tags": {"a": 1}},
+            )
+        )
+        db.commit()
+        rows = [
+            {
+                "name": "Acme Inc",
+                "domain": "acme.com",
+                "enrichment_data": {"tags": {"b": 2}},
+            },
+            {"name": "Globex", "domain": "globex.com"},
+        ]
+
+        summary = bulk_insert(db, Company, rows, upsert=True, merge=merge)
+
+        assert [r["status"] for r in summary["results"]] == ["updated", "created"]
+        assert summary["updated"] == 1
+        db.expire_all()
+        acme = db.get(Company, summary["results"][0]["id"])
+        assert acme.name == "Acme Inc"
+        assert acme.industry == "Retail"  # columns not supplied are kept
+        assert acme.enrichment_data == expected
+        assert db.query(Company).count() == 2
+
+    def test_deep_merge_keeps_data_on_null(self, db):
+        """Test that a null enrichment_data re-import does not wipe stored data."""
+        db.add(Company(name="Acme", domain="acme.com", enrichment_data={"a": 1}))
+        db.commit()
+        rows = [{"name": "Acme", "domain": "acme.com", "enrichment_data": None}]
+
+        summary = bulk_insert(db, Company, rows, upsert=True, merge="deep")
+
+        assert summary["updated"] == 1
+        db.expire_all()
+        assert db.query(Company).one().enrichment_data == {"a": 1}
+
+    def test_unknown_merge_policy(self, db):
+        """Test that merge policies are validated."""
+        with pytest.raises(ValueError):
+            bulk_insert(db, Company, [], upsert=True, merge="append")
+
+    def test_deep_merge_is_refused_without_native_support(self, db, monkeypatch):
+        """Test that deep merges fail up front where only a shallow one exists."""
+        monkeypatch.setattr(db.get_bind().dialect, "name", "postgresql")
+        rows = [{"name": "Acme", "domain": "acme.com"}]
+
+        with pytest.raises(ValueError, match="not supported on postgresql"):
+            bulk_insert(db, Company, rows, upsert=True, merge="deep")
+        assert db.query(Company).count() == 0
+
+    def test_parse_ndjson_and_array(self):
+        """Test both accepted body formats."""
+        ndjson = b'{"name": "A"}\n\n{"name": "B"}\n'
+        assert parse_bulk_body(ndjson, "application/x-ndjson") == [
+            {"name": "A"},
+            {"name": "B"},
+        ]
+        assert parse_bulk_body(b'[{"name": "A"}]', "application/json") == [
+            {"name": "A"}
+        ]
+        with pytest.raises(ValueError):
+            parse_bulk_body(b'{"name": "A"}', "application/json")
+        with pytest.raises(ValueError, match="line 2"):
+            parse_bulk_body(b'{"name": "A"}\n{oops', "application/x-ndjson")
+
+
+class TestBulkEndpoints:
+    """Test the /api/v1/{entity}/bulk routes."""
+
+    def test_bulk_create_companies_from_array(self, client: TestClient):
+        """Test a JSON array body."""
+        unique_id = uuid.uuid4().hex[:8]
+        rows = [
+            {"name": f"Bulk {unique_id} {i}", "domain": f"{unique_id}-{i}.io"}
+            for i in range(3)
+        ]
+        response = client.post("/api/v1/companies/bulk", json=rows)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["success"] is True
+        assert data["created"] == 3
+        assert all(isinstance(r["id"], int) for r in data["results"])
+
+    def test_bulk_create_products_from_ndjson(self, client: TestClient):
+        """Test an NDJSON body."""
+        unique_id = uuid.uuid4().hex[:8]
+        body = "\n".join(
+            json.dumps({"name": f"Widget {i}", "sku": f"{unique_id}-{i}", "price": 9.5})
+            for i in range(2)
+        )
+        response = client.post(
+            "/api/v1/products/bulk",
+            content=body,
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["created"] == 2
+
+    def test_bulk_rejects_non_array_body(self, client: TestClient):
+        """Test that a single object is rejected with 400."""
+        response = client.post("/api/v1/contacts/bulk", json={"email": "a@b.com"})
+        assert response.status_code == 400
+
+    def test_single_upsert_creates_then_updates(self, client: TestClient):
+        """Test POST /upsert returns created, then updated for the same key."""
+        email = f"{uuid.uuid4().hex[:8]}@acme.com"
+        contact = {"first_name": "Jane", "last_name": "Roe", "email": email}
+
+        first = client.post("/api/v1/contacts/upsert", json=contact)
+        second = client.post(
+            "/api/v1/contacts/upsert",
+            json={**contact, "job_title": "CTO"},
+        )
+
+        assert first.json()["status"] == "created"
+        assert second.status_code == 200
+        assert second.json()["status"] == "updated"
+        assert second.json()["id"] == first.json()["id"]
+        assert second.json()["data"]["job_title"] == "CTO"
+
+    def test_bulk_upsert_endpoint(self, client: TestClient):
+        """Test the bulk upsert route and merge validation."""
+        sku = uuid.uuid4().hex[:8]
+        rows = [{"name": "Widget", "sku": sku}]
+        assert (
+            client.post("/api/v1/products/bulk/upsert", json=rows).json()["created"]
+            == 1
+        )
+
+        response = client.post(
+            "/api/v1/products/bulk/upsert",
+            params={"merge": "deep"},
+            json=[{"name": "Widget v2", "sku": sku}],
+        )
+        assert response.json()["updated"] == 1
+        response = client.post(
+            "/api/v1/products/bulk/upsert", params={"merge": "bogus"}, json=rows
+        )
+        assert response.status_code == 400
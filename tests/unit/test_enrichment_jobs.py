@@ -0,0 +1,225 @@
+"""Tests for the durable background enrichment job queue and worker pool."""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from core.enrichment.jobs import (
+    EnrichmentJobQueue,
+    EnrichmentWorkerPool,
+    has_real_data,
+)
+from database.connection import Base
+from database.models import Contact
+from main import app
+
+
+class FakeEngine:
+    """Enrichment engine stand-in that fails a configurable number of times."""
+
+    def __init__(self, failures: int = 0, sources=("clearbit",)):
+        self.failures = failures
+        self.sources = list(sources)
+        self.calls = 0
+
+    async def enrich_person_real(self, person_data):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise RuntimeError("provider outage")
+        return {
+            "email": person_data["email"],
+            "enrichment_score": 50,
+            "data_sources": self.sources,
+        }
+
+    async def enrich_company_real(self, company_data):
+        return {
+            "domain": company_data["domain"],
+            "enrichment_score": 50,
+            "data_sources": self.sources,
+        }
+
+
+class RecordingWorkerPool(EnrichmentWorkerPool):
+    """Worker pool that signals each job outcome once it is recorded."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.outcomes = []
+        self.recorded = asyncio.Condition()
+
+    async def run_job(self, job):
+        outcome = await super().run_job(job)
+        async with self.recorded:
+            self.outcomes.append(outcome)
+            self.recorded.notify_all()
+        return outcome
+
+    async def finished(self, count: int):
+        """Wait until ``count`` jobs have been recorded."""
+        async with self.recorded:
+            await self.recorded.wait_for(lambda: len(self.outcomes) >= count)
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """Isolated database file; each worker thread gets its own connection."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'jobs.db'}",
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def queue(session_factory):
+    """Job queue with immediate retries."""
+    return EnrichmentJobQueue(
+        session_factory, visibility_timeout=60, max_attempts=2, retry_backoff=0
+    )
+
+
+class TestEnrichmentJobQueue:
+    """Test leasing, completion and retry semantics."""
+
+    def test_lease_is_exclusive(self, queue):
+        """Test that a leased job is invisible to other workers."""
+        job = queue.enqueue("person", {"email": "jane@acme.com"})
+
+        leased = queue.lease()
+        assert leased["id"] == job["id"]
+        assert leased["status"] == "running"
+        assert leased["attempts"] == 1
+        assert leased["lease_token"]
+        assert "lease_token" not in queue.get(leased["id"])
+        assert queue.lease() is None
+
+    def test_expired_lease_becomes_visible_again(self, queue):
+        """Test the visibility timeout for stalled workers."""
+        queue.visibility_timeout = 0
+        queue.enqueue("person", {"email": "jane@acme.com"})
+
+        first = queue.lease()
+        second = queue.lease()
+
+        assert second["id"] == first["id"]
+        assert second["attempts"] == 2
+        assert not queue.complete(first["id"], first["lease_token"], {})
+
+    @pytest.mark.asyncio
+    async def test_run_job_writes_contact_enrichment(self, queue, session_factory):
+        """Test that results land on the job and the matching contact."""
+        with session_factory() as db:
+            contact = Contact(first_name="Jane", last_name="Roe", email="jane@acme.com")
+            db.add(contact)
+            db.commit()
+            contact_id = contact.id
+
+        job = queue.enqueue("person", {"email": "jane@acme.com"})
+        pool = EnrichmentWorkerPool(queue, engine=FakeEngine(), workers=1)
+
+        assert await pool.run_job(queue.lease())
+
+        stored = queue.get(job["id"])
+        assert stored["status"] == "succeeded"
+        assert stored["entity_id"] == contact_id
+        with session_factory() as db:
+            assert db.get(Contact, contact_id).enrichment_data["enrichment_score"] == 50
+
+    @pytest.mark.asyncio
+    async def test_failures_retry_then_fail(self, queue):
+        """Test that failed attempts are retried until max_attempts."""
+        job = queue.enqueue("person", {"email": "jane@acme.com"})
+        pool = EnrichmentWorkerPool(queue, engine=FakeEngine(failures=5), workers=1)
+
+        await pool.run_job(queue.lease())
+        assert queue.get(job["id"])["status"] == "queued"
+
+        await pool.run_job(queue.lease())
+        stored = queue.get(job["id"])
+        assert stored["status"] == "failed"
+        assert stored["error"] == "provider outage"
+        assert queue.lease() is None
+
+    @pytest.mark.asyncio
+    async def test_mock_fallback_is_retried_not_stored(self, queue, session_factory):
+        """Test that a mock-data result fails the attempt and is never persisted."""
+        with session_factory() as db:
+            contact = Contact(first_name="Jane", last_name="Roe", email="jane@acme.com")
+            db.add(contact)
+            db.commit()
+            contact_id = contact.id
+
+        job = queue.enqueue("person", {"email": "jane@acme.com"})
+        pool = EnrichmentWorkerPool(
+            queue, engine=FakeEngine(sources=["mock_enhanced"]), workers=1
+        )
+
+        assert not await pool.run_job(queue.lease())
+        stored = queue.get(job["id"])
+        assert stored["status"] == "queued"
+        assert stored["result"] is None
+        assert "mock" in stored["error"]
+
+        await pool.run_job(queue.lease())
+        assert queue.get(job["id"])["status"] == "failed"
+        with session_factory() as db:
+            assert not db.get(Contact, contact_id).enrichment_data
+
+    def test_only_a_reached_target_counts_without_sources(self):
+        """Test that providers cut off by the deadline are not real data."""
+        assert has_real_data({"data_sources": [], "target_reached": True})
+        assert not has_real_data(
+            {"data_sources": [], "timed_out_providers": ["hunter"]}
+        )
+        assert not has_real_data({"data_sources": [], "skipped_providers": ["hunter"]})
+
+    @pytest.mark.asyncio
+    async def test_worker_pool_drains_queue(self, queue):
+        """Test that started workers pick up and finish queued jobs."""
+        jobs = [queue.enqueue("company", {"domain": f"acme{i}.com"}) for i in range(3)]
+        pool = RecordingWorkerPool(
+            queue, engine=FakeEngine(), workers=2, poll_interval=0.01
+        )
+
+        pool.start()
+        pool.notify()
+        await asyncio.wait_for(pool.finished(len(jobs)), timeout=10)
+        await pool.stop()
+
+        assert [queue.get(j["id"])["status"] for j in jobs] == ["succeeded"] * 3
+
+
+@pytest.fixture
+def lifespan_client():
+    """Test client that runs the app lifespan (tables, workers, HTTP pool)."""
+    with TestClient(app) as client:
+        yield client
+
+
+class TestEnrichmentEndpoints:
+    """Test that enrichment endpoints queue jobs instead of blocking."""
+
+    def test_enqueue_person_returns_job_id(self, lifespan_client: TestClient):
+        """Test POST /api/v1/enrich/person returns a queued job."""
+        client = lifespan_client
+        response = client.post(
+            "/api/v1/enrich/person",
+            json={"first_name": "Jane", "last_name": "Roe", "email": "jane@acme.com"},
+        )
+        assert response.status_code == 202
+        data = response.json()
+        assert data["status"] == "queued"
+
+        job = client.get(data["status_url"]).json()
+        assert job["id"] == data["job_id"]
+        assert job["payload"]["email"] == "jane@acme.com"
+        assert "lease_token" not in job
+
+    def test_unknown_job_returns_404(self, lifespan_client: TestClient):
+        """Test job lookup for a missing id."""
+        assert lifespan_client.get("/api/v1/enrich/jobs/999999999").status_code == 404
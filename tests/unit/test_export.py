@@ -0,0 +1,101 @@
+"""Tests for the streaming NDJSON/CSV export endpoints."""
+
+import csv
+import gzip
+import io
+import json
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from database.connection import Base
+from database.models import Company, Product
+from database.utils.export import stream_export
+
+
+@pytest.fixture
+def bind():
+    """In-memory engine seeded with a few rows."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as db:
+        old = datetime.utcnow() - timedelta(days=2)
+        db.add(Company(name="Old", domain="old.com", created_at=old, updated_at=old))
+        db.add(Company(name="New", domain="new.com", enrichment_data={"a": [1]}))
+        db.add(Product(name="Widget", sku="W-1", price=9.5))
+        db.commit()
+    return engine
+
+
+class TestStreamExport:
+    """Test the export generator."""
+
+    def test_ndjson_with_updated_since(self, bind):
+        """Test NDJSON lines and incremental filtering."""
+        body = b"".join(stream_export(bind, Company, "ndjson"))
+        rows = [json.loads(line) for line in body.decode().splitlines()]
+        assert [row["domain"] for row in rows] == ["old.com", "new.com"]
+        assert rows[1]["enrichment_data"] == {"a": [1]}
+
+        since = datetime.utcnow() - timedelta(days=1)
+        body = b"".join(stream_export(bind, Company, "ndjson", updated_since=since))
+        assert [json.loads(line)["domain"] for line in body.splitlines()] == ["new.com"]
+
+    def test_csv_gzip(self, bind):
+        """Test gzipped CSV with a header row."""
+        body = b"".join(stream_export(bind, Product, "csv", compress=True))
+        reader = csv.DictReader(io.StringIO(gzip.decompress(body).decode()))
+        (row,) = list(reader)
+        assert row["sku"] == "W-1"
+        assert float(row["price"]) == 9.5
+
+    def test_unknown_format(self, bind):
+        """Test that unknown formats fail before streaming."""
+        with pytest.raises(ValueError):
+            stream_export(bind, Company, "xml")
+
+
+class TestExportEndpoints:
+    """Test the /api/v1/{entity}/export routes."""
+
+    def test_export_contacts_ndjson(self, client: TestClient):
+        """Test that a newly created contact appears in the export."""
+        email = f"{uuid.uuid4().hex[:8]}@export.io"
+        client.post(
+            "/api/v1/contacts",
+            json={"first_name": "Ex", "last_name": "Port", "email": email},
+        )
+
+        response = client.get(
+            "/api/v1/contacts/export",
+            params={"updated_since": (datetime.utcnow() - timedelta(minutes=5))},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        assert response.headers["content-encoding"] == "gzip"
+        emails = [json.loads(line)["email"] for line in response.text.splitlines()]
+        assert email in emails
+
+    def test_export_csv_and_bad_format(self, client: TestClient):
+        """Test the CSV variant and format validation."""
+        response = client.get(
+            "/api/v1/companies/export",
+            params={"format": "csv"},
+            headers={"Accept-Encoding": "identity"},
+        )
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
+        assert response.text.splitlines()[0].startswith("name,domain")
+
+        response = client.get("/api/v1/companies/export", params={"format": "xml"})
+        assert response.status_code == 400
@@ -0,0 +1,148 @@
+"""Tests for declarative provider field mappings."""
+
+import pytest
+
+from core.enrichment.field_mapping import (
+    COMPANY_MAPPINGS,
+    PERSON_MAPPINGS,
+    FieldMapping,
+    FieldRule,
+)
+
+
+def empty_person():
+    return {
+        "full_name": "",
+        "professional": {},
+        "contact": {},
+        "location": {},
+        "skills": ["Go"],
+    }
+
+
+GITHUB_RESULT = {
+    "success": True,
+    "profile": {
+        "name": "Jane R.",
+        "twitter_username": "jane_gh",
+        "location": "Lisbon",
+        "public_repos": 12,
+    },
+    "github_url": "https://github.com/janeroe",
+    "programming_languages": ["Python", "Go"],
+    "organizations": [{"login": "acme"}, {"login": "oss"}],
+}
+
+
+class TestFieldMapping:
+    """Test compiled rules and their precedence modes."""
+
+    def test_precedence_modes(self):
+        """Test overwrite, present, fill and union against existing values."""
+        mapping = FieldMapping(
+            [
+                FieldRule("a", "out.overwrite", default="none"),
+                FieldRule("b", "out.present", precedence="present"),
+                FieldRule("c", "out.fill", precedence="fill"),
+                FieldRule("d", "out.union", precedence="union"),
+            ]
+        )
+        record = {"out": {"present": "kept", "fill": "kept", "union": [1, 2]}}
+
+        mapping.merge(record, {"b": "", "c": "new", "d": [2, 3]})
+
+        assert record["out"] == {
+            "overwrite": "none",
+            "present": "kept",
+            "fill": "kept",
+            "union": [1, 2, 3],
+        }
+
+    def test_guard_skips_group_and_nested_paths(self):
+        """Test ``when`` guards, deep source paths and transforms."""
+        mapping = FieldMapping(
+            [
+                FieldRule("x.y.z", "deep.value", transform=str.upper, when="x"),
+                FieldRule("missing", "guarded", when="absent"),
+            ]
+        )
+
+        record = mapping.merge({}, {"x": {"y": {"z": "ok"}}})
+
+        assert record == {"deep": {"value": "OK"}}
+
+    def test_mutable_defaults_are_not_shared(self):
+        """Test that each record gets its own copy of a default container."""
+        mapping = FieldMapping([FieldRule("tags", "tags", default=[])])
+
+        first = mapping.merge({}, {})
+        second = mapping.merge({}, {})
+        first["tags"].append("x")
+
+        assert second["tags"] == []
+
+    def test_unknown_precedence_is_rejected(self):
+        """Test that a misspelled precedence fails at compile time."""
+        with pytest.raises(ValueError):
+            FieldMapping([FieldRule("a", "b", precedence="newest")])
+
+    def test_merge_batch(self):
+        """Test merging many responses in one pass, skipping missing ones."""
+        mapping = COMPANY_MAPPINGS["clearbit"]
+        records = [{"name": f"co{i}", "social": {}} for i in range(3)]
+        responses = [
+            {"company": {"name": "Acme", "employees": 10}},
+            None,
+            {"company": {"founded_year": 2011}},
+        ]
+
+        merged = mapping.merge_batch(records, responses)
+
+        assert merged is not records
+        assert [r["name"] for r in merged] == ["Acme", "co1", "co2"]
+        assert merged[0]["employees"] == 10
+        assert merged[0]["tech_stack"] == []
+        assert "founded" not in merged[1]
+        assert merged[2]["founded"] == 2011
+
+
+class TestProviderMappings:
+    """Test the built-in provider specs."""
+
+    def test_github_person_mapping(self):
+        """Test GitHub profile fields land where the engine expects them."""
+        record = PERSON_MAPPINGS["github"].merge(empty_person(), GITHUB_RESULT)
+
+        assert record["full_name"] == "Jane R."
+        assert record["contact"]["github"] == "https://github.com/janeroe"
+        assert record["contact"]["twitter"] == "https://twitter.com/jane_gh"
+        assert record["location"]["github_location"] == "Lisbon"
+        assert record["professional"]["github_stats"] == {
+            "public_repos": 12,
+            "followers": 0,
+            "following": 0,
+        }
+        assert record["professional"]["organizations"] == ["acme", "oss"]
+        assert record["skills"] == ["Go", "Python"]
+
+    def test_github_does_not_replace_known_name(self):
+        """Test that GitHub only fills the name when it is still empty."""
+        record = empty_person()
+        record["full_name"] = "Jane Roe"
+
+        PERSON_MAPPINGS["github"].merge(record, GITHUB_RESULT)
+
+        assert record["full_name"] == "Jane Roe"
+
+    def test_hunter_person_mapping(self):
+        """Test email verification fields and their defaults."""
+        record = PERSON_MAPPINGS["hunter"].merge(
+            empty_person(), {"result": "risky", "score": 40}
+        )
+
+        assert record["contact"] == {
+            "email_verified": False,
+            "email_confidence": 40,
+            "email_disposable": False,
+            "email_webmail": False,
+        }
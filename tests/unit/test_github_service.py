@@ -0,0 +1,326 @@
+"""Tests for the GitHub provider client over a mock transport."""
+
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+from services.http_cache import ConditionalResponseCache
+from services.http_client import http_client_pool
+from services.third_party.github import GitHubService
+
+
+def github_transport(delay: float = 0.0, failing: tuple = ()):
+    """Mock GitHub REST API; paths in ``failing`` answer 404."""
+    seen = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        seen.append(path)
+        await asyncio.sleep(delay)
+        if path in failing:
+            return httpx.Response(404, json={"message": "Not Found"})
+        if path.endswith("/repos"):
+            return httpx.Response(
+                200,
+                json=[{"name": "api", "language": "Python", "stargazers_count": 3}],
+            )
+        if path.endswith(("/orgs", "/members")):
+            return httpx.Response(200, json=[{"login": "acme"}])
+        return httpx.Response(200, json={"login": path.rsplit("/", 1)[-1]})
+
+    return httpx.MockTransport(handler), seen
+
+
+def graphql_transport(missing: tuple = ()):
+    """Mock GitHub GraphQL endpoint answering aliased ``user`` fields."""
+    batches = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/graphql"
+        body = json.loads(request.content)
+        assert "...DeveloperProfile" in body["query"]
+        batches.append(list(body["variables"].values()))
+        data, errors = {}, []
+        for alias, login in body["variables"].items():
+            if login in missing:
+                data[alias] = None
+                errors.append(
+                    {
+                        "type": "NOT_FOUND",
+                        "path": [alias],
+                        "message": f"Could not resolve to a User with the login of '{login}'.",
+                    }
+                )
+                continue
+            data[alias] = {
+                "login": login,
+                "name": login.title(),
+                "email": "",
+                "websiteUrl": "https://example.com",
+                "followers": {"totalCount": 7},
+                "following": {"totalCount": 1},
+                "repositories": {
+                    "totalCount": 12,
+                    "nodes": [
+                        {
+                            "name": "api",
+                            "stargazerCount": 3,
+                            "forkCount": 0,
+                            "url": f"https://github.com/{login}/api",
+                            "primaryLanguage": {"name": "Python"},
+                        },
+                        {"name": "notes", "primaryLanguage": None},
+                    ],
+                },
+                "organizations": {"nodes": [{"login": "acme"}]},
+            }
+        return httpx.Response(200, json={"data": data, "errors": errors or None})
+
+    return httpx.MockTransport(handler), batches
+
+
+def etag_transport(versions: dict):
+    """Mock REST API honouring If-None-Match; ``versions`` maps path to body."""
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = versions[request.url.path]
+        etag = f'"{hash(json.dumps(body, sort_keys=True))}"'
+        seen.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == etag:
+            return httpx.Response(304, headers={"ETag": etag})
+        return httpx.Response(200, json=body, headers={"ETag": etag})
+
+    return httpx.MockTransport(handler), seen
+
+
+def token_service() -> GitHubService:
+    """GitHub client with a token, as GraphQL requires one."""
+    service = GitHubService(http_cache=False)
+    service.token = "test-token"
+    return service
+
+
+async def call_with_transport(transport, call):
+    """Run ``call()`` with the shared pool routed through ``transport``."""
+    await http_client_pool.close()
+    http_client_pool.start(transport=transport)
+    try:
+        return await call()
+    finally:
+        await http_client_pool.close()
+
+
+class TestGitHubSubRequests:
+    """Test concurrent sub-requests and partial results."""
+
+    @pytest.mark.asyncio
+    async def test_profile_sub_requests_run_concurrently(self):
+        """Test that user, repos and orgs overlap instead of running in series."""
+        transport, seen = github_transport(delay=0.1)
+
+        start = time.perf_counter()
+        result = await call_with_transport(
+            transport,
+            lambda: GitHubService(http_cache=False).enrich_developer_profile("octocat"),
+        )
+        elapsed = time.perf_counter() - start
+
+        assert result["success"] is True
+        assert result["programming_languages"] == ["Python"]
+        assert result["missing"] == []
+        assert len(seen) == 3
+        assert elapsed < 0.25
+
+    @pytest.mark.asyncio
+    async def test_failed_secondary_request_returns_partial(self):
+        """Test that a failed members call still returns the organization."""
+        transport, _ = github_transport(failing=("/orgs/acme/members",))
+
+        result = await call_with_transport(
+            transport,
+            lambda: GitHubService(http_cache=False).enrich_organization("acme"),
+        )
+
+        assert result["success"] is True
+        assert result["organization"]["login"] == "acme"
+        assert result["members"] == []
+        assert result["missing"] == ["members"]
+
+    @pytest.mark.asyncio
+    async def test_failed_primary_request_fails(self):
+        """Test that a missing user is still reported as a failure."""
+        transport, _ = github_transport(failing=("/users/ghost",))
+
+        result = await call_with_transport(
+            transport,
+            lambda: GitHubService(http_cache=False).enrich_developer_profile("ghost"),
+        )
+
+        assert result["success"] is False
+        assert "404" in result["error"]
+
+
+class TestGitHubGraphQLBatch:
+    """Test batched profile enrichment over GraphQL aliases."""
+
+    @pytest.mark.asyncio
+    async def test_one_request_per_batch(self):
+        """Test that 120 users take three requests of at most 50 aliases."""
+        transport, batches = graphql_transport()
+        usernames = [f"dev{i}" for i in range(120)]
+
+        results = await call_with_transport(
+            transport, lambda: token_service().enrich_developer_profiles(usernames)
+        )
+
+        assert sorted(len(batch) for batch in batches) == [20, 50, 50]
+        assert list(results) == usernames
+        assert all(result["success"] for result in results.values())
+
+    @pytest.mark.asyncio
+    async def test_same_shape_as_rest_profile(self):
+        """Test that batch results match enrich_developer_profile's shape."""
+        transport, _ = graphql_transport()
+        rest_transport, _ = github_transport()
+
+        results = await call_with_transport(
+            transport, lambda: token_service().enrich_developer_profiles(["octocat"])
+        )
+        rest = await call_with_transport(
+            rest_transport,
+            lambda: GitHubService(http_cache=False).enrich_developer_profile("octocat"),
+        )
+
+        result = results["octocat"]
+        assert result.keys() == rest.keys()
+        assert result["profile"].keys() == rest["profile"].keys()
+        assert result["repositories"][0].keys() == rest["repositories"][0].keys()
+        assert result["profile"]["public_repos"] == 12
+        assert result["profile"]["blog"] == "https://example.com"
+        assert result["profile"]["email"] is None
+        assert result["repositories"][0]["language"] == "Python"
+        assert result["programming_languages"] == ["Python"]
+        assert result["organizations"][0]["login"] == "acme"
+
+    @pytest.mark.asyncio
+    async def test_unknown_user_fails_alone(self):
+        """Test that a NOT_FOUND alias fails without affecting the batch."""
+        transport, _ = graphql_transport(missing=("ghost",))
+
+        results = await call_with_transport(
+            transport,
+            lambda: token_service().enrich_developer_profiles(["octocat", "ghost"]),
+        )
+
+        assert results["octocat"]["success"] is True
+        assert results["ghost"]["success"] is False
+        assert "ghost" in results["ghost"]["error"]
+
+    @pytest.mark.asyncio
+    async def test_without_token_falls_back_to_rest(self):
+        """Test that unauthenticated clients use the REST calls instead."""
+        transport, seen = github_transport()
+        service = GitHubService(http_cache=False)
+        service.token = None
+
+        results = await call_with_transport(
+            transport, lambda: service.enrich_developer_profiles(["a", "b"])
+        )
+
+        assert set(results) == {"a", "b"}
+        assert "/graphql" not in seen
+        assert len(seen) == 6
+
+
+class TestConditionalRequests:
+    """Test ETag revalidation through the conditional cache."""
+
+    @pytest.mark.asyncio
+    async def test_unchanged_response_is_revalidated(self, tmp_path):
+        """Test that a repeat request sends If-None-Match and reuses a 304."""
+        cache = ConditionalResponseCache(str(tmp_path / "http.db"))
+        transport, seen = etag_transport({"/orgs/acme": {"login": "acme"}})
+        service = GitHubService(http_cache=cache)
+
+        first = await call_with_transport(
+            transport, lambda: service._get_json("/orgs/acme")
+        )
+        second = await call_with_transport(
+            transport, lambda: service._get_json("/orgs/acme")
+        )
+
+        assert first == second == {"login": "acme"}
+        assert seen[0] is None
+        assert seen[1] is not None
+        assert cache.stats()["revalidated"] == 1
+
+    @pytest.mark.asyncio
+    async def test_changed_response_replaces_stored_body(self, tmp_path):
+        """Test that a 200 to a conditional request updates the store."""
+        cache = ConditionalResponseCache(str(tmp_path / "http.db"))
+        versions = {"/users/octocat": {"login": "octocat", "followers": 1}}
+        transport, _ = etag_transport(versions)
+        service = GitHubService(http_cache=cache)
+
+        await call_with_transport(
+            transport, lambda: service._get_json("/users/octocat")
+        )
+        versions["/users/octocat"] = {"login": "octocat", "followers": 2}
+        updated = await call_with_transport(
+            transport, lambda: service._get_json("/users/octocat")
+        )
+
+        assert updated["followers"] == 2
+        assert cache.get("https://api.github.com/users/octocat").json() == updated
+        assert cache.stats()["modified"] == 1
+
+    @pytest.mark.asyncio
+    async def test_store_survives_restart(self, tmp_path):
+        """Test that validators persist in the SQLite file."""
+        path = str(tmp_path / "http.db")
+        transport, seen = etag_transport({"/users/octocat": {"login": "octocat"}})
+
+        await call_with_transport(
+            transport,
+            lambda: GitHubService(ConditionalResponseCache(path))._get_json(
+                "/users/octocat"
+            ),
+        )
+        result = await call_with_transport(
+            transport,
+            lambda: GitHubService(ConditionalResponseCache(path))._get_json(
+                "/users/octocat"
+            ),
+        )
+
+        assert result == {"login": "octocat"}
+        assert seen[1] is not None
+
+    def test_cache_can_be_disabled_and_closed(self, tmp_path):
+        """Test http_cache=False and closing the service's cache."""
+        assert GitHubService(http_cache=False).http_cache is None
+
+        cache = ConditionalResponseCache(str(tmp_path / "http.db"))
+        cache.get("https://api.github.com/users/octocat")
+        GitHubService(http_cache=cache).close()
+
+        assert cache._conn is None
+
+    def test_responses_without_validators_are_not_stored(self, tmp_path):
+        """Test that only ETag/Last-Modified responses are kept."""
+        cache = ConditionalResponseCache(str(tmp_path / "http.db"))
+
+        cache.store("https://x/a", httpx.Response(200, json={"a": 1}))
+        cache.store(
+            "https://x/b",
+            httpx.Response(200, json={"b": 1}, headers={"Last-Modified": "Mon"}),
+        )
+
+        assert cache.get("https://x/a") is None
+        assert cache.get("https://x/b").conditional_headers() == {
+            "If-Modified-Since": "Mon"
+        }
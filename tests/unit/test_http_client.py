@@ -0,0 +1,73 @@
+"""Tests for the shared async HTTP client pool used by provider clients."""
+
+import httpx
+import pytest
+
+from services.http_client import HTTPClientPool, http_client_pool
+from services.third_party.hunter_io import HunterIOService
+
+
+class TestHTTPClientPool:
+    """Test shared client lifecycle management."""
+
+    @pytest.mark.asyncio
+    async def test_start_is_idempotent_and_close_releases_client(self):
+        """Test that start reuses the open client and close resets it."""
+        pool = HTTPClientPool()
+        client = pool.start()
+        assert pool.is_open
+        assert pool.start() is client
+
+        await pool.close()
+        assert not pool.is_open
+
+    @pytest.mark.asyncio
+    async def test_get_client_opens_lazily(self):
+        """Test that the client opens on first use outside the lifespan."""
+        pool = HTTPClientPool()
+        assert not pool.is_open
+        assert isinstance(pool.get_client(), httpx.AsyncClient)
+        await pool.close()
+
+
+class TestProviderClientsUseSharedPool:
+    """Test that provider clients route requests through the shared pool."""
+
+    @pytest.mark.asyncio
+    async def test_hunter_verify_email_uses_pool(self):
+        """Test Hunter.io verification through a mock transport."""
+        seen_urls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen_urls.append(str(request.url))
+            return httpx.Response(
+                200,
+                json={
+                    "data": {
+                        "result": "deliverable",
+                        "score": 91,
+                        "email": "jane@example.com",
+                        "regexp": True,
+                        "gibberish": False,
+                        "disposable": False,
+                        "webmail": False,
+                        "mx_records": True,
+                        "smtp_server": True,
+                        "smtp_check": True,
+                        "accept_all": False,
+                    }
+                },
+            )
+
+        await http_client_pool.close()
+        http_client_pool.start(transport=httpx.MockTransport(handler))
+        try:
+            service = HunterIOService()
+            service.api_key = "test-key"
+            result = await service.verify_email("jane@example.com")
+        finally:
+            await http_client_pool.close()
+
+        assert result["success"] is True
+        assert result["result"] == "deliverable"
+        assert seen_urls[0].startswith("https://api.hunter.io/v2/email-verifier")
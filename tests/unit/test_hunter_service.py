@@ -0,0 +1,270 @@
+"""Tests for Hunter.io domain-search email resolution over a mock transport."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from core.enrichment.quota import QuotaManager, QuotaPolicy
+from core.enrichment.result_cache import EnrichmentResultCache
+from services.http_client import http_client_pool
+from services.third_party.hunter_io import (
+    QUOTA_EXHAUSTED,
+    HunterIOService,
+    apply_email_pattern,
+)
+
+
+DOMAINS = {
+    "acme.com": {
+        "pattern": "{first}.{last}",
+        "organization": "Acme",
+        "emails": [
+            {
+                "value": "jane.roe@acme.com",
+                "first_name": "Jane",
+                "last_name": "Roe",
+                "confidence": 97,
+                "sources": [{"domain": "acme.com"}],
+                "verification": {"status": "valid"},
+            }
+        ],
+    },
+    "nopattern.io": {"pattern": None, "emails": []},
+}
+
+
+def hunter_transport():
+    """Mock Hunter API; records the endpoint of every request."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        endpoint = request.url.path.rsplit("/", 1)[-1]
+        params = request.url.params
+        calls.append(endpoint)
+        if endpoint == "domain-search":
+            return httpx.Response(200, json={"data": DOMAINS[params["domain"]]})
+        email = f"{params['first_name'][0]}{params['last_name']}@{params['domain']}"
+        return httpx.Response(
+            200,
+            json={
+                "data": {
+                    "email": email.lower(),
+                    "confidence": 80,
+                    "sources": [],
+                    "verification": {"result": "deliverable"},
+                }
+            },
+        )
+
+    return httpx.MockTransport(handler), calls
+
+
+async def call_with_transport(transport, call):
+    """Run ``call()`` with the shared pool routed through ``transport``."""
+    await http_client_pool.close()
+    http_client_pool.start(transport=transport)
+    try:
+        return await call()
+    finally:
+        await http_client_pool.close()
+
+
+def hunter_service(cache=None, quota: int = 1000) -> HunterIOService:
+    quotas = {"hunter": QuotaPolicy(quota)}
+    service = HunterIOService(
+        cache=cache, quota_manager=QuotaManager(":memory:", quotas)
+    )
+    service.api_key = "test-key"
+    return service
+
+
+def misses(count: int):
+    """Contacts at a domain with no pattern, so each needs the email finder."""
+    return [
+        {"first_name": f"Dev{i}", "last_name": "Ops", "domain": "nopattern.io"}
+        for i in range(count)
+    ]
+
+
+class TestHunterDomainSearch:
+    """Test resolving many contacts from one domain search."""
+
+    @pytest.mark.asyncio
+    async def test_one_search_resolves_a_whole_domain(self):
+        """Test known emails and the pattern cover every contact at a domain."""
+        transport, calls = hunter_transport()
+        contacts = [{"first_name": "Jane", "last_name": "Roe", "domain": "acme.com"}]
+        contacts += [
+            {"first_name": f"Dev{i}", "last_name": "Smith", "domain": "www.Acme.com"}
+            for i in range(199)
+        ]
+        contacts.append(
+            {"first_name": "José", "last_name": "Núñez", "domain": "acme.com"}
+        )
+        contacts.append(
+            {
+                "first_name": "Ann",
+                "last_name": "Lee",
+                "domain": "https://www.acme.com/team",
+            }
+        )
+
+        results = await call_with_transport(
+            transport, lambda: hunter_service().find_emails(contacts)
+        )
+
+        assert calls == ["domain-search"]
+        assert results[0]["email"] == "jane.roe@acme.com"
+        assert results[0]["source"] == "domain_search"
+        assert results[0]["confidence"] == 97
+        assert results[1]["email"] == "dev0.smith@acme.com"
+        assert results[1]["source"] == "pattern"
+        assert results[-2]["email"] == "jose.nunez@acme.com"
+        assert results[-1]["email"] == "ann.lee@acme.com"
+
+    @pytest.mark.asyncio
+    async def test_misses_fall_back_to_email_finder(self):
+        """Test that only unresolved contacts spend an email-finder call."""
+        transport, calls = hunter_transport()
+        contacts = [
+            {"first_name": "Jane", "last_name": "Roe", "domain": "acme.com"},
+            {"first_name": "Ann", "last_name": "Lee", "domain": "nopattern.io"},
+            {"first_name": "Bob", "last_name": "Kay", "domain": "nopattern.io"},
+        ]
+
+        results = await call_with_transport(
+            transport, lambda: hunter_service().find_emails(contacts)
+        )
+
+        assert sorted(calls) == ["domain-search"] * 2 + ["email-finder"] * 2
+        assert [r["source"] for r in results] == [
+            "domain_search",
+            "email_finder",
+            "email_finder",
+        ]
+        assert results[1]["email"] == "alee@nopattern.io"
+
+    @pytest.mark.asyncio
+    async def test_without_fallback_misses_fail(self):
+        """Test that fallback=False never calls the email finder."""
+        transport, calls = hunter_transport()
+        contacts = [{"first_name": "Ann", "last_name": "Lee", "domain": "nopattern.io"}]
+
+        results = await call_with_transport(
+            transport, lambda: hunter_service().find_emails(contacts, fallback=False)
+        )
+
+        assert calls == ["domain-search"]
+        assert results == [{"success": False, "error": "Email not found"}]
+
+    @pytest.mark.asyncio
+    async def test_domain_search_is_cached(self, tmp_path):
+        """Test that a cached domain search is reused across calls."""
+        transport, calls = hunter_transport()
+        cache = EnrichmentResultCache(str(tmp_path / "cache.db"))
+        contacts = [{"first_name": "Dev", "last_name": "Ops", "domain": "acme.com"}]
+
+        async def twice():
+            await hunter_service(cache).find_emails(contacts)
+            return await hunter_service(cache).find_emails(contacts)
+
+        results = await call_with_transport(transport, twice)
+
+        assert calls == ["domain-search"]
+        assert results[0]["email"] == "dev.ops@acme.com"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_domain_searches_share_a_request(self):
+        """Test that searches in flight for one domain are coalesced."""
+        transport, calls = hunter_transport()
+        service = hunter_service()
+
+        async def concurrently():
+            return await asyncio.gather(
+                service.search_domain("acme.com"),
+                service.search_domain("https://www.Acme.com/"),
+            )
+
+        first, second = await call_with_transport(transport, concurrently)
+
+        assert calls == ["domain-search"]
+        assert first == second
+        assert service.single_flight.stats() == {
+            "in_flight": 0,
+            "leaders": 1,
+            "followers": 1,
+        }
+
+
+class TestHunterQuota:
+    """Test that bulk lookups stay within the quota ledger."""
+
+    @pytest.mark.asyncio
+    async def test_fallbacks_stop_when_quota_is_exhausted(self):
+        """Test that the search and fallbacks spend no more than the quota."""
+        transport, calls = hunter_transport()
+        service = hunter_service(quota=3)
+
+        results = await call_with_transport(
+            transport, lambda: service.find_emails(misses(5))
+        )
+
+        assert calls == ["domain-search"] + ["email-finder"] * 2
+        assert sum(r["success"] for r in results) == 2
+        assert [r["error"] for r in results if not r["success"]] == [
+            QUOTA_EXHAUSTED
+        ] * 3
+        assert service.quota_manager.remaining("hunter") == 0
+
+    @pytest.mark.asyncio
+    async def test_exhausted_quota_skips_domain_search(self):
+        """Test that no request is made once the quota is used up."""
+        transport, calls = hunter_transport()
+        service = hunter_service(quota=0)
+
+        result = await call_with_transport(
+            transport, lambda: service.search_domain("acme.com")
+        )
+
+        assert calls == []
+        assert result == {"success": False, "error": QUOTA_EXHAUSTED}
+
+    @pytest.mark.asyncio
+    async def test_fallback_concurrency_is_capped(self):
+        """Test that misses do not all hit the email finder at once."""
+        active = 0
+        peak = 0
+        mock, calls = hunter_transport()
+
+        async def handler(request):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.005)
+            active -= 1
+            return mock.handler(request)
+
+        service = hunter_service()
+        service.fallback_concurrency = 3
+
+        results = await call_with_transport(
+            httpx.MockTransport(handler), lambda: service.find_emails(misses(12))
+        )
+
+        assert all(r["success"] for r in results)
+        assert calls == ["domain-search"] + ["email-finder"] * 12
+        assert peak == 3
+
+
+class TestEmailPattern:
+    """Test building addresses from Hunter patterns."""
+
+    def test_initials_and_missing_parts(self):
+        """Test initial placeholders and patterns needing absent names."""
+        assert apply_email_pattern("{f}{last}", "Jane", "Roe", "a.io") == "jroe@a.io"
+        assert (
+            apply_email_pattern("{first}_{l}", "Jane", "Roe", "a.io") == "jane_r@a.io"
+        )
+        assert apply_email_pattern("{first}.{last}", "Jane", "", "a.io") is None
+        assert apply_email_pattern("", "Jane", "Roe", "a.io") is None
@@ -0,0 +1,72 @@
+"""Tests for keyset (cursor) pagination on the list endpoints."""
+
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from database.utils.pagination import decode_cursor
+
+
+class TestKeysetPagination:
+    """Test cursor pagination alongside the legacy offset form."""
+
+    def test_offset_form_still_returns_list(self, client: TestClient):
+        """Test that omitting the cursor keeps the plain list response."""
+        response = client.get("/api/v1/products", params={"limit": 1})
+        assert response.status_code == 200
+        assert isinstance(response.json(), list)
+
+    def test_cursor_pages_do_not_overlap(self, client: TestClient):
+        """Test walking pages with next_cursor while rows are inserted."""
+        for _ in range(3):
+            unique_id = uuid.uuid4().hex[:8]
+            client.post(
+                "/api/v1/companies",
+                json={"name": f"Keyset {unique_id}", "domain": f"{unique_id}.io"},
+            )
+
+        first = client.get("/api/v1/companies", params={"cursor": "", "limit": 2})
+        assert first.status_code == 200
+        page = first.json()
+        assert len(page["items"]) == 2
+        assert page["next_cursor"] == first.headers["X-Next-Cursor"]
+
+        # A concurrent insert must not shift the next page
+        client.post(
+            "/api/v1/companies",
+            json={"name": "Late", "domain": f"{uuid.uuid4().hex[:8]}.io"},
+        )
+
+        second = client.get(
+            "/api/v1/companies",
+            params={"cursor": page["next_cursor"], "limit": 2},
+        ).json()
+        first_ids = [row["id"] for row in page["items"]]
+        second_ids = [row["id"] for row in second["items"]]
+        assert first_ids == sorted(first_ids)
+        assert min(second_ids) > max(first_ids)
+
+    def test_updated_at_ordering(self, client: TestClient):
+        """Test cursor pagination ordered by updated_at."""
+        response = client.get(
+            "/api/v1/contacts",
+            params={"cursor": "", "limit": 1, "order_by": "updated_at"},
+        )
+        assert response.status_code == 200
+        next_cursor = response.json()["next_cursor"]
+        if next_cursor:
+            assert decode_cursor(next_cursor)["o"] == "updated_at"
+
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {"cursor": "not-a-cursor"},
+            {"cursor": "", "order_by": "name"},
+            {"cursor": "", "limit": 0},
+        ],
+    )
+    def test_invalid_requests_return_400(self, client: TestClient, params):
+        """Test that malformed cursors and options are rejected."""
+        response = client.get("/api/v1/companies", params=params)
+        assert response.status_code == 400
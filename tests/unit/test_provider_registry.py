@@ -0,0 +1,142 @@
+"""Tests for the lazy enrichment provider registry."""
+
+import subprocess
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+import core.enrichment.providers as providers_module
+import core.enrichment.real_data_enrichment as engine_module
+from config import settings
+from core.enrichment.providers import ProviderRegistry, ProviderSpec
+
+
+FAKE_PROVIDER = """
+BUILT = []
+
+
+class FakeService:
+    def __init__(self, region="us"):
+        self.region = region
+        self.closed = False
+        BUILT.append(self)
+
+    def close(self):
+        self.closed = True
+"""
+
+
+@pytest.fixture
+def fake_provider(tmp_path, monkeypatch):
+    """An importable ``fake_provider`` module that records constructions."""
+    (tmp_path / "fake_provider.py").write_text(FAKE_PROVIDER)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "fake_provider", raising=False)
+    yield "fake_provider:FakeService"
+    sys.modules.pop("fake_provider", None)
+
+
+class TestProviderRegistry:
+    """Test lazy construction, requirements and discovery."""
+
+    def test_nothing_is_imported_until_first_use(self, fake_provider):
+        """Test that a provider module is imported and built on first lookup."""
+        registry = ProviderRegistry({"fake": ProviderSpec(fake_provider)}, {})
+
+        assert "fake_provider" not in sys.modules
+        assert registry.status() == {"fake": "not loaded"}
+
+        service = registry["fake"]
+
+        built = sys.modules["fake_provider"].BUILT
+        assert built == [service]
+        assert registry.get("fake") is service
+        assert registry.status() == {"fake": "ready"}
+
+    def test_missing_setting_disables_provider(self, fake_provider, monkeypatch):
+        """Test that an unset ``requires`` setting skips the import."""
+        monkeypatch.setattr(settings, "clearbit_api_key", None)
+        registry = ProviderRegistry(
+            {"fake": ProviderSpec(fake_provider, "clearbit_api_key")},
+            entry_points=False,
+        )
+
+        assert "fake" not in registry
+        assert "fake_provider" not in sys.modules
+        assert list(registry) == []
+        assert registry.status() == {
+            "fake": "unavailable: clearbit_api_key not set",
+        }
+
+    def test_register_passes_options(self, fake_provider):
+        """Test registering by import path with constructor options."""
+        registry = ProviderRegistry({}, entry_points=False)
+        registry.register("fake", fake_provider, region="eu")
+
+        assert registry["fake"].region == "eu"
+        assert dict(registry) == {"fake": registry["fake"]}
+
+    def test_close_closes_built_providers(self, fake_provider):
+        """Test that closing the registry closes and forgets built clients."""
+        registry = ProviderRegistry({"fake": ProviderSpec(fake_provider)}, {})
+        service = registry["fake"]
+
+        registry.close()
+
+        assert service.closed
+        assert registry.status() == {"fake": "not loaded"}
+
+    def test_broken_import_is_unavailable(self):
+        """Test that a provider that fails to import is skipped, not raised."""
+        registry = ProviderRegistry(
+            {"broken": ProviderSpec("no_such_module_xyz:Service")},
+            entry_points=False,
+        )
+
+        assert registry.get("broken") is None
+        with pytest.raises(KeyError):
+            registry["broken"]
+        assert registry.status()["broken"].startswith("unavailable:")
+
+    def test_entry_points_are_discovered(self, fake_provider, monkeypatch):
+        """Test that installed entry points are registered on first lookup."""
+        monkeypatch.setattr(
+            providers_module,
+            "provider_entry_points",
+            lambda: [SimpleNamespace(name="fake", value=fake_provider)],
+        )
+        registry = ProviderRegistry({})
+
+        assert registry["fake"].region == "us"
+
+
+class TestSharedEngine:
+    """Test that the shared engine is built on demand."""
+
+    def test_import_does_not_build_engine(self):
+        """Test that importing the engine module constructs no provider."""
+        code = (
+            "import sys, core.enrichment.real_data_enrichment as m; "
+            "print(m._shared_engine, 'services.third_party.github' in sys.modules)"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        ).stdout
+
+        assert output.strip() == "{} False"
+
+    def test_get_and_close_engine(self, monkeypatch):
+        """Test that the engine is created once and dropped on close."""
+        monkeypatch.setattr(engine_module, "_shared_engine", {})
+        monkeypatch.setattr(settings, "enrichment_cache_enabled", False)
+        monkeypatch.setattr(settings, "quota_ledger_path", ":memory:")
+
+        engine = engine_module.get_enrichment_engine()
+
+        assert engine_module.get_enrichment_engine() is engine
+        assert engine_module.real_enrichment_engine is engine
+        assert isinstance(engine.services, ProviderRegistry)
+
+        engine_module.close_enrichment_engine()
+        assert engine_module._shared_engine == {}
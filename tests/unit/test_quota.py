@@ -0,0 +1,96 @@
+"""Tests for the persistent provider quota ledger."""
+
+import threading
+from datetime import datetime, timezone
+
+from core.enrichment.quota import QuotaManager, QuotaPolicy
+
+
+class FakeClock:
+    """Manually advanced wall clock."""
+
+    def __init__(self, when: datetime):
+        self.now = when.timestamp()
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestQuotaLedger:
+    """Test atomic reservations, persistence and reset windows."""
+
+    def test_workers_never_overrun_shared_quota(self, tmp_path):
+        """Test that separate managers on one file grant exactly the limit."""
+        path = str(tmp_path / "quota.db")
+        quotas = {"hunter": QuotaPolicy(50)}
+        granted = []
+
+        def worker():
+            manager = QuotaManager(path, quotas)
+            granted.extend(
+                reservation
+                for reservation in (manager.reserve("hunter") for _ in range(20))
+                if reservation is not None
+            )
+            manager.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(granted) == 50
+        assert QuotaManager(path, quotas).used("hunter") == 50
+
+    def test_calendar_month_resets_at_boundary(self, tmp_path):
+        """Test that a monthly quota frees up on the first of the month."""
+        clock = FakeClock(datetime(2026, 1, 31, 23, 59, tzinfo=timezone.utc))
+        manager = QuotaManager(
+            str(tmp_path / "quota.db"), {"clearbit": QuotaPolicy(2)}, clock=clock
+        )
+
+        assert manager.reserve("clearbit", 2) is not None
+        assert manager.reserve("clearbit") is None
+        assert manager.usage()["clearbit"]["resets_at"].startswith("2026-02-01T00:00")
+
+        clock.now += 120
+        assert manager.used("clearbit") == 0
+        assert manager.reserve("clearbit") is not None
+
+    def test_rolling_window(self):
+        """Test that rolling credits free up as old calls age out."""
+        clock = FakeClock(datetime(2026, 3, 1, tzinfo=timezone.utc))
+        manager = QuotaManager(
+            ":memory:", {"github": QuotaPolicy(2, "rolling", 60)}, clock=clock
+        )
+
+        manager.reserve("github")
+        clock.now += 10
+        manager.reserve("github")
+        clock.now += 20
+        assert manager.reserve("github") is None
+
+        clock.now += 31  # the first call is now 61s old
+        assert manager.reserve("github") is not None
+
+    def test_batch_reservation_refunds_unused(self):
+        """Test that a job can hold credits up front and return the rest."""
+        manager = QuotaManager(":memory:", {"hunter": QuotaPolicy(10)})
+
+        with manager.reserve("hunter", 8) as reservation:
+            assert manager.reserve("hunter", 3) is None
+            assert reservation.take(3)
+            assert not reservation.take(6)
+
+        assert manager.used("hunter") == 3
+        assert manager.remaining("hunter") == 7
+
+    def test_default_quotas(self):
+        """Test GitHub's hourly quota and refusal of unknown providers."""
+        manager = QuotaManager(":memory:")
+
+        assert manager.can_make_request("github")
+        assert manager.reserve("github") is not None
+        assert manager.usage()["github"]["remaining"] == 4999
+        assert manager.reserve("unknown") is None
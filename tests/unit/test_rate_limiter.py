@@ -0,0 +1,121 @@
+"""Tests for provider token-bucket rate limiting."""
+
+import time
+
+import httpx
+import pytest
+
+from services.http_client import HTTPClientPool
+from services.rate_limiter import (
+    ProviderRateLimiter,
+    TokenBucket,
+    provider_rate_limiter,
+)
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTokenBucket:
+    """Test pacing and header-driven adjustments."""
+
+    def test_burst_then_paced_waits(self):
+        """Test that callers past the burst are queued at the refill rate."""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2.0, capacity=2, clock=clock)
+
+        waits = [bucket.reserve() for _ in range(5)]
+
+        assert waits == [0.0, 0.0, 0.5, 1.0, 1.5]
+        clock.now += 1.5
+        assert bucket.reserve() == pytest.approx(0.5)
+
+    def test_block_delays_everyone(self):
+        """Test that Retry-After style blocks push the next slot out."""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=10.0, capacity=10, clock=clock)
+
+        bucket.block(30)
+
+        assert bucket.reserve() == pytest.approx(30.1)
+
+    def test_update_paces_remaining_over_window(self):
+        """Test that remaining/reset caps tokens and slows the rate."""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=10.0, capacity=10, clock=clock)
+
+        bucket.update(remaining=2, reset_in=20)
+
+        assert bucket.rate == pytest.approx(0.1)
+        assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, pytest.approx(10)]
+
+        bucket.update(remaining=0, reset_in=60)
+        assert bucket.reserve() >= 60
+        assert bucket.rate == 10.0
+
+
+class TestProviderRateLimiter:
+    """Test bucket lookup and header parsing."""
+
+    def test_endpoint_classes_and_fallback(self):
+        """Test per-endpoint buckets, provider fallback and unlimited keys."""
+        limiter = ProviderRateLimiter({"github:search": (0.5, 5), "hunter": (15, 15)})
+
+        assert limiter.bucket("github:search").rate == 0.5
+        assert limiter.bucket("github:core") is None
+        assert limiter.bucket("hunter:search").rate == 15
+        assert limiter.bucket("github:search") is limiter.bucket("github:search")
+
+    def test_observe_github_headers(self):
+        """Test X-RateLimit-Remaining with an epoch X-RateLimit-Reset."""
+        limiter = ProviderRateLimiter({"github:core": (5000 / 3600, 20)})
+        reset = int(time.time()) + 100
+
+        limiter.observe(
+            "github:core",
+            200,
+            {"x-ratelimit-remaining": "10", "x-ratelimit-reset": str(reset)},
+        )
+
+        assert limiter.bucket("github:core").rate == pytest.approx(0.1, rel=0.05)
+
+    def test_observe_429_retry_after(self):
+        """Test that a 429 blocks the bucket for Retry-After seconds."""
+        limiter = ProviderRateLimiter({"clearbit": (10, 10)})
+
+        limiter.observe("clearbit", 429, {"retry-after": "7"})
+
+        assert limiter.bucket("clearbit").reserve() > 6.9
+
+
+class TestPoolRateLimiting:
+    """Test the shared HTTP pool waits on buckets and resends after 429."""
+
+    @pytest.mark.asyncio
+    async def test_throttled_request_is_resent(self, monkeypatch):
+        """Test a 429 with Retry-After is retried instead of surfacing."""
+        monkeypatch.setattr(provider_rate_limiter, "limits", {"surfe": (100, 100)})
+        provider_rate_limiter.reset()
+        statuses = iter([429, 200])
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            status = next(statuses)
+            headers = {"Retry-After": "0"} if status == 429 else {}
+            return httpx.Response(status, json={"ok": status}, headers=headers)
+
+        pool = HTTPClientPool()
+        pool.start(transport=httpx.MockTransport(handler))
+        try:
+            response = await pool.get("https://api.surfe.com/v2/x", rate_limit="surfe")
+        finally:
+            await pool.close()
+            provider_rate_limiter.reset()
+
+        assert response.status_code == 200
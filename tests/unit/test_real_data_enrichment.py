@@ -0,0 +1,480 @@
+"""Unit tests for the real data enrichment engine using fake provider clients."""
+
+import asyncio
+import time
+from functools import partial
+
+import pytest
+
+from core.enrichment.quota import QuotaManager, QuotaPolicy
+from core.enrichment.real_data_enrichment import (
+    RealDataEnrichmentEngine,
+    _EnrichmentBatch,
+)
+from core.enrichment.result_cache import EnrichmentResultCache, normalize_domain
+
+
+class FakeClearbitService:
+    """Clearbit stand-in that answers after a fixed delay."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = 0
+
+    async def enrich_person(self, email):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return {
+            "success": True,
+            "person": {
+                "full_name": "Jane Roe",
+                "linkedin": "in/janeroe",
+                "twitter": "janeroe",
+                "location": "Lisbon, PT",
+            },
+            "employment": {"title": "CTO", "name": "Acme"},
+            "company": {"domain": "acme.com", "category": {"industry": "Software"}},
+        }
+
+    async def enrich_company(self, domain):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return {
+            "success": True,
+            "company": {
+                "name": "Acme",
+                "industry": "Software",
+                "employees": 120,
+                "founded_year": 2011,
+                "location": {"city": "Lisbon"},
+            },
+        }
+
+
+class FakeHunterService:
+    """Hunter.io stand-in that answers after a fixed delay."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = 0
+
+    async def verify_email(self, email):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return {"success": True, "result": "deliverable", "score": 97}
+
+
+class FakeGitHubService:
+    """GitHub stand-in that answers after a fixed delay."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = 0
+
+    async def enrich_developer_profile(self, username):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return {
+            "success": True,
+            "profile": {"name": "Jane R.", "twitter_username": "jane_gh"},
+            "programming_languages": ["Python"],
+            "github_url": f"https://github.com/{username}",
+        }
+
+
+def make_engine(services, deadline=5.0, cache=None, quotas=None):
+    """Build an engine wired to fake services with an in-memory quota ledger."""
+    engine = RealDataEnrichmentEngine(
+        request_deadline=deadline,
+        quota_manager=QuotaManager(":memory:", quotas),
+        services=services,
+    )
+    engine.cache = cache
+    return engine
+
+
+PERSON = {
+    "first_name": "Jane",
+    "last_name": "Roe",
+    "email": "jane@acme.com",
+    "github_username": "janeroe",
+}
+
+
+class TestConcurrentProviderFanOut:
+    """Test concurrent dispatch and deterministic merge of provider lookups."""
+
+    @pytest.mark.asyncio
+    async def test_latency_tracks_slowest_provider(self):
+        """Test that providers run concurrently rather than back to back."""
+        engine = make_engine(
+            {
+                "clearbit": FakeClearbitService(delay=0.2),
+                "hunter": FakeHunterService(delay=0.2),
+                "github": FakeGitHubService(delay=0.2),
+            }
+        )
+
+        started = time.perf_counter()
+        result = await engine.enrich_person_real(PERSON)
+        elapsed = time.perf_counter() - started
+
+        assert elapsed < 0.5
+        assert result["data_sources"] == ["clearbit", "hunter", "github"]
+
+    @pytest.mark.asyncio
+    async def test_merge_precedence_is_independent_of_completion_order(self):
+        """Test that merge order stays Clearbit, Hunter.io, GitHub."""
+        engine = make_engine(
+            {
+                "clearbit": FakeClearbitService(delay=0.1),
+                "hunter": FakeHunterService(delay=0.05),
+                "github": FakeGitHubService(delay=0.0),
+            }
+        )
+
+        result = await engine.enrich_person_real(PERSON)
+
+        assert result["data_sources"] == ["clearbit", "hunter", "github"]
+        assert result["full_name"] == "Jane Roe"
+        assert result["professional"]["current_title"] == "CTO"
+        assert result["contact"]["email_verified"] is True
+        assert result["contact"]["twitter"] == "https://twitter.com/jane_gh"
+        assert result["skills"] == ["Python"]
+
+    @pytest.mark.asyncio
+    async def test_deadline_drops_slow_providers(self):
+        """Test that a provider missing the deadline is left out of the result."""
+        engine = make_engine(
+            {
+                "clearbit": FakeClearbitService(delay=1.0),
+                "hunter": FakeHunterService(delay=0.0),
+            },
+            deadline=0.1,
+        )
+
+        started = time.perf_counter()
+        result = await engine.enrich_person_real(PERSON)
+        elapsed = time.perf_counter() - started
+
+        assert elapsed < 0.5
+        assert result["data_sources"] == ["hunter"]
+        assert engine.quota_manager.used("clearbit") == 0
+        assert engine.quota_manager.used("hunter") == 1
+
+    @pytest.mark.asyncio
+    async def test_company_enrichment_uses_clearbit(self):
+        """Test company enrichment through the shared lookup path."""
+        engine = make_engine({"clearbit": FakeClearbitService()})
+
+        result = await engine.enrich_company_real({"domain": "acme.com"})
+
+        assert result["data_sources"] == ["clearbit"]
+        assert result["name"] == "Acme"
+        assert result["enrichment_score"] == 100
+
+
+class TestEnrichmentResultCache:
+    """Test the persistent provider response cache."""
+
+    def test_round_trip_survives_reopen(self, tmp_path):
+        """Test that entries persist in the SQLite file across instances."""
+        path = str(tmp_path / "cache.db")
+        cache = EnrichmentResultCache(path)
+        cache.set("clearbit", "person:jane@acme.com", {"success": True})
+        cache.close()
+
+        reopened = EnrichmentResultCache(path)
+        assert reopened.get("clearbit", "person:jane@acme.com") == {"success": True}
+        assert reopened.get("clearbit", "person:john@acme.com") is None
+        assert reopened.stats()["providers"]["clearbit"] == {"hits": 1, "misses": 1}
+
+    def test_expired_entries_are_misses(self, tmp_path):
+        """Test that a zero TTL provider is never cached."""
+        cache = EnrichmentResultCache(str(tmp_path / "cache.db"), ttls={"hunter": 0})
+        cache.set("hunter", "verify:jane@acme.com", {"success": True})
+        assert cache.get("hunter", "verify:jane@acme.com") is None
+
+    def test_prune_bounds_entry_count(self, tmp_path):
+        """Test that eviction keeps the cache within max_entries."""
+        cache = EnrichmentResultCache(str(tmp_path / "cache.db"), max_entries=3)
+        for i in range(5):
+            cache.set("github", f"user:dev{i}", {"success": True})
+        cache.prune()
+        assert cache.stats()["entries"] == 3
+
+    def test_normalize_domain(self):
+        """Test domain normalization for cache keys."""
+        assert normalize_domain(" https://WWW.Acme.com/about ") == "acme.com"
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_skips_provider_and_quota(self, tmp_path):
+        """Test that a repeat enrichment is served from cache without quota."""
+        clearbit = FakeClearbitService()
+        cache = EnrichmentResultCache(str(tmp_path / "cache.db"))
+        engine = make_engine({"clearbit": clearbit}, cache=cache)
+
+        first = await engine.enrich_person_real(PERSON)
+        second = await engine.enrich_person_real({**PERSON, "email": " JANE@acme.com "})
+
+        assert clearbit.calls == 1
+        assert engine.quota_manager.used("clearbit") == 1
+        assert second["professional"] == first["professional"]
+        assert second["data_sources"] == ["clearbit"]
+
+
+class TestBatchEnrichment:
+    """Test batch entry points with de-duplication and bounded concurrency."""
+
+    @pytest.mark.asyncio
+    async def test_people_batch_dedupes_lookups_and_matches_single_path(self):
+        """Test that duplicate emails cost one call and yield identical results."""
+        clearbit = FakeClearbitService(delay=0.01)
+        hunter = FakeHunterService(delay=0.01)
+        engine = make_engine({"clearbit": clearbit, "hunter": hunter})
+        people = [
+            {"first_name": "Jane", "last_name": "Roe", "email": "jane@acme.com"},
+            {"first_name": "Jane", "last_name": "Roe", "email": "JANE@acme.com"},
+            {"first_name": "John", "last_name": "Doe", "email": "john@acme.com"},
+        ]
+
+        results = {
+            index: enriched
+            async for index, enriched in engine.enrich_people_batch(people)
+        }
+
+        assert sorted(results) == [0, 1, 2]
+        assert clearbit.calls == 2
+        assert hunter.calls == 2
+        assert engine.quota_manager.used("clearbit") == 2
+
+        single = await make_engine(
+            {"clearbit": FakeClearbitService(), "hunter": FakeHunterService()}
+        ).enrich_person_real(people[2])
+        single.pop("enriched_at")
+        results[2].pop("enriched_at")
+        assert results[2] == single
+
+    @pytest.mark.asyncio
+    async def test_batch_respects_per_provider_concurrency(self):
+        """Test that no more than the configured calls run per provider."""
+        active = 0
+        peak = 0
+
+        class CountingHunter:
+            async def verify_email(self, email):
+                nonlocal active, peak
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+                return {"success": True, "result": "deliverable", "score": 90}
+
+        engine = make_engine(
+            {"hunter": CountingHunter()}, quotas={"hunter": QuotaPolicy(1000)}
+        )
+        people = [{"email": f"user{i}@acme.com"} for i in range(20)]
+
+        count = 0
+        async for _index, _enriched in engine.enrich_people_batch(
+            people, concurrency={"hunter": 3}
+        ):
+            count += 1
+
+        assert count == 20
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_batch_keeps_only_recent_resolutions(self):
+        """Test that the batch reuses recent lookups and drops older ones."""
+        batch = _EnrichmentBatch()
+        batch.max_lookups = 2
+        calls = []
+
+        async def start(key):
+            calls.append(key)
+            return key
+
+        for key in ["a", "b", "a", "c", "a", "b"]:
+            assert await batch.shared_lookup(key, partial(start, key)) == key
+
+        assert calls == ["a", "b", "c", "b"]
+        assert list(batch.lookups) == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_companies_batch(self):
+        """Test company batch enrichment with a duplicate domain."""
+        clearbit = FakeClearbitService()
+        engine = make_engine({"clearbit": clearbit})
+        companies = [{"domain": "acme.com"}, {"domain": "www.acme.com"}]
+
+        results = [
+            enriched
+            async for _index, enriched in engine.enrich_companies_batch(companies)
+        ]
+
+        assert clearbit.calls == 1
+        assert [r["name"] for r in results] == ["Acme", "Acme"]
+
+
+class TestSingleFlight:
+    """Test coalescing of identical concurrent lookups outside batches."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_company_lookups_share_one_call(self):
+        """Test that concurrent requests for one domain make one provider call."""
+        clearbit = FakeClearbitService(delay=0.05)
+        engine = make_engine({"clearbit": clearbit})
+
+        results = await asyncio.gather(
+            *(
+                engine.enrich_company_real({"domain": domain})
+                for domain in ["acme.com", "ACME.com", "www.acme.com", "acme.com"]
+            )
+        )
+
+        assert clearbit.calls == 1
+        assert engine.single_flight.stats() == {
+            "in_flight": 0,
+            "leaders": 1,
+            "followers": 3,
+        }
+        # Each caller gets its own copy of the shared result
+        results[0]["company_info"] = None
+        assert results[1]["name"] == "Acme"
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_shared_call(self):
+        """Test that one awaiter giving up leaves the call running for others."""
+        clearbit = FakeClearbitService(delay=0.05)
+        engine = make_engine({"clearbit": clearbit})
+
+        first = asyncio.ensure_future(engine.enrich_company_real({"domain": "a.io"}))
+        second = asyncio.ensure_future(engine.enrich_company_real({"domain": "a.io"}))
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        assert (await second)["name"] == "Acme"
+        assert clearbit.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_sequential_lookups_are_not_coalesced(self):
+        """Test that keys are forgotten once the call completes."""
+        clearbit = FakeClearbitService()
+        engine = make_engine({"clearbit": clearbit})
+
+        await engine.enrich_company_real({"domain": "acme.com"})
+        await engine.enrich_company_real({"domain": "acme.com"})
+
+        assert clearbit.calls == 2
+        assert len(engine.single_flight) == 0
+
+
+class TestEarlyTermination:
+    """Test skipping providers once a record is complete enough."""
+
+    @staticmethod
+    def fakes():
+        return {
+            "clearbit": FakeClearbitService(),
+            "hunter": FakeHunterService(),
+            "github": FakeGitHubService(),
+        }
+
+    @pytest.mark.asyncio
+    async def test_target_score_skips_remaining_providers(self):
+        """Test that cheap GitHub runs first and Hunter is never called."""
+        services = self.fakes()
+        engine = make_engine(services)
+
+        result = await engine.enrich_person_real(PERSON, target_score=100)
+
+        assert [s.calls for s in services.values()] == [1, 0, 1]
+        assert result["enrichment_score"] == 100
+        assert result["data_sources"] == ["clearbit", "github"]
+        assert result["skipped_providers"] == ["hunter"]
+        assert result["target_reached"] is True
+        assert engine.quota_manager.used("hunter") == 0
+
+    @pytest.mark.asyncio
+    async def test_providers_ordered_by_yield_per_cost(self):
+        """Test that with equal costs the highest-yield provider runs first."""
+        services = self.fakes()
+        engine = make_engine(services)
+        engine.lookup_costs = {}
+
+        result = await engine.enrich_person_real(PERSON, target_score=100)
+
+        assert [s.calls for s in services.values()] == [1, 0, 0]
+        assert result["skipped_providers"] == ["github", "hunter"]
+        assert engine.provider_yields == {("person", "clearbit"): (67, 1)}
+
+    @pytest.mark.asyncio
+    async def test_observed_yield_reorders_providers(self):
+        """Test that observed gains override the estimate from the mappings."""
+        services = self.fakes()
+        engine = make_engine(services)
+        engine.lookup_costs = {}
+        engine.provider_yields[("person", "clearbit")] = (0.0, 5)
+        engine.provider_yields[("person", "hunter")] = (50.0, 1)
+
+        result = await engine.enrich_person_real(
+            PERSON, required_fields=["contact.email_verified"]
+        )
+
+        assert [s.calls for s in services.values()] == [0, 1, 0]
+        assert result["skipped_providers"] == ["github", "clearbit"]
+
+    @pytest.mark.asyncio
+    async def test_providers_share_one_deadline(self):
+        """Test that sequential lookups stop once the request deadline is spent."""
+        services = {
+            "clearbit": FakeClearbitService(delay=0.15),
+            "hunter": FakeHunterService(delay=0.15),
+            "github": FakeGitHubService(delay=0.15),
+        }
+        engine = make_engine(services, deadline=0.2)
+
+        started = time.perf_counter()
+        result = await engine.enrich_person_real(
+            PERSON, required_fields=["professional.never_filled"]
+        )
+        elapsed = time.perf_counter() - started
+
+        assert elapsed < 0.35  # not one deadline per provider
+        assert [s.calls for s in services.values()] == [1, 0, 1]
+        assert result["data_sources"] == ["github"]
+        assert result["timed_out_providers"] == ["hunter"]
+        assert "skipped_providers" not in result
+        assert "target_reached" not in result
+        assert engine.quota_manager.used("clearbit") == 0
+
+    @pytest.mark.asyncio
+    async def test_deadline_without_data_falls_back_to_mock(self):
+        """Test that running out of time is never reported as target reached."""
+        services = {
+            "clearbit": FakeClearbitService(delay=0.3),
+            "hunter": FakeHunterService(delay=0.3),
+        }
+        engine = make_engine(services, deadline=0.2)
+
+        result = await engine.enrich_person_real(PERSON, target_score=100)
+
+        assert [s.calls for s in services.values()] == [1, 0]
+        assert result["data_sources"] == ["mock_enhanced"]
+        assert "skipped_providers" not in result
+        assert "target_reached" not in result
+
+    @pytest.mark.asyncio
+    async def test_required_fields_already_present(self):
+        """Test that a complete input record makes no provider calls."""
+        services = self.fakes()
+        engine = make_engine(services)
+
+        result = await engine.enrich_person_real(PERSON, required_fields=["email"])
+
+        assert [s.calls for s in services.values()] == [0, 0, 0]
+        assert result["data_sources"] == []
+        assert result["target_reached"] is True
+        assert result["email"] == "jane@acme.com"
+        assert "note" not in result
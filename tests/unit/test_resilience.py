@@ -0,0 +1,195 @@
+"""Tests for provider retries, retry budgets and circuit breakers."""
+
+import httpx
+import pytest
+
+from services.http_client import HTTPClientPool
+from services.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    ProviderResilience,
+    RetryBudget,
+    provider_resilience,
+)
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def scripted_send(outcomes):
+    """Build a send() that replays status codes or raises exceptions."""
+    calls = []
+
+    async def send():
+        outcome = outcomes[len(calls)]
+        calls.append(outcome)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return httpx.Response(outcome)
+
+    return send, calls
+
+
+@pytest.fixture
+def resilience():
+    """Resilience policy without backoff delays."""
+    return ProviderResilience(max_attempts=3, base_delay=0, max_delay=0)
+
+
+class TestRetries:
+    """Test bounded retries on transient failures."""
+
+    @pytest.mark.asyncio
+    async def test_retries_transient_failures(self, resilience):
+        """Test that timeouts and 5xx are retried until success."""
+        send, calls = scripted_send([httpx.ReadTimeout("slow"), 503, 200])
+
+        response = await resilience.call("clearbit", send)
+
+        assert response.status_code == 200
+        assert len(calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_client_errors_are_not_retried(self, resilience):
+        """Test that 4xx responses are returned immediately."""
+        send, calls = scripted_send([404])
+
+        response = await resilience.call("clearbit", send)
+
+        assert response.status_code == 404
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_attempts(self, resilience):
+        """Test that the last transport error is re-raised."""
+        send, calls = scripted_send([httpx.ConnectError("down")] * 3)
+
+        with pytest.raises(httpx.ConnectError):
+            await resilience.call("clearbit", send)
+        assert len(calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_retry_budget_limits_retries(self):
+        """Test that an exhausted budget stops retrying."""
+        resilience = ProviderResilience(
+            max_attempts=3,
+            base_delay=0,
+            budget_factory=lambda: RetryBudget(ratio=0.0, minimum=1),
+        )
+        send, calls = scripted_send([503, 503, 503, 503, 503])
+
+        assert (await resilience.call("hunter", send)).status_code == 503
+        assert len(calls) == 2  # one retry from the budget
+        assert (await resilience.call("hunter", send)).status_code == 503
+        assert len(calls) == 3  # budget exhausted: no retry
+
+
+class TestCircuitBreaker:
+    """Test breaker state transitions."""
+
+    def test_opens_then_half_opens_then_closes(self):
+        """Test open -> half-open trial -> closed."""
+        clock = FakeClock()
+        breaker = CircuitBreaker(min_calls=4, reset_timeout=30, clock=clock)
+        for _ in range(4):
+            breaker.before_call()
+            breaker.record_failure()
+
+        assert breaker.state == "open"
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+
+        clock.now += 30
+        breaker.before_call()  # trial call
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()  # only one trial at a time
+        breaker.record_success()
+        assert breaker.state == "closed"
+
+    def test_failed_trial_reopens(self):
+        """Test that a failed half-open trial keeps the circuit open."""
+        clock = FakeClock()
+        breaker = CircuitBreaker(min_calls=1, reset_timeout=10, clock=clock)
+        breaker.record_failure()
+        clock.now += 10
+
+        breaker.before_call()
+        breaker.record_failure()
+
+        assert breaker.state == "open"
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_fails_fast(self):
+        """Test that calls short-circuit without reaching the provider."""
+        resilience = ProviderResilience(
+            max_attempts=1,
+            breaker_factory=lambda: CircuitBreaker(min_calls=2),
+        )
+        send, calls = scripted_send([503, 503, 200])
+        await resilience.call("clearbit", send)
+        await resilience.call("clearbit", send)
+
+        with pytest.raises(CircuitOpenError):
+            await resilience.call("clearbit", send)
+        assert len(calls) == 2
+
+
+class TestPoolResilience:
+    """Test the shared HTTP pool applies the policy to provider calls."""
+
+    @pytest.mark.asyncio
+    async def test_pool_retries_provider_5xx(self, monkeypatch):
+        """Test a 502 from a provider is retried through the pool."""
+        monkeypatch.setattr(provider_resilience, "base_delay", 0)
+        provider_resilience.reset()
+        statuses = iter([502, 200])
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(next(statuses))
+
+        pool = HTTPClientPool()
+        pool.start(transport=httpx.MockTransport(handler))
+        try:
+            response = await pool.get("https://api.wiza.co/x", rate_limit="wiza")
+        finally:
+            await pool.close()
+            provider_resilience.reset()
+
+        assert response.status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_pool_does_not_retry_post(self, monkeypatch):
+        """Test a timed-out POST reaches the provider once unless marked safe."""
+        monkeypatch.setattr(provider_resilience, "base_delay", 0)
+        provider_resilience.reset()
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.method)
+            raise httpx.ReadTimeout("timed out", request=request)
+
+        pool = HTTPClientPool()
+        pool.start(transport=httpx.MockTransport(handler))
+        try:
+            with pytest.raises(httpx.ReadTimeout):
+                await pool.post("https://api.wiza.co/api/v1/lists", rate_limit="wiza")
+            assert calls == ["POST"]
+
+            with pytest.raises(httpx.ReadTimeout):
+                await pool.post(
+                    "https://api.surfe.com/v1/people/search",
+                    rate_limit="surfe",
+                    retry=True,
+                )
+        finally:
+            await pool.close()
+            provider_resilience.reset()
+
+        assert calls == ["POST"] * (1 + provider_resilience.max_attempts)
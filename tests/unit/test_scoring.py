@@ -0,0 +1,102 @@
+"""Tests for compiled enrichment scoring and table rescoring."""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from core.enrichment.scoring import (
+    COMPANY_SCORER,
+    PERSON_SCORER,
+    EnrichmentScorer,
+    rescore_table,
+)
+from database.connection import Base
+from database.models import Company
+
+
+PERSON = {
+    "full_name": "Jane Roe",
+    "email": "jane@acme.com",
+    "professional": {"current_title": "CTO", "current_company": ""},
+    "contact": {"linkedin": None},
+    "location": {"city": "Lisbon"},
+}
+
+
+@pytest.fixture
+def bind():
+    """In-memory engine with companies in various scoring states."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as db:
+        for i in range(5):
+            db.add(
+                Company(
+                    name=f"Co{i}",
+                    domain=f"co{i}.com",
+                    enrichment_data={
+                        "name": f"Co{i}",
+                        "domain": f"co{i}.com",
+                        "industry": "Software" if i % 2 else None,
+                        "enrichment_score": 50,
+                    },
+                )
+            )
+        db.add(Company(name="Raw", domain="raw.com", enrichment_data={"a": 1}))
+        db.add(Company(name="Empty", domain="empty.com"))
+        db.commit()
+    return engine
+
+
+class TestEnrichmentScorer:
+    """Test weighted completeness scores."""
+
+    def test_default_person_score(self):
+        """Test the percentage of filled fields, walking nested paths."""
+        assert PERSON_SCORER.score(PERSON) == 66
+        assert PERSON_SCORER.filled(PERSON)["professional.current_company"] is False
+        assert PERSON_SCORER.score({"professional": "not a dict"}) == 0
+
+    def test_weights(self):
+        """Test that heavier fields count for more."""
+        scorer = EnrichmentScorer({"email": 3, "location": 1})
+
+        assert scorer.score({"email": "a@b.c"}) == 75
+        assert scorer.score({"location": "Lisbon"}) == 25
+        assert scorer.potential(["location.city", "contact.email"]) == 25
+
+    def test_invalid_weights(self):
+        """Test that empty, negative or all-zero weights are rejected."""
+        for weights in ({}, {"email": -1}, {"email": 0}):
+            with pytest.raises(ValueError):
+                EnrichmentScorer(weights)
+
+    def test_score_batch(self):
+        """Test batch scores match single scores, with gaps scoring 0."""
+        records = [PERSON, None, {"name": "Acme", "domain": "acme.com"}]
+
+        assert PERSON_SCORER.score_batch(records) == [66, 0, 0]
+        assert COMPANY_SCORER.score_batch(records[2:]) == [33]
+
+
+class TestRescoreTable:
+    """Test rescoring stored enrichment data."""
+
+    def test_rescore_updates_changed_rows(self, bind):
+        """Test that only previously scored rows with new scores are written."""
+        scorer = EnrichmentScorer({"name": 1, "domain": 1, "industry": 2})
+
+        assert rescore_table(bind, Company, scorer, batch_size=2) == 2
+        assert rescore_table(bind, Company, scorer, batch_size=2) == 0
+
+        with sessionmaker(bind=bind)() as db:
+            data = {c.name: c.enrichment_data for c in db.query(Company)}
+        assert data["Co0"]["enrichment_score"] == 50
+        assert data["Co1"]["enrichment_score"] == 100
+        assert data["Co1"]["industry"] == "Software"
+        assert data["Raw"] == {"a": 1}
@@ -0,0 +1,46 @@
+"""Tests for the shared local SQLite store scaffolding."""
+
+from database.utils.sqlite_store import SQLiteStore
+
+
+class CounterStore(SQLiteStore):
+    schema = ("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY)",)
+    prune_interval = 3
+
+
+class TestSQLiteStore:
+    """Test lazy connection, the memory LRU and prune scheduling."""
+
+    def test_connects_lazily_and_reopens_after_close(self, tmp_path):
+        """Test that the file and schema appear on first use only."""
+        path = tmp_path / "store.db"
+        store = CounterStore(str(path))
+        assert not path.exists()
+
+        with store._lock:
+            conn = store._connect()
+            (mode,) = conn.execute("PRAGMA journal_mode").fetchone()
+            conn.execute("INSERT INTO counters VALUES ('a')")
+            conn.commit()
+        assert mode == "wal"
+
+        store.close()
+        assert store._conn is None
+        with store._lock:
+            (count,) = (
+                store._connect().execute("SELECT COUNT(*) FROM counters").fetchone()
+            )
+        assert count == 1
+        store.close()
+
+    def test_memory_lru_and_prune_interval(self):
+        """Test LRU eviction order and that a sweep is due every N writes."""
+        store = CounterStore(":memory:", memory_entries=2)
+        store._remember("a", 1)
+        store._remember("b", 2)
+        assert store._recall("a") == 1
+        store._remember("c", 3)
+
+        assert store._recall("b") is None
+        assert list(store._memory) == ["a", "c"]
+        assert [store._note_write() for _ in range(6)] == [False, False, True] * 2
@@ -0,0 +1,277 @@
+"""Tests for Surfe bulk enrichment and search pagination over a mock transport."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from services.http_client import http_client_pool
+from services.rate_limiter import provider_rate_limiter
+from services.third_party.surfe import SurfeService
+
+
+@pytest.fixture(autouse=True)
+def unthrottled_surfe(monkeypatch):
+    """Lift the Surfe rate limit so pacing does not skew timings."""
+    monkeypatch.setattr(provider_rate_limiter, "limits", {"surfe": (1000, 1000)})
+    provider_rate_limiter.reset()
+    yield
+    provider_rate_limiter.reset()
+
+
+def surfe_transport(
+    *, polls: int = 1, fail_chunk: int = -1, sync: bool = False, delay: float = 0.0
+):
+    """Mock Surfe enrich API.
+
+    Enrichment requests return an ``enrichmentID`` that reports
+    ``IN_PROGRESS`` for ``polls`` polls, then the records in reverse order
+    (so results must be matched by externalID). The chunk numbered
+    ``fail_chunk`` is rejected.
+    """
+    state = {"chunks": [], "jobs": {}, "in_flight": 0, "max_in_flight": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if request.method == "POST":
+            kind = path.split("/")[2]
+            records = json.loads(request.content)[kind]
+            number = len(state["chunks"])
+            state["chunks"].append(records)
+            state["in_flight"] += 1
+            state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+            await asyncio.sleep(delay)
+            if number == fail_chunk:
+                state["in_flight"] -= 1
+                return httpx.Response(400, json={"message": "Bad request"})
+            enriched = [
+                {
+                    **record,
+                    "email": f"{record.get('firstName', 'info').lower()}@acme.com",
+                }
+                for record in reversed(records)
+            ]
+            if sync:
+                state["in_flight"] -= 1
+                return httpx.Response(200, json={kind: enriched})
+            job_id = f"job-{number}"
+            state["jobs"][job_id] = {"kind": kind, "polls": 0, kind: enriched}
+            return httpx.Response(200, json={"enrichmentID": job_id})
+
+        job = state["jobs"][path.rsplit("/", 1)[-1]]
+        job["polls"] += 1
+        if job["polls"] <= polls:
+            return httpx.Response(200, json={"status": "IN_PROGRESS"})
+        state["in_flight"] -= 1
+        kind = job["kind"]
+        return httpx.Response(
+            200,
+            json={
+                "status": "COMPLETED",
+                kind: job[kind],
+                "credits_used": {"email": len(job[kind])},
+                "credits_remaining": {"email": 100},
+            },
+        )
+
+    return httpx.MockTransport(handler), state
+
+
+def search_transport(total: int, events: list):
+    """Mock Surfe search API over ``total`` people, logging each request."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        offset, limit = body["offset"], body["limit"]
+        events.append(("request", offset, limit))
+        if body["filters"].get("invalid"):
+            return httpx.Response(400, json={"message": "Bad filters"})
+        page = [{"id": i} for i in range(offset, min(offset + limit, total))]
+        return httpx.Response(200, json={"people": page, "total_count": total})
+
+    return httpx.MockTransport(handler)
+
+
+async def call_with_transport(transport, call):
+    """Run ``call()`` with the shared pool routed through ``transport``."""
+    await http_client_pool.close()
+    http_client_pool.start(transport=transport)
+    try:
+        return await call()
+    finally:
+        await http_client_pool.close()
+
+
+def surfe_service(chunk_size: int = 3, concurrency: int = 2) -> SurfeService:
+    """Surfe client with small chunks and no polling delay."""
+    service = SurfeService(api_key="test-key")
+    service.bulk_chunk_size = chunk_size
+    service.bulk_concurrency = concurrency
+    service.poll_interval = 0
+    return service
+
+
+def people(count: int):
+    return [{"firstName": f"P{i}", "companyDomain": "acme.com"} for i in range(count)]
+
+
+class TestSurfeBulkEnrichment:
+    """Test chunking, polling and in-order streaming."""
+
+    @pytest.mark.asyncio
+    async def test_results_stream_in_input_order(self):
+        """Test that polled chunks are merged back in input order."""
+        transport, state = surfe_transport(polls=2)
+        service = surfe_service()
+
+        async def collect():
+            return [r async for r in service.enrich_people_bulk(people(10))]
+
+        results = await call_with_transport(transport, collect)
+
+        assert [len(chunk) for chunk in state["chunks"]] == [3, 3, 3, 1]
+        assert [r["index"] for r in results] == list(range(10))
+        assert all(r["success"] for r in results)
+        assert results[7]["person"]["firstName"] == "P7"
+        assert results[7]["person"]["email"] == "p7@acme.com"
+        assert "externalID" not in results[7]["person"]
+
+    @pytest.mark.asyncio
+    async def test_caller_external_ids_do_not_collide(self):
+        """Test that a caller's externalID cannot steal another row's result."""
+        transport, state = surfe_transport(sync=True)
+        service = surfe_service(chunk_size=4)
+        records = people(4)
+        records[0]["externalID"] = "3"
+
+        async def collect():
+            return [r async for r in service.enrich_people_bulk(records)]
+
+        results = await call_with_transport(transport, collect)
+
+        sent = [record["externalID"] for record in state["chunks"][0]]
+        assert len(set(sent)) == 4
+        assert [r["person"]["firstName"] for r in results] == ["P0", "P1", "P2", "P3"]
+        assert results[0]["person"]["externalID"] == "3"
+        assert "externalID" not in results[3]["person"]
+
+    @pytest.mark.asyncio
+    async def test_submissions_are_bounded(self):
+        """Test that at most ``concurrency`` chunks are in flight."""
+        transport, state = surfe_transport(delay=0.02)
+        service = surfe_service(chunk_size=2, concurrency=2)
+
+        result = await call_with_transport(
+            transport, lambda: service.enrich_people(people(12))
+        )
+
+        assert result["success"] is True
+        assert len(result["people"]) == 12
+        assert state["max_in_flight"] == 2
+        assert result["credits_used"] == {"email": 12}
+        assert result["credits_remaining"] == {"email": 100}
+
+    @pytest.mark.asyncio
+    async def test_failed_chunk_fails_only_its_records(self):
+        """Test that a rejected chunk does not sink the rest of the list."""
+        transport, _ = surfe_transport(fail_chunk=1)
+        service = surfe_service(concurrency=1)
+
+        result = await call_with_transport(
+            transport, lambda: service.enrich_people(people(7))
+        )
+
+        assert result["success"] is True
+        assert result["failed"] == 3
+        assert [p["firstName"] for p in result["people"]] == ["P0", "P1", "P2", "P6"]
+
+    @pytest.mark.asyncio
+    async def test_synchronous_company_enrichment(self):
+        """Test that inline responses are used without polling."""
+        transport, state = surfe_transport(sync=True)
+        service = surfe_service()
+        companies = [{"domain": f"acme{i}.com"} for i in range(4)]
+
+        result = await call_with_transport(
+            transport, lambda: service.enrich_companies(companies)
+        )
+
+        assert [c["domain"] for c in result["companies"]] == [
+            c["domain"] for c in companies
+        ]
+        assert state["jobs"] == {}
+
+    @pytest.mark.asyncio
+    async def test_polling_times_out(self):
+        """Test that a job that never completes fails its records."""
+        transport, _ = surfe_transport(polls=1000)
+        service = surfe_service()
+        service.bulk_timeout = 0
+
+        result = await call_with_transport(
+            transport, lambda: service.enrich_people(people(2))
+        )
+
+        assert result["success"] is False
+        assert "did not complete" in result["error"]
+
+
+class TestSurfeSearchIterators:
+    """Test paginated search streaming with prefetch."""
+
+    @pytest.mark.asyncio
+    async def test_walks_all_pages(self):
+        """Test that every page is fetched and items arrive in order."""
+        events = []
+        service = SurfeService(api_key="test-key")
+
+        async def collect():
+            return [p["id"] async for p in service.iter_people({}, page_size=100)]
+
+        ids = await call_with_transport(search_transport(250, events), collect)
+
+        assert ids == list(range(250))
+        assert [e[1:] for e in events] == [(0, 100), (100, 100), (200, 100)]
+
+    @pytest.mark.asyncio
+    async def test_stops_at_max_results(self):
+        """Test that the last page is trimmed to the caller's maximum."""
+        events = []
+        service = SurfeService(api_key="test-key")
+
+        async def collect():
+            return [
+                p async for p in service.iter_people({}, page_size=100, max_results=150)
+            ]
+
+        people = await call_with_transport(search_transport(1000, events), collect)
+
+        assert len(people) == 150
+        assert [e[1:] for e in events] == [(0, 100), (100, 50)]
+
+    @pytest.mark.asyncio
+    async def test_next_page_is_prefetched(self):
+        """Test that page two is requested while page one is consumed."""
+        events = []
+        service = SurfeService(api_key="test-key")
+
+        async def consume():
+            async for person in service.iter_people({}, page_size=10):
+                await asyncio.sleep(0.001)
+                events.append(("consumed", person["id"]))
+
+        await call_with_transport(search_transport(20, events), consume)
+
+        assert events.index(("request", 10, 10)) < events.index(("consumed", 9))
+
+    @pytest.mark.asyncio
+    async def test_errors_are_raised(self):
+        """Test that a failed page surfaces to the consumer."""
+        service = SurfeService(api_key="test-key")
+
+        async def collect():
+            return [p async for p in service.iter_companies({"invalid": True})]
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await call_with_transport(search_transport(10, []), collect)
@@ -0,0 +1,245 @@
+"""Tests for Wiza bulk list enrichment against a fake Wiza server."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+import services.third_party.wiza as wiza_module
+from services.http_client import http_client_pool
+from services.rate_limiter import provider_rate_limiter
+from services.third_party.wiza import WizaService
+
+
+@pytest.fixture(autouse=True)
+def unthrottled_wiza(monkeypatch):
+    """Lift the Wiza rate limit so pacing does not slow the tests."""
+    monkeypatch.setattr(provider_rate_limiter, "limits", {"wiza": (1000, 1000)})
+    provider_rate_limiter.reset()
+    yield
+    provider_rate_limiter.reset()
+
+
+class FakeWiza:
+    """In-memory Wiza list API.
+
+    Each status poll finishes ``per_poll`` more contacts (after
+    ``idle_polls`` polls with no progress) and spends one credit per
+    finished contact. URLs containing ``private`` finish as failed, and
+    contacts report their URL as rewritten by ``echo``.
+    """
+
+    def __init__(
+        self, credits: int = 100, per_poll: int = 2, idle_polls: int = 0, echo=None
+    ):
+        self.credits = credits
+        self.per_poll = per_poll
+        self.idle_polls = idle_polls
+        self.echo = echo or (lambda url: url)
+        self.lists = []
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handle)
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        parts = request.url.path.split("/")[3:]  # after /api/v1
+        if parts == ["credits"]:
+            return httpx.Response(200, json={"credits": self.credits})
+        if parts == ["lists"]:
+            items = json.loads(request.content)["list"]["items"]
+            self.lists.append(
+                {"urls": [i["profile_url"] for i in items], "done": 0, "polls": 0}
+            )
+            return self.reply({"id": len(self.lists) - 1, "status": "queued"})
+
+        job = self.lists[int(parts[1])]
+        if len(parts) == 2:
+            job["polls"] += 1
+            if job["polls"] > self.idle_polls:
+                finished = min(self.per_poll, len(job["urls"]) - job["done"])
+                job["done"] += finished
+                self.credits -= finished
+            status = "finished" if job["done"] == len(job["urls"]) else "processing"
+            return self.reply({"status": status})
+
+        offset = int(request.url.params["offset"])
+        limit = int(request.url.params["limit"])
+        contacts = [
+            {
+                "profile_url": self.echo(url),
+                "full_name": url.rsplit("/", 1)[-1].title(),
+                "status": "failed" if "private" in url else "finished",
+            }
+            for url in job["urls"][offset : min(job["done"], offset + limit)]
+        ]
+        return self.reply({"contacts": contacts})
+
+    def reply(self, body: dict) -> httpx.Response:
+        return httpx.Response(200, json={**body, "credits_remaining": self.credits})
+
+
+async def call_with_transport(transport, call):
+    """Run ``call()`` with the shared pool routed through ``transport``."""
+    await http_client_pool.close()
+    http_client_pool.start(transport=transport)
+    try:
+        return await call()
+    finally:
+        await http_client_pool.close()
+
+
+def wiza_service(list_max_size: int = 1000) -> WizaService:
+    """Wiza client with near-instant polling."""
+    service = WizaService(api_key="test-key")
+    service.list_max_size = list_max_size
+    service.poll_interval = 0.001
+    service.max_poll_interval = 0.008
+    return service
+
+
+def urls(count: int, prefix: str = "dev"):
+    return [f"https://linkedin.com/in/{prefix}{i}" for i in range(count)]
+
+
+class TestWizaBulkLists:
+    """Test list submission, polling and streaming."""
+
+    @pytest.mark.asyncio
+    async def test_profiles_stream_as_they_finish(self):
+        """Test that profiles are yielded before the whole list finishes."""
+        wiza = FakeWiza(per_poll=2)
+        service = wiza_service()
+
+        async def collect():
+            return [
+                (result, wiza.lists[0]["done"])
+                async for result in service.enrich_linkedin_profiles(urls(5))
+            ]
+
+        seen = await call_with_transport(wiza.transport(), collect)
+
+        assert len(wiza.lists) == 1
+        assert [r["linkedin_url"] for r, _ in seen] == urls(5)
+        assert all(r["success"] for r, _ in seen)
+        assert seen[0][0]["profile"]["full_name"] == "Dev0"
+        assert seen[0][1] < 5  # first profile arrived mid-list
+        assert service.credits_remaining == 95
+
+    @pytest.mark.asyncio
+    async def test_large_inputs_use_several_lists(self):
+        """Test that URLs beyond the list size go into further lists."""
+        wiza = FakeWiza(per_poll=10)
+        service = wiza_service(list_max_size=4)
+
+        async def collect():
+            return [r async for r in service.enrich_linkedin_profiles(urls(10))]
+
+        results = await call_with_transport(wiza.transport(), collect)
+
+        assert [len(job["urls"]) for job in wiza.lists] == [4, 4, 2]
+        assert len(results) == 10
+
+    @pytest.mark.asyncio
+    async def test_stops_before_running_out_of_credits(self):
+        """Test that only affordable profiles are submitted."""
+        wiza = FakeWiza(credits=3, per_poll=10)
+        service = wiza_service()
+
+        async def collect():
+            return [r async for r in service.enrich_linkedin_profiles(urls(5))]
+
+        results = await call_with_transport(wiza.transport(), collect)
+
+        assert wiza.lists[0]["urls"] == urls(3)
+        assert [r["success"] for r in results] == [False, False, True, True, True]
+        assert results[0]["error"] == "Insufficient Wiza credits"
+
+    @pytest.mark.asyncio
+    async def test_credits_are_refreshed_and_held_per_list(self):
+        """Test a stale balance is refreshed and concurrent lists share it."""
+        wiza = FakeWiza(credits=5, per_poll=1)
+        service = wiza_service()
+        service.credits_remaining = 100  # stale
+
+        async def collect(prefix):
+            return [r async for r in service.enrich_linkedin_profiles(urls(3, prefix))]
+
+        async def both():
+            return await asyncio.gather(collect("a"), collect("b"))
+
+        first, second = await call_with_transport(wiza.transport(), both)
+
+        assert sorted(len(job["urls"]) for job in wiza.lists) == [2, 3]
+        assert sum(r["success"] for r in first + second) == 5
+        assert wiza.credits == 0
+        assert service._credits_in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_echoed_urls_are_matched_after_normalizing(self):
+        """Test that Wiza's canonical URLs still match the submitted ones."""
+        wiza = FakeWiza(
+            per_poll=10,
+            echo=lambda url: (
+                "https://www.linkedin.com/in/"
+                + url.rstrip("/").rsplit("/", 1)[-1].lower()
+            ),
+        )
+        service = wiza_service()
+        submitted = [
+            "https://LinkedIn.com/in/Dev0/",
+            "https://www.linkedin.com/in/dev1",
+            "https://linkedin.com/in/dev0",  # duplicate of the first
+        ]
+
+        async def collect():
+            return [r async for r in service.enrich_linkedin_profiles(submitted)]
+
+        results = await call_with_transport(wiza.transport(), collect)
+
+        assert wiza.lists[0]["urls"] == submitted[:2]
+        assert [r["linkedin_url"] for r in results] == submitted[:2]
+        assert all(r["success"] for r in results)
+
+    @pytest.mark.asyncio
+    async def test_failed_contacts_and_timeouts(self):
+        """Test per-contact failures and unfinished profiles after a timeout."""
+        wiza = FakeWiza(per_poll=1)
+        service = wiza_service()
+        service.list_timeout = 0
+
+        async def collect():
+            return [
+                r
+                async for r in service.enrich_linkedin_profiles(
+                    urls(1, "private") + urls(2)
+                )
+            ]
+
+        results = await call_with_transport(wiza.transport(), collect)
+
+        assert results[0]["success"] is False
+        assert "could not enrich" in results[0]["error"]
+        assert [r["success"] for r in results[1:]] == [False, False]
+        assert "did not finish" in results[1]["error"]
+
+    @pytest.mark.asyncio
+    async def test_polling_backs_off_while_idle(self, monkeypatch):
+        """Test that idle polls double the delay and progress resets it."""
+        wiza = FakeWiza(per_poll=1, idle_polls=4)
+        service = wiza_service()
+        delays = []
+        real_sleep = asyncio.sleep
+
+        async def recording_sleep(delay, *args, **kwargs):
+            delays.append(delay)
+            await real_sleep(0)
+
+        monkeypatch.setattr(wiza_module.asyncio, "sleep", recording_sleep)
+
+        async def collect():
+            return [r async for r in service.enrich_linkedin_profiles(urls(2))]
+
+        await call_with_transport(wiza.transport(), collect)
+
+        assert delays == [0.002, 0.004, 0.008, 0.008, 0.001]